@@ -1,27 +1,158 @@
-"""文件相关接口。"""
+"""文件相关接口。
+
+上传方式：
+- `POST /files/upload`：一次性 multipart 上传（适合小文件）；
+- 分片续传（适合大文件）：`POST /files/uploads` 初始化 → `PUT /files/uploads/{id}?offset=N` 逐个写入分片
+  → `POST /files/uploads/{id}/complete`。分片直接写入存储目录下的文件，complete 时原地改名为正式文件；
+  连接中断后 `GET /files/uploads/{id}` 查询已接收的字节数，从该偏移继续即可；
+  超过 `UPLOAD_SESSION_TTL_HOURS` 没有新分片的会话在创建新会话时清理。
+- 超过 `UPLOAD_RETENTION_HOURS` 且没有任务引用的上传在新上传时清理：删除记录并释放内容引用
+  （引用计数降到 0 时删除存储文件，见 `services/blob_store.py`）。
+
+执行方式：
+- 上传相关接口都是 async：落盘、计算哈希与数据库读写放到线程池，预览解析放到独立进程池
+  （见 `services/preview_pool.py`），大文件上传不会拖慢其他请求；
+- 解析任务过多时返回 503，解析超时返回 400。
+"""
 
 from __future__ import annotations
 
-import shutil
+from dataclasses import dataclass
+from datetime import timedelta
 from pathlib import Path
+from typing import BinaryIO
 from uuid import uuid4
 
-from fastapi import APIRouter, Depends, File, HTTPException, Request, UploadFile
+from fastapi import APIRouter, Depends, File, HTTPException, Query, Request, UploadFile
+from sqlalchemy import delete, exists, select, update
 from sqlalchemy.orm import Session
+from starlette.concurrency import run_in_threadpool
+from starlette.requests import ClientDisconnect
 
 from app.core.config import settings
 from app.core.paths import resolve_backend_path
+from app.core.time import utcnow
 from app.db.session import get_db
+from app.models.stored_blob import StoredBlob
+from app.models.translation_job import TranslationJob
+from app.models.upload_session import UploadSession
 from app.models.uploaded_file import UploadedFile
-from app.schemas.files import UploadFileResponse
+from app.schemas.files import InitUploadRequest, Preview, UploadFileResponse, UploadSessionResponse
 from app.services.adapters.detect import detect_format
-from app.services.adapters.preview import preview_and_candidates
+from app.services.blob_store import (
+    acquire_blob,
+    cached_preview,
+    hash_file,
+    release_blob,
+    save_upload_stream,
+    store_preview,
+)
+from app.services.preview_pool import PreviewPoolBusy, run_preview
+
+try:
+    import fcntl
+except ImportError:  # Windows：没有 fcntl，分片写入只靠条件更新兜底
+    fcntl = None  # type: ignore[assignment]
 
 router = APIRouter()
 
+# 分片写盘的缓冲大小：攒够再交给线程池写入，避免每个小块都切换一次线程
+_WRITE_BUFFER_BYTES = 1024 * 1024
+
+
+def _save_record(db: Session, record: UploadedFile) -> None:
+    db.add(record)
+    db.commit()
+
+
+@dataclass(frozen=True)
+class _ParsedUpload:
+    fmt: str
+    preview: Preview
+    candidates: list[str]
+    # 预览来自已存储内容的缓存（无需再写回）
+    cached: bool
+
+
+async def _parse_upload(
+    db: Session,
+    *,
+    filename: str,
+    content_type: str,
+    tmp_path: Path,
+    sha256: str,
+    size_bytes: int,
+) -> _ParsedUpload:
+    """生成（或复用）预览与字段候选；失败时抛 HTTPException（503：解析繁忙，400：无法解析）。
+
+    直接解析落盘的临时文件，不动存储：失败时临时文件原样保留，由调用方决定丢弃还是留待重试。
+    """
+
+    fmt = detect_format(filename=filename, content_type=content_type).name
+
+    # 同一内容 + 格式命中缓存时不再解析
+    blob = await run_in_threadpool(db.get, StoredBlob, sha256)
+    cached = cached_preview(blob, fmt) if blob is not None else None
+    if cached is not None:
+        return _ParsedUpload(fmt=fmt, preview=cached[0], candidates=cached[1], cached=True)
+
+    try:
+        preview, candidates = await run_preview(
+            file_path=tmp_path,
+            detected_format=fmt,
+            size_bytes=size_bytes,
+            limit=20,
+        )
+    except PreviewPoolBusy as e:
+        raise HTTPException(status_code=503, detail=str(e), headers={"Retry-After": "5"})
+    except Exception as e:  # noqa: BLE001
+        raise HTTPException(status_code=400, detail=f"解析文件失败: {str(e)[:200]}")
+    return _ParsedUpload(fmt=fmt, preview=preview, candidates=candidates, cached=False)
+
+
+async def _register_upload(
+    db: Session,
+    *,
+    client_id: str,
+    filename: str,
+    content_type: str,
+    tmp_path: Path,
+    sha256: str,
+    size_bytes: int,
+    parsed: _ParsedUpload,
+) -> UploadFileResponse:
+    """登记已解析成功的上传内容：去重存储、缓存预览，并写入 UploadedFile 记录。"""
+
+    file_id = str(uuid4())
+
+    # 相同内容只存一份：已存在时丢弃临时文件，引用计数 +1
+    blob = await run_in_threadpool(acquire_blob, db, tmp_path=tmp_path, sha256=sha256, size_bytes=size_bytes)
+    if not parsed.cached:
+        await run_in_threadpool(store_preview, db, blob, parsed.fmt, parsed.preview, parsed.candidates)
+
+    # 落库：保存“相对路径”，方便迁移运行
+    record = UploadedFile(
+        id=file_id,
+        client_id=client_id,
+        filename=filename,
+        content_type=content_type,
+        size_bytes=size_bytes,
+        detected_format=parsed.fmt,
+        storage_path=blob.storage_path,
+        sha256=sha256,
+    )
+    await run_in_threadpool(_save_record, db, record)
+
+    return UploadFileResponse(
+        file_id=file_id,
+        detected_format=parsed.fmt,
+        field_candidates=parsed.candidates,
+        preview=parsed.preview,
+    )
+
 
 @router.post("/upload", response_model=UploadFileResponse)
-def upload_file(
+async def upload_file(
     request: Request,
     file: UploadFile = File(...),
     db: Session = Depends(get_db),
@@ -36,20 +167,12 @@ def upload_file(
     if not file.filename:
         raise HTTPException(status_code=400, detail="缺少文件名")
 
-    file_id = str(uuid4())
-    fmt = detect_format(filename=file.filename, content_type=file.content_type or "").name
-
-    suffix = Path(file.filename).suffix
-    save_name = f"{file_id}{suffix}"
-    # DB 中只存相对路径（相对 backend/），文件 IO 使用绝对路径
-    relative_save_path = Path(settings.UPLOADS_DIR) / save_name
-    abs_save_path = resolve_backend_path(relative_save_path)
+    # 顺带清理过期未使用的上传（释放存储）
+    await run_in_threadpool(_purge_expired_uploads, db)
 
     try:
-        # 保存到本地
-        abs_save_path.parent.mkdir(parents=True, exist_ok=True)
-        with abs_save_path.open("wb") as out:
-            shutil.copyfileobj(file.file, out)
+        # 写入临时文件的同时计算 SHA-256（内容寻址去重，见 blob_store）
+        tmp_path, sha256, size_bytes = await run_in_threadpool(save_upload_stream, file.file)
     except Exception as e:  # noqa: BLE001
         raise HTTPException(status_code=500, detail=f"保存文件失败: {str(e)[:200]}")
     finally:
@@ -58,39 +181,291 @@ def upload_file(
         except Exception:  # noqa: BLE001
             pass
 
-    size_bytes = 0
+    filename, content_type = file.filename, file.content_type or ""
     try:
-        size_bytes = abs_save_path.stat().st_size
-    except Exception:  # noqa: BLE001
-        size_bytes = 0
+        parsed = await _parse_upload(
+            db, filename=filename, content_type=content_type, tmp_path=tmp_path, sha256=sha256, size_bytes=size_bytes
+        )
+    except HTTPException:
+        # 一次性上传无法续传：解析失败（含 503）都丢弃临时文件，由客户端重新上传
+        await run_in_threadpool(tmp_path.unlink, missing_ok=True)
+        raise
 
-    # 预览与字段候选（先解析成功再落库，避免“脏记录”）
-    try:
-        preview, candidates = preview_and_candidates(file_path=abs_save_path, detected_format=fmt, limit=20)
-    except Exception as e:  # noqa: BLE001
+    return await _register_upload(
+        db,
+        client_id=client_id,
+        filename=filename,
+        content_type=content_type,
+        tmp_path=tmp_path,
+        sha256=sha256,
+        size_bytes=size_bytes,
+        parsed=parsed,
+    )
+
+
+def _get_upload_session(db: Session, upload_id: str, request: Request) -> UploadSession:
+    session = db.get(UploadSession, upload_id)
+    if not session:
+        raise HTTPException(status_code=404, detail="上传会话不存在")
+
+    # 归属校验：同一浏览器才能续传/完成自己的上传
+    client_id = getattr(request.state, "client_id", "") or ""
+    if not client_id:
+        raise HTTPException(status_code=500, detail="匿名会话未初始化，请刷新后重试")
+    if session.client_id != client_id:
+        raise HTTPException(status_code=404, detail="上传会话不存在")
+    return session
+
+
+def _session_response(session: UploadSession) -> UploadSessionResponse:
+    return UploadSessionResponse(
+        upload_id=session.id,
+        size_bytes=int(session.size_bytes or 0),
+        received_bytes=int(session.received_bytes or 0),
+        chunk_size=int(settings.UPLOAD_CHUNK_BYTES),
+    )
+
+
+def _purge_expired_uploads(db: Session) -> None:
+    """删除超过 UPLOAD_RETENTION_HOURS、且没有任何任务引用的上传记录，并释放其内容引用。"""
+
+    hours = int(settings.UPLOAD_RETENTION_HOURS or 0)
+    if hours <= 0:
+        return
+    cutoff = utcnow() - timedelta(hours=hours)
+    unused = ~exists().where(TranslationJob.file_id == UploadedFile.id)
+    expired = db.execute(
+        select(UploadedFile.id, UploadedFile.sha256).where(UploadedFile.created_at < cutoff, unused)
+    ).all()
+    for file_id, sha256 in expired:
+        # 条件删除：读取之后刚被新任务引用的上传保留
+        removed = db.execute(
+            delete(UploadedFile)
+            .where(UploadedFile.id == file_id, unused)
+            .execution_options(synchronize_session=False)
+        ).rowcount
+        db.commit()
+        if removed and sha256:
+            release_blob(db, sha256)
+
+
+def _purge_expired_upload_sessions(db: Session) -> None:
+    """删除超过 UPLOAD_SESSION_TTL_HOURS 没有新分片的会话及其分片文件，以及没有会话引用的残留分片文件。"""
+
+    ttl = timedelta(hours=max(1, int(settings.UPLOAD_SESSION_TTL_HOURS)))
+    cutoff = utcnow() - ttl
+    expired = db.execute(select(UploadSession).where(UploadSession.updated_at < cutoff)).scalars().all()
+    for session in expired:
+        # 条件删除：读取之后又收到新分片的会话不清理
+        result = db.execute(
+            delete(UploadSession)
+            .where(UploadSession.id == session.id, UploadSession.updated_at < cutoff)
+            .execution_options(synchronize_session=False)
+        )
+        db.commit()
+        if result.rowcount:
+            resolve_backend_path(session.storage_path).unlink(missing_ok=True)
+
+    # 会话记录写入前进程退出等情况留下的孤儿文件：按修改时间清理
+    partial_dir = resolve_backend_path(Path(settings.UPLOADS_DIR) / ".partial")
+    if not partial_dir.is_dir():
+        return
+    live = {resolve_backend_path(p) for p in db.execute(select(UploadSession.storage_path)).scalars()}
+    for path in partial_dir.iterdir():
         try:
-            abs_save_path.unlink(missing_ok=True)
-        except Exception:  # noqa: BLE001
-            pass
-        raise HTTPException(status_code=400, detail=f"解析文件失败: {str(e)[:200]}")
+            if path not in live and path.stat().st_mtime < cutoff.timestamp():
+                path.unlink()
+        except OSError:
+            continue
 
-    # 落库：保存“相对路径”，方便迁移运行
-    record = UploadedFile(
-        id=file_id,
+
+@router.post("/uploads", response_model=UploadSessionResponse)
+def init_upload(req: InitUploadRequest, request: Request, db: Session = Depends(get_db)) -> UploadSessionResponse:
+    """分片上传：创建上传会话（返回 upload_id 与建议的分片大小）。"""
+
+    client_id = getattr(request.state, "client_id", "") or ""
+    if not client_id:
+        raise HTTPException(status_code=500, detail="匿名会话未初始化，请刷新后重试")
+
+    # 顺带清理过期（长时间没有新分片）的会话与分片文件，以及过期未使用的上传
+    _purge_expired_upload_sessions(db)
+    _purge_expired_uploads(db)
+
+    upload_id = str(uuid4())
+    # 与正式存储文件位于同一目录树（同一文件系统），complete 时改名即可
+    relative_path = Path(settings.UPLOADS_DIR) / ".partial" / upload_id
+    abs_path = resolve_backend_path(relative_path)
+    abs_path.parent.mkdir(parents=True, exist_ok=True)
+    abs_path.touch()
+
+    session = UploadSession(
+        id=upload_id,
         client_id=client_id,
-        filename=file.filename,
-        content_type=file.content_type or "",
-        size_bytes=size_bytes,
-        detected_format=fmt,
-        storage_path=str(relative_save_path.as_posix()),
+        filename=req.filename,
+        content_type=req.content_type,
+        size_bytes=req.size_bytes,
+        received_bytes=0,
+        storage_path=relative_path.as_posix(),
     )
-    db.add(record)
+    db.add(session)
     db.commit()
+    return _session_response(session)
 
-    return UploadFileResponse(
-        file_id=file_id,
-        detected_format=fmt,
-        field_candidates=candidates,
-        preview=preview,
+
+@router.get("/uploads/{upload_id}", response_model=UploadSessionResponse)
+def get_upload(upload_id: str, request: Request, db: Session = Depends(get_db)) -> UploadSessionResponse:
+    """分片上传：查询已接收的字节数（断线续传时从这里继续）。"""
+
+    return _session_response(_get_upload_session(db, upload_id, request))
+
+
+@router.put("/uploads/{upload_id}", response_model=UploadSessionResponse)
+async def put_upload_chunk(
+    upload_id: str,
+    request: Request,
+    offset: int = Query(ge=0),
+    db: Session = Depends(get_db),
+) -> UploadSessionResponse:
+    """分片上传：写入一个分片（请求体为原始字节）。
+
+    - offset 必须等于服务端已接收的字节数，否则返回 409（客户端应先查询再续传）；
+    - 同一会话同时只有一个请求写入，另一个请求正在写时返回 409；
+    - 请求体直接按流写入目标文件，不经过 multipart 解析与临时文件。
+    """
+
+    session = await run_in_threadpool(_get_upload_session, db, upload_id, request)
+    path = resolve_backend_path(session.storage_path)
+    try:
+        f = await run_in_threadpool(path.open, "r+b")
+    except FileNotFoundError:
+        # 会话刚被过期清理
+        raise HTTPException(status_code=404, detail="上传会话不存在")
+    try:
+        # 同一会话同时只允许一个请求写文件：否则两个请求会交错截断/写入同一段，
+        # 落败的一方中断时的 truncate 还会截掉胜者已提交的字节。锁随文件关闭（含进程退出）释放
+        if not _try_lock(f):
+            raise HTTPException(status_code=409, detail="该上传有分片正在写入，请稍后查询进度后重试")
+
+        # 拿到锁之后再核对偏移（锁外读到的进度可能已被刚结束的请求推进）
+        await run_in_threadpool(db.refresh, session)
+        received = int(session.received_bytes or 0)
+        if offset != received:
+            raise HTTPException(status_code=409, detail=f"分片偏移不连续：服务端已接收 {received} 字节")
+
+        limit = min(int(session.size_bytes or 0) - offset, int(settings.UPLOAD_CHUNK_BYTES))
+        written = 0
+        # 丢弃上一次中断的分片残留的字节
+        await run_in_threadpool(f.truncate, offset)
+        f.seek(offset)
+        buf = bytearray()
+        try:
+            async for chunk in request.stream():
+                written += len(chunk)
+                if written > limit:
+                    await run_in_threadpool(f.truncate, offset)
+                    raise HTTPException(status_code=413, detail=f"分片过大：最多 {limit} 字节")
+                buf += chunk
+                if len(buf) >= _WRITE_BUFFER_BYTES:
+                    await run_in_threadpool(f.write, bytes(buf))
+                    buf.clear()
+            if buf:
+                await run_in_threadpool(f.write, bytes(buf))
+            await run_in_threadpool(f.flush)
+        except ClientDisconnect:
+            # 连接中断：已写入的部分不计入进度，下次从原偏移重写
+            await run_in_threadpool(f.truncate, offset)
+            raise HTTPException(status_code=400, detail="分片上传中断，请重试")
+
+        # 持锁提交进度；条件更新兜底没有文件锁的平台
+        advanced = await run_in_threadpool(_advance_upload, db, session, offset, written)
+        if not advanced:
+            raise HTTPException(status_code=409, detail="分片偏移冲突，请查询进度后重试")
+    finally:
+        await run_in_threadpool(f.close)
+    return _session_response(session)
+
+
+def _try_lock(f: BinaryIO) -> bool:
+    """非阻塞地对分片文件加独占锁；已被其他请求持有时返回 False。"""
+
+    if fcntl is None:
+        return True
+    try:
+        fcntl.flock(f.fileno(), fcntl.LOCK_EX | fcntl.LOCK_NB)
+    except BlockingIOError:
+        return False
+    return True
+
+
+def _advance_upload(db: Session, session: UploadSession, offset: int, written: int) -> bool:
+    result = db.execute(
+        update(UploadSession)
+        .where(UploadSession.id == session.id, UploadSession.received_bytes == offset)
+        .values(received_bytes=offset + written)
     )
+    db.commit()
+    if result.rowcount == 0:
+        return False
+    db.refresh(session)
+    return True
+
+
+def _close_upload_session(db: Session, session: UploadSession, *, remove_file: bool = False) -> bool:
+    """结束上传会话；返回 False 表示会话已被并发的请求（或过期清理）结束。
+
+    按主键删除并检查行数：同一会话并发 complete 时只有一个请求继续登记。
+    """
 
+    result = db.execute(delete(UploadSession).where(UploadSession.id == session.id))
+    db.commit()
+    if result.rowcount == 0:
+        return False
+    if remove_file:
+        resolve_backend_path(session.storage_path).unlink(missing_ok=True)
+    return True
+
+
+@router.post("/uploads/{upload_id}/complete", response_model=UploadFileResponse)
+async def complete_upload(upload_id: str, request: Request, db: Session = Depends(get_db)) -> UploadFileResponse:
+    """分片上传：全部分片写完后完成上传，返回格式检测结果、预览与字段/列候选。"""
+
+    session = await run_in_threadpool(_get_upload_session, db, upload_id, request)
+    size_bytes = int(session.size_bytes or 0)
+    if int(session.received_bytes or 0) != size_bytes:
+        raise HTTPException(
+            status_code=400,
+            detail=f"上传未完成：已接收 {int(session.received_bytes or 0)} / {size_bytes} 字节",
+        )
+
+    path = resolve_backend_path(session.storage_path)
+    try:
+        sha256 = await run_in_threadpool(hash_file, path)
+    except Exception as e:  # noqa: BLE001
+        raise HTTPException(status_code=500, detail=f"读取上传文件失败: {str(e)[:200]}")
+
+    client_id, filename, content_type = session.client_id, session.filename, session.content_type or ""
+    try:
+        parsed = await _parse_upload(
+            db, filename=filename, content_type=content_type, tmp_path=path, sha256=sha256, size_bytes=size_bytes
+        )
+    except HTTPException as e:
+        # 503（解析繁忙）：会话与分片文件原样保留，客户端按 Retry-After 重试 complete 即可；
+        # 其余（内容无法解析）：重试也不会成功，结束会话并删除分片文件
+        if e.status_code != 503:
+            await run_in_threadpool(_close_upload_session, db, session, remove_file=True)
+        raise
+
+    # 解析成功后才结束会话（分片文件随后在登记时改名为正式文件）
+    if not await run_in_threadpool(_close_upload_session, db, session):
+        raise HTTPException(status_code=404, detail="上传会话不存在")
+
+    return await _register_upload(
+        db,
+        client_id=client_id,
+        filename=filename,
+        content_type=content_type,
+        tmp_path=path,
+        sha256=sha256,
+        size_bytes=size_bytes,
+        parsed=parsed,
+    )
@@ -2,23 +2,116 @@
 
 from __future__ import annotations
 
-from typing import Any, cast
+import json
+import os
+from typing import Any, AsyncIterator, Optional, cast
 
+import redis.asyncio as aioredis
 from fastapi import APIRouter, Depends, HTTPException, Query, Request
-from fastapi.responses import FileResponse
+from fastapi.responses import FileResponse, Response, StreamingResponse
 from sqlalchemy import select
 from sqlalchemy.orm import Session
+from starlette.concurrency import run_in_threadpool
 
 from app.core.config import settings
 from app.core.paths import is_within_dir, resolve_backend_path
-from app.db.session import get_db
+from app.db.session import SessionLocal, get_db
 from app.models.translation_job import TranslationJob
 from app.models.uploaded_file import UploadedFile
 from app.schemas.jobs import CreateJobRequest, CreateJobResponse, JobListItem, JobListResponse, JobStatusResponse
+from app.services.export_compression import negotiate_variant
+from app.services.job_progress import (
+    TERMINAL_STATUSES,
+    client_channel,
+    job_channel,
+    job_status_payload,
+    live_events_available,
+    publish_job_status,
+    read_live_progress,
+)
 from app.tasks.translate import translate_job_task
 
 router = APIRouter()
 
+# SSE 心跳间隔（秒）：没有事件时定期发注释行，防止代理/浏览器判定连接空闲
+_SSE_HEARTBEAT_SECONDS = 15.0
+_SSE_HEADERS = {
+    "Cache-Control": "no-cache",
+    # 告诉 nginx 不要缓冲该响应（否则事件会攒到缓冲区满才下发）
+    "X-Accel-Buffering": "no",
+}
+
+
+def _sse(event: str, data: dict[str, Any]) -> str:
+    return f"event: {event}\ndata: {json.dumps(data, ensure_ascii=False)}\n\n"
+
+
+def _job_snapshot(job_id: str) -> Optional[dict[str, Any]]:
+    """任务当前状态（运行中的任务进度取 Redis 实时值），作为 SSE 流的第一条事件。"""
+
+    with SessionLocal() as db:
+        job = db.get(TranslationJob, job_id)
+        if not job:
+            return None
+        payload = job_status_payload(job)
+
+    if payload["status"] == "running":
+        live = read_live_progress([job_id]).get(job_id)
+        if live:
+            payload["progress_done"], payload["progress_failed"] = live
+    return {"event": "status", "job_id": job_id, **payload}
+
+
+async def _event_stream(request: Request, channel: str, *, job_id: Optional[str] = None) -> AsyncIterator[str]:
+    """订阅 Redis 频道并转成 SSE。
+
+    - job_id 不为空：单任务流。先订阅、再读取快照，避免两者之间发生的状态变化丢失；任务结束后关闭；
+    - job_id 为空：会话级多任务流，直到客户端断开。
+    """
+
+    client = aioredis.Redis.from_url(settings.REDIS_URL, decode_responses=True)
+    pubsub = client.pubsub()
+    try:
+        await pubsub.subscribe(channel)
+        # 断线后浏览器按该间隔自动重连（EventSource 内建行为）
+        yield "retry: 3000\n\n"
+
+        if job_id is not None:
+            snapshot = await run_in_threadpool(_job_snapshot, job_id)
+            if snapshot is None:
+                return
+            yield _sse("status", snapshot)
+            if snapshot["status"] in TERMINAL_STATUSES:
+                return
+
+        while not await request.is_disconnected():
+            message = await pubsub.get_message(ignore_subscribe_messages=True, timeout=_SSE_HEARTBEAT_SECONDS)
+            if message is None:
+                yield ": ping\n\n"
+                continue
+
+            data = json.loads(message["data"])
+            event = str(data.get("event") or "status")
+            yield _sse(event, data)
+            if job_id is not None and event == "status" and data.get("status") in TERMINAL_STATUSES:
+                return
+    finally:
+        await pubsub.aclose()
+        await client.aclose()
+
+
+def _require_client_id(request: Request) -> str:
+    client_id = getattr(request.state, "client_id", "") or ""
+    if not client_id:
+        raise HTTPException(status_code=500, detail="匿名会话未初始化，请刷新后重试")
+    return client_id
+
+
+def _require_live_events() -> None:
+    if not live_events_available():
+        # 前端 EventSource 出错后会回退为轮询
+        raise HTTPException(status_code=503, detail="实时推送暂不可用，请使用轮询接口")
+
 
 @router.get("", response_model=JobListResponse)
 def list_jobs(
@@ -48,8 +141,14 @@ def list_jobs(
     )
     rows = db.execute(stmt).all()
 
+    # 运行中的任务：进度以 Redis 中的实时计数为准（DB 只定时落库）
+    live = read_live_progress(job.id for job, _ in rows if job.status == "running")
+
     jobs: list[JobListItem] = []
     for job, filename in rows:
+        progress_done, progress_failed = live.get(
+            job.id, (int(job.progress_done or 0), int(job.progress_failed or 0))
+        )
         download_url = None
         if job.status == "succeeded" and job.result_path:
             download_url = f"{settings.API_V1_PREFIX}/jobs/{job.id}/download"
@@ -58,6 +157,8 @@ def list_jobs(
         if not isinstance(selected_fields, list):
             selected_fields = []
 
+        stats = job.stats if isinstance(job.stats, dict) else {}
+
         jobs.append(
             JobListItem(
                 job_id=job.id,
@@ -69,8 +170,9 @@ def list_jobs(
                 row_limit=int(job.row_limit or 0),
                 selected_fields=cast(list[str], selected_fields),
                 progress_total=int(job.progress_total or 0),
-                progress_done=int(job.progress_done or 0),
-                progress_failed=int(job.progress_failed or 0),
+                progress_done=progress_done,
+                progress_failed=progress_failed,
+                stats=cast(dict[str, Any], stats),
                 error_message=job.error_message or "",
                 download_url=download_url,
                 created_at=job.created_at,
@@ -81,6 +183,24 @@ def list_jobs(
     return JobListResponse(jobs=jobs, limit=limit, offset=offset)
 
 
+@router.get("/events")
+def client_events(request: Request) -> StreamingResponse:
+    """当前匿名会话所有任务的事件流（SSE）：任务创建/状态变化/进度。
+
+    事件：
+    - `status`：状态变化（含 progress_total/progress_done/error_message/download_url）
+    - `progress`：进度（progress_done/progress_failed，按 0.25s 节流）
+    """
+
+    client_id = _require_client_id(request)
+    _require_live_events()
+    return StreamingResponse(
+        _event_stream(request, client_channel(client_id)),
+        media_type="text/event-stream",
+        headers=_SSE_HEADERS,
+    )
+
+
 @router.post("", response_model=CreateJobResponse)
 def create_job(req: CreateJobRequest, request: Request, db: Session = Depends(get_db)) -> CreateJobResponse:
     """创建翻译任务并投递到 Celery。"""
@@ -112,10 +232,12 @@ def create_job(req: CreateJobRequest, request: Request, db: Session = Depends(ge
         progress_total=0,
         progress_done=0,
         progress_failed=0,
+        stats={},
     )
     db.add(job)
     db.commit()
     db.refresh(job)
+    publish_job_status(job)
 
     # 投递后台任务：由 worker 更新 status/progress/result
     translate_job_task.delay(job.id)
@@ -123,6 +245,37 @@ def create_job(req: CreateJobRequest, request: Request, db: Session = Depends(ge
     return CreateJobResponse(job_id=job.id, status=job.status)
 
 
+@router.post("/{job_id}/resume", response_model=CreateJobResponse)
+def resume_job(job_id: str, request: Request, db: Session = Depends(get_db)) -> CreateJobResponse:
+    """重新投递失败的任务：已完成的翻译从断点文件恢复，只翻译缺失的单元。"""
+
+    job = db.get(TranslationJob, job_id)
+    if not job:
+        raise HTTPException(status_code=404, detail="任务不存在")
+
+    # 归属校验：同一浏览器才能续跑自己的任务
+    client_id = getattr(request.state, "client_id", "") or ""
+    if not client_id:
+        raise HTTPException(status_code=500, detail="匿名会话未初始化，请刷新后重试")
+    if job.client_id != client_id:
+        raise HTTPException(status_code=404, detail="任务不存在")
+
+    if job.status != "failed":
+        raise HTTPException(status_code=400, detail="只有失败的任务可以续跑")
+
+    job.status = "pending"
+    job.error_message = ""
+    # 允许重新派发分片（已完成的分片会从各自的断点恢复）；
+    # 上一次派发中仍在运行的分片在下一次写进度时发现标记已变化，随即退出
+    job.shard_dispatch_id = ""
+    db.commit()
+    publish_job_status(job)
+
+    translate_job_task.delay(job.id)
+
+    return CreateJobResponse(job_id=job.id, status=job.status)
+
+
 @router.get("/{job_id}", response_model=JobStatusResponse)
 def get_job(job_id: str, request: Request, db: Session = Depends(get_db)) -> JobStatusResponse:
     """查询任务状态与进度。"""
@@ -146,6 +299,13 @@ def get_job(job_id: str, request: Request, db: Session = Depends(get_db)) -> Job
     if not isinstance(selected_fields, list):
         selected_fields = []
 
+    stats = job.stats if isinstance(job.stats, dict) else {}
+
+    progress_done, progress_failed = int(job.progress_done or 0), int(job.progress_failed or 0)
+    if job.status == "running":
+        # 实时进度（DB 只定时落库）；Redis 不可用时回退到 DB 中的值
+        progress_done, progress_failed = read_live_progress([job.id]).get(job.id, (progress_done, progress_failed))
+
     return JobStatusResponse(
         job_id=job.id,
         file_id=job.file_id,
@@ -155,16 +315,55 @@ def get_job(job_id: str, request: Request, db: Session = Depends(get_db)) -> Job
         row_limit=job.row_limit,
         selected_fields=cast(list[str], selected_fields),
         progress_total=int(job.progress_total or 0),
-        progress_done=int(job.progress_done or 0),
-        progress_failed=int(job.progress_failed or 0),
+        progress_done=progress_done,
+        progress_failed=progress_failed,
+        stats=cast(dict[str, Any], stats),
         error_message=job.error_message or "",
         download_url=download_url,
     )
 
 
+@router.get("/{job_id}/events")
+def job_events(job_id: str, request: Request, db: Session = Depends(get_db)) -> StreamingResponse:
+    """单个任务的事件流（SSE）：第一条为当前状态，之后推送进度与状态变化，任务结束后关闭。"""
+
+    job = db.get(TranslationJob, job_id)
+    if not job:
+        raise HTTPException(status_code=404, detail="任务不存在")
+
+    # 归属校验：同一浏览器才能订阅自己的任务
+    client_id = _require_client_id(request)
+    if job.client_id != client_id:
+        raise HTTPException(status_code=404, detail="任务不存在")
+
+    _require_live_events()
+    return StreamingResponse(
+        _event_stream(request, job_channel(job_id), job_id=job_id),
+        media_type="text/event-stream",
+        headers=_SSE_HEADERS,
+    )
+
+
+def _etag_matches(if_none_match: str, etag: str) -> bool:
+    """If-None-Match 比较（弱比较：忽略 W/ 前缀；`*` 匹配任意版本）。"""
+
+    value = (if_none_match or "").strip()
+    if not value:
+        return False
+    if value == "*":
+        return True
+    target = etag.removeprefix("W/")
+    return any(tag.strip().removeprefix("W/") == target for tag in value.split(","))
+
+
 @router.get("/{job_id}/download")
 def download(job_id: str, request: Request, db: Session = Depends(get_db)) -> Any:
-    """下载导出结果。"""
+    """下载导出结果。
+
+    - 按 `Accept-Encoding` 返回预压缩副本（gzip/zstd，见 `services/export_compression.py`），带 `Content-Encoding`；
+    - 带 `ETag` / `Last-Modified`：`If-None-Match` 命中时返回 304；
+    - 支持 `Range` / `If-Range`：断点续传只传剩余部分（范围针对实际发送的编码后内容）。
+    """
 
     job = db.get(TranslationJob, job_id)
     if not job:
@@ -187,9 +386,24 @@ def download(job_id: str, request: Request, db: Session = Depends(get_db)) -> An
     if not path.exists():
         raise HTTPException(status_code=404, detail="导出文件不存在（可能已被清理）")
 
-    return FileResponse(
-        path=str(path),
+    send_path, encoding = negotiate_variant(path, request.headers.get("accept-encoding", ""))
+    headers = {
+        # 不同 Accept-Encoding 得到不同的内容；结果按匿名会话隔离，只允许浏览器自身缓存，且每次先校验
+        "Vary": "Accept-Encoding",
+        "Cache-Control": "private, no-cache",
+    }
+    if encoding:
+        headers["Content-Encoding"] = encoding
+
+    response = FileResponse(
+        path=str(send_path),
         filename=path.name,
         media_type="application/octet-stream",
+        headers=headers,
+        stat_result=os.stat(send_path),
     )
-
+    etag = response.headers["etag"]
+    if _etag_matches(request.headers.get("if-none-match", ""), etag):
+        not_modified = {k: v for k, v in headers.items() if k != "Content-Encoding"}
+        return Response(status_code=304, headers={**not_modified, "ETag": etag})
+    return response
@@ -22,5 +22,11 @@ celery_app.conf.update(
     timezone="Asia/Shanghai",
     enable_utc=True,
     broker_connection_retry_on_startup=True,
+    # 任务执行完才 ack：worker 崩溃/被杀时任务会被重新投递，配合断点文件只翻译缺失部分
+    task_acks_late=True,
+    task_reject_on_worker_lost=True,
+    worker_prefetch_multiplier=1,
+    # Redis broker 在 visibility_timeout 内未 ack 会重新投递：需大于最长任务耗时，避免同一任务被并行执行
+    broker_transport_options={"visibility_timeout": settings.CELERY_VISIBILITY_TIMEOUT_SECONDS},
 )
 
@@ -52,27 +52,92 @@ class Settings(BaseSettings):
     REDIS_URL: str = "redis://localhost:6379/0"
     CELERY_BROKER_URL: str = "redis://localhost:6379/0"
     CELERY_RESULT_BACKEND: str = "redis://localhost:6379/1"
+    # 未 ack 的任务在多久后被重新投递（秒）；应大于最长任务耗时
+    CELERY_VISIBILITY_TIMEOUT_SECONDS: int = 12 * 3600
 
     # --- 本地存储（相对 backend/）---
     STORAGE_DIR: Path = Field(default=Path("./storage"))
     UPLOADS_DIR: Path = Field(default=Path("./storage/uploads"))
     EXPORTS_DIR: Path = Field(default=Path("./storage/exports"))
+    # 导出预压缩：逗号分隔的编码（gzip / zstd），下载时按 Accept-Encoding 选择；留空表示不压缩
+    # - zstd 需要额外安装 `zstandard`，未安装时自动跳过
+    EXPORT_PRECOMPRESS: str = "gzip"
+    # 分片上传：单个分片的最大字节数（需小于反向代理的请求体上限，例如 nginx client_max_body_size）
+    UPLOAD_CHUNK_BYTES: int = 8 * 1024 * 1024
+    # 分片上传会话的保留时长（小时）：超过该时长没有新分片的会话与分片文件在创建新会话时清理
+    UPLOAD_SESSION_TTL_HOURS: int = 24
+    # 上传文件的保留时长（小时）：超过该时长且没有任务使用的上传在新上传时删除（<=0 表示不清理）
+    UPLOAD_RETENTION_HOURS: int = 7 * 24
+    # 上传解析（预览/字段候选）在独立进程池中执行，不占用 API 的事件循环与线程池
+    # - PREVIEW_WORKERS <= 0 表示退化为线程池内解析（本地调试）
+    # - 正在解析的文件总字节数超过 MAX_INFLIGHT_BYTES 时，新的上传直接返回 503（客户端稍后重试）
+    PREVIEW_WORKERS: int = 2
+    PREVIEW_TIMEOUT_SECONDS: float = 30.0
+    PREVIEW_MAX_INFLIGHT_BYTES: int = 2 * 1024 * 1024 * 1024
+    # 翻译任务断点（每个任务一个 JSONL 文件；任务成功后删除）
+    CHECKPOINTS_DIR: Path = Field(default=Path("./storage/checkpoints"))
 
     # --- LLM：火山方舟（OpenAI SDK 兼容）---
     ARK_API_KEY: str = ""
     ARK_BASE_URL: str = "https://ark.cn-beijing.volces.com/api/v3"
     ARK_MODEL: str = "doubao-seed-1-6-lite-251015"
     ARK_RPM: int = 1000
+    # 每分钟 token 上限（按字符数粗略估算；<=0 表示不限制）
+    ARK_TPM: int = 0
+    # 限流范围：redis（所有 worker 进程/容器共享同一份 RPM/TPM 配额）/ local（仅进程内）
+    # - redis 不可用时会自动回退为进程内限流
+    ARK_RATE_LIMITER: str = "redis"
     # 默认关闭深度思考，提升翻译吞吐与稳定性
     ARK_DISABLE_THINKING: bool = True
 
     # --- 翻译策略 ---
     TRANSLATION_MAX_CELL_CHARS: int = 10000
     TRANSLATION_BATCH_SIZE: int = 20
+    # 任务进度落库间隔（秒）：实时进度逐条写 Redis，DB 只按该间隔与任务结束时写入
+    JOB_PROGRESS_FLUSH_SECONDS: float = 2.0
     # 翻译并发度（进程内）：用于提升吞吐，尽量打满 RPM
     # 注意：这是“同一 Celery worker 进程内”的并发请求数上限；
     # 若你启动了多个 worker 进程/实例，整体对外请求速率会叠加。
     TRANSLATION_MAX_CONCURRENCY: int = 500
+    # 自适应并发（AIMD）：上游健康时逐步提高 in-flight 上限，遇到 429/5xx/超时按比例下调
+    # - TRANSLATION_MAX_CONCURRENCY 仍是硬上限（线程池大小）
+    # - 单次请求耗时超过 LATENCY_TARGET 视为“不健康”，不再继续加并发
+    TRANSLATION_ADAPTIVE_CONCURRENCY: bool = True
+    TRANSLATION_MIN_CONCURRENCY: int = 4
+    TRANSLATION_INITIAL_CONCURRENCY: int = 32
+    TRANSLATION_LATENCY_TARGET_SECONDS: float = 30.0
+
+    # 分片执行：单元数超过该值的任务按该大小切成分片，由多个 worker 并行翻译（<=0 表示关闭）
+    # - 需要多个 Celery worker（或多进程并发）才能体现收益；每个分片会重新解析一遍源文件
+    TRANSLATION_SHARD_SIZE: int = 0
+
+    # 流式提交窗口：已拉取但尚未产出的单元数上限（背压；<=0 表示按“并发 × 合并条数 × 2”自动估算）
+    # - 翻译器按窗口惰性拉取 items，任务内存与总单元数无关
+    TRANSLATION_STREAM_WINDOW: int = 0
+    # 任务内去重备忘录：已完成文本的条目数上限（窗口之后再次出现的重复文本直接复用）
+    TRANSLATION_DEDUP_MEMO_ENTRIES: int = 100_000
+    # 翻译单元存储：文本超过该字节数后转存到 STORAGE_DIR 下的临时文件（<=0 表示始终放在内存）
+    TRANSLATION_ITEM_STORE_SPILL_BYTES: int = 256 * 1024 * 1024
+
+    # 翻译引擎：threads（线程池 + 线程本地 OpenAI client）/ asyncio（单事件循环 + 共享 AsyncOpenAI 连接池）
+    # - asyncio 引擎的并发上限单独配置：协程几乎没有额外内存开销，可以远高于线程数
+    TRANSLATION_ENGINE: str = "threads"
+    TRANSLATION_ASYNC_MAX_CONCURRENCY: int = 2000
+
+    # 短文本合并翻译：把多个短单元打包进一次模型调用（行编号协议），解析失败自动回退逐条翻译
+    # - 只有“单行、无首尾空白、长度 <= ITEM_MAX_CHARS”的单元会被合并
+    # - 一批最多 MAX_ITEMS 条，且原文总字符数不超过 MAX_CHARS
+    # - MAX_ITEMS <= 1 等价于关闭
+    TRANSLATION_MULTI_CELL_MAX_ITEMS: int = 40
+    TRANSLATION_MULTI_CELL_MAX_CHARS: int = 2000
+    TRANSLATION_MULTI_CELL_ITEM_MAX_CHARS: int = 200
+
+    # 进程内 L1 翻译缓存（位于 Redis 前面，同一 worker 进程内所有任务共享，LRU 淘汰）
+    # - 任一上限 <= 0 表示关闭
+    TRANSLATION_L1_CACHE_MAX_ENTRIES: int = 200_000
+    TRANSLATION_L1_CACHE_MAX_BYTES: int = 64 * 1024 * 1024
+    # 新翻译结果攒够多少条后通过 Redis pipeline 批量写回缓存
+    TRANSLATION_CACHE_WRITE_BATCH_SIZE: int = 200
 
     # 开发调试：不调用外部模型，使用 mock 翻译（用于本地联调）
     TRANSLATION_DRY_RUN: bool = False
@@ -22,8 +22,8 @@ def _assert_schema_compatible() -> None:
 
     insp = inspect(engine)
     required = {
-        "uploaded_files": {"client_id"},
-        "translation_jobs": {"client_id"},
+        "uploaded_files": {"client_id", "sha256"},
+        "translation_jobs": {"client_id", "stats", "shard_dispatch_id"},
     }
 
     missing: list[str] = []
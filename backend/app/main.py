@@ -14,6 +14,7 @@ from app.core.config import settings
 from app.core.paths import resolve_backend_path
 from app.db.init_db import init_db
 from app.middlewares.client_id import ClientIdCookieMiddleware
+from app.services.preview_pool import shutdown_preview_pool
 
 
 @asynccontextmanager
@@ -38,6 +39,9 @@ async def lifespan(_: FastAPI) -> AsyncIterator[None]:
 
     yield
 
+    # 关闭上传解析进程池（按需创建，未使用过时为空操作）
+    shutdown_preview_pool()
+
 
 app = FastAPI(
     title="数据翻译器 Demo API",
@@ -1,10 +1,16 @@
 """ORM Models。"""
 
+from app.models.job_shard_progress import JobShardProgress
+from app.models.stored_blob import StoredBlob
 from app.models.translation_job import TranslationJob
+from app.models.upload_session import UploadSession
 from app.models.uploaded_file import UploadedFile
 
 __all__ = [
     "UploadedFile",
+    "StoredBlob",
+    "UploadSession",
     "TranslationJob",
+    "JobShardProgress",
 ]
 
@@ -0,0 +1,26 @@
+"""分片进度表（每次派发的每个分片一行）。"""
+
+from __future__ import annotations
+
+from sqlalchemy import BigInteger, Integer, String
+from sqlalchemy.orm import Mapped, mapped_column
+
+from app.db.base import Base
+
+
+class JobShardProgress(Base):
+    """某次派发中一个分片已计入任务进度的条数。
+
+    分片任务是 acks_late：重投递时断点里的条目有一部分已被前一次执行计入进度，
+    这里记下已计入的条数（与任务进度在同一事务里累加），重跑时只补计差额。
+    """
+
+    __tablename__ = "job_shard_progress"
+
+    # 派发标记（见 TranslationJob.shard_dispatch_id）：续跑换新标记后各分片从 0 重新计数
+    dispatch_id: Mapped[str] = mapped_column(String(36), primary_key=True)
+    shard: Mapped[int] = mapped_column(Integer, primary_key=True)
+
+    job_id: Mapped[str] = mapped_column(String(36), index=True)
+
+    counted_done: Mapped[int] = mapped_column(BigInteger, default=0)
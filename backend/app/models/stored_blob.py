@@ -0,0 +1,32 @@
+"""内容寻址的上传文件存储表。"""
+
+from __future__ import annotations
+
+from datetime import datetime
+from typing import Any
+
+from sqlalchemy import JSON, BigInteger, DateTime, Integer, String
+from sqlalchemy.orm import Mapped, mapped_column
+
+from app.db.base import Base
+from app.core.time import utcnow
+
+
+class StoredBlob(Base):
+    """按 SHA-256 去重的文件内容（多个 `UploadedFile` 可以指向同一份）。"""
+
+    __tablename__ = "stored_blobs"
+
+    sha256: Mapped[str] = mapped_column(String(64), primary_key=True)
+    size_bytes: Mapped[int] = mapped_column(BigInteger, default=0)
+
+    # 相对路径（相对 backend/），便于迁移运行
+    storage_path: Mapped[str] = mapped_column(String(1024))
+
+    # 引用计数：指向该内容的 UploadedFile 数量；降到 0 时删除文件与记录
+    ref_count: Mapped[int] = mapped_column(Integer, default=0)
+
+    # 预览缓存：detected_format -> {"preview": ..., "candidates": [...]}（同一内容重复上传时不再解析）
+    preview_cache: Mapped[dict[str, Any]] = mapped_column(JSON, default=dict)
+
+    created_at: Mapped[datetime] = mapped_column(DateTime(timezone=True), default=utcnow)
@@ -43,8 +43,14 @@ class TranslationJob(Base):
     progress_done: Mapped[int] = mapped_column(Integer, default=0)
     progress_failed: Mapped[int] = mapped_column(Integer, default=0)
 
+    # 翻译执行统计（由 worker 回写），例如：{"parts_total": 1000, "parts_unique": 120, "dedup_ratio": 0.88}
+    stats: Mapped[object] = mapped_column(JSON, default=dict)
+
     error_message: Mapped[str] = mapped_column(String(2048), default="")
 
+    # 分片派发标记（= chord 任务 id）：非空表示分片已派发，重投递的入口任务据此跳过；续跑时清空
+    shard_dispatch_id: Mapped[str] = mapped_column(String(36), default="")
+
     # 导出文件相对路径（相对 backend/）
     result_path: Mapped[str] = mapped_column(String(1024), default="")
 
@@ -0,0 +1,40 @@
+"""分片上传会话表。"""
+
+from __future__ import annotations
+
+from datetime import datetime
+from uuid import uuid4
+
+from sqlalchemy import BigInteger, DateTime, String
+from sqlalchemy.orm import Mapped, mapped_column
+
+from app.db.base import Base
+from app.core.time import utcnow
+
+
+class UploadSession(Base):
+    """一次可续传的分片上传（init → PUT 分片 → complete）。"""
+
+    __tablename__ = "upload_sessions"
+
+    id: Mapped[str] = mapped_column(String(36), primary_key=True, default=lambda: str(uuid4()))
+
+    # 匿名会话归属：只有发起上传的浏览器可以续传/完成
+    client_id: Mapped[str] = mapped_column(String(36), index=True, nullable=False)
+
+    filename: Mapped[str] = mapped_column(String(512))
+    content_type: Mapped[str] = mapped_column(String(128), default="")
+
+    # 声明的总大小与已接收的字节数（分片必须从 received_bytes 处续写）
+    size_bytes: Mapped[int] = mapped_column(BigInteger, default=0)
+    received_bytes: Mapped[int] = mapped_column(BigInteger, default=0)
+
+    # 分片直接写入的文件（相对 backend/）；complete 时原地改名为正式存储文件，不再复制
+    storage_path: Mapped[str] = mapped_column(String(1024))
+
+    created_at: Mapped[datetime] = mapped_column(DateTime(timezone=True), default=utcnow)
+    updated_at: Mapped[datetime] = mapped_column(
+        DateTime(timezone=True),
+        default=utcnow,
+        onupdate=utcnow,
+    )
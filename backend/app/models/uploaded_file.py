@@ -5,7 +5,7 @@ from __future__ import annotations
 from datetime import datetime
 from uuid import uuid4
 
-from sqlalchemy import DateTime, Integer, String
+from sqlalchemy import BigInteger, DateTime, String
 from sqlalchemy.orm import Mapped, mapped_column
 
 from app.db.base import Base
@@ -25,13 +25,17 @@ class UploadedFile(Base):
 
     filename: Mapped[str] = mapped_column(String(512))
     content_type: Mapped[str] = mapped_column(String(128), default="")
-    size_bytes: Mapped[int] = mapped_column(Integer, default=0)
+    # BigInteger：分片上传支持多 GB 文件
+    size_bytes: Mapped[int] = mapped_column(BigInteger, default=0)
 
-    # 自动识别的数据格式：json/jsonl/csv/xlsx/unknown
+    # 自动识别的数据格式：json/jsonl/csv/xlsx/parquet/unknown
     detected_format: Mapped[str] = mapped_column(String(32), default="unknown")
 
-    # 相对路径（相对 backend/），便于迁移运行
+    # 相对路径（相对 backend/），便于迁移运行；相同内容的上传共享同一个文件（见 StoredBlob）
     storage_path: Mapped[str] = mapped_column(String(1024))
 
+    # 文件内容的 SHA-256（对应 stored_blobs.sha256）
+    sha256: Mapped[str] = mapped_column(String(64), index=True, default="")
+
     created_at: Mapped[datetime] = mapped_column(DateTime(timezone=True), default=utcnow)
 
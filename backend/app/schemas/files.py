@@ -8,7 +8,7 @@ from pydantic import BaseModel, Field
 
 
 class PreviewTable(BaseModel):
-    """表格预览（CSV/XLSX）。"""
+    """表格预览（CSV/XLSX/Parquet）。"""
 
     type: Literal["table"] = "table"
     columns: list[str] = Field(default_factory=list)
@@ -31,3 +31,21 @@ class UploadFileResponse(BaseModel):
     field_candidates: list[str] = Field(default_factory=list)
     preview: Preview
 
+
+
+class InitUploadRequest(BaseModel):
+    """分片上传：初始化。"""
+
+    filename: str = Field(min_length=1, max_length=512)
+    size_bytes: int = Field(ge=0)
+    content_type: str = Field(default="", max_length=128)
+
+
+class UploadSessionResponse(BaseModel):
+    """分片上传会话状态（续传时从 received_bytes 继续）。"""
+
+    upload_id: str
+    size_bytes: int
+    received_bytes: int
+    # 建议的分片大小（也是单个分片允许的最大字节数）
+    chunk_size: int
@@ -3,7 +3,7 @@
 from __future__ import annotations
 
 from datetime import datetime
-from typing import Literal, Optional
+from typing import Any, Literal, Optional
 
 from pydantic import BaseModel, Field, field_validator
 
@@ -59,6 +59,9 @@ class JobStatusResponse(BaseModel):
     progress_done: int
     progress_failed: int
 
+    # 翻译执行统计（例如去重率），任务完成后由 worker 回写
+    stats: dict[str, Any] = Field(default_factory=dict)
+
     error_message: str = ""
     download_url: Optional[str] = None
 
@@ -79,6 +82,9 @@ class JobListItem(BaseModel):
     progress_done: int
     progress_failed: int
 
+    # 翻译执行统计（例如去重率），任务完成后由 worker 回写
+    stats: dict[str, Any] = Field(default_factory=dict)
+
     error_message: str = ""
     download_url: Optional[str] = None
 
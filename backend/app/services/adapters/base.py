@@ -4,18 +4,34 @@ from __future__ import annotations
 
 from dataclasses import dataclass
 from pathlib import Path
-from typing import Callable, Protocol
+from typing import Callable, Protocol, Sequence
 
 from app.services.translator.ark_translator import TranslateItem
 
 
 @dataclass(frozen=True)
 class PreparedTranslation:
-    """适配器准备好的“可翻译单元”与“回填导出方法”。"""
+    """适配器准备好的“可翻译单元”与“回填导出方法”。
 
-    items: list[TranslateItem]
+    `items` 通常是紧凑的 `ItemStore`（按需构造 `TranslateItem`），也可以是普通列表。
+    """
+
+    items: Sequence[TranslateItem]
     apply: Callable[[dict[str, str]], Path]
 
+    def close(self) -> None:
+        """释放 `items` 占用的资源（`ItemStore` 转存时的临时文件与 mmap）；普通列表无需处理。"""
+
+        close = getattr(self.items, "close", None)
+        if close is not None:
+            close()
+
+    def __enter__(self) -> "PreparedTranslation":
+        return self
+
+    def __exit__(self, *exc: object) -> None:
+        self.close()
+
 
 class DataAdapter(Protocol):
     """数据格式适配器协议。"""
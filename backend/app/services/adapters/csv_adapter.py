@@ -1,34 +1,60 @@
-"""CSV 适配器（pandas）。"""
+"""CSV 适配器（流式）。
+
+背景：
+- 之前 `prepare` 用 `pd.read_csv` 读入全量，`apply` 再 `df.copy()` 后整表写出：
+  即使只翻译前 50 行，内存峰值也是文件大小的 2 倍以上，多 GB 的 CSV 直接撑爆 worker。
+
+做法：
+- `prepare` 只读取前 `row_limit` 行（需要翻译的部分）放进 DataFrame；
+- `apply` 重新流式读取源文件：表头与前 N 行用回填后的 DataFrame 写出，
+  其余行逐块原样透传（add_columns 模式下补齐新增列的空值），不会整体进入内存；
+- 所有单元格按字符串读取，未翻译的值原样导出（不会出现 `1` 变成 `1.0` 之类的类型漂移）。
+
+说明：
+- 表头与 pandas 保持一致：重复列名按 `a`、`a.1`、`a.2` 区分（与预览/字段候选一致）；
+- 空行会被跳过（与 `pd.read_csv` 默认行为一致）。
+"""
 
 from __future__ import annotations
 
+import csv
+import sys
 from pathlib import Path
-from typing import Any
+from typing import Iterator, TextIO
 
 import pandas as pd
 
 from app.services.adapters.base import PreparedTranslation
-from app.services.translator.ark_translator import TranslateItem
+from app.services.adapters.tabular import apply_column_translations, dedupe_columns, extract_column_items
+from app.services.translator.item_store import ItemStore
+
+
+# 透传阶段每次写出的行数（只影响写出效率，不影响内存上界）
+_PASSTHROUGH_CHUNK_ROWS = 10_000
+
 
+def _open_csv(file_path: Path) -> TextIO:
+    # utf-8-sig：兼容带 BOM 的文件（Excel 导出常见）；newline=""：交给 csv 模块处理引号内换行
+    return file_path.open("r", encoding="utf-8-sig", newline="")
 
-def _is_blank(value: Any) -> bool:
-    if value is None:
-        return True
-    # pandas NaN
-    try:
-        if pd.isna(value):
-            return True
-    except Exception:  # noqa: BLE001
-        pass
-    return not str(value).strip()
 
+def _iter_records(f: TextIO) -> Iterator[list[str]]:
+    """逐行产出 CSV 记录（跳过空行）。"""
 
-def _parse_item_id(item_id: str) -> tuple[int, str]:
-    # item_id: r{row}::c{col}
-    left, right = item_id.split("::", 1)
-    row_idx = int(left[1:])
-    col = right[1:]
-    return row_idx, col
+    for row in csv.reader(f):
+        if row:
+            yield row
+
+
+def _ensure_csv_field_limit() -> None:
+    # 默认单字段上限 128KB，长文本单元格会直接报错；放宽到平台允许的最大值
+    limit = sys.maxsize
+    while True:
+        try:
+            csv.field_size_limit(limit)
+            return
+        except OverflowError:
+            limit //= 10
 
 
 class CsvAdapter:
@@ -45,52 +71,61 @@ class CsvAdapter:
         export_dir: Path,
         job_id: str,
     ) -> PreparedTranslation:
-        # 读取全量（Demo 简化）：导出时需要保留未翻译的行
-        try:
-            df = pd.read_csv(file_path)
-        except UnicodeDecodeError:
-            df = pd.read_csv(file_path, encoding="utf-8-sig")
+        _ensure_csv_field_limit()
+
+        # 只读取表头与前 N 行：其余行在导出时流式透传
+        limit = max(0, int(row_limit or 0))
+        head_rows: list[list[str]] = []
+        with _open_csv(file_path) as f:
+            records = _iter_records(f)
+            raw_header = next(records, [])
+            columns = dedupe_columns(raw_header)
+            for row in records:
+                if len(head_rows) >= limit:
+                    break
+                head_rows.append(row)
+
+        width = len(columns)
+        if any(len(row) > width for row in head_rows):
+            raise ValueError("CSV 数据行的列数多于表头，请检查文件格式")
+        df = pd.DataFrame(
+            [row + [""] * (width - len(row)) for row in head_rows],
+            columns=columns,
+            dtype=str,
+        )
 
         selected = [c for c in selected_fields if c in df.columns]
-        limit = min(max(0, int(row_limit or 0)), len(df))
-
-        items: list[TranslateItem] = []
-        for r in range(limit):
-            for col in selected:
-                val = df.at[r, col]
-                if _is_blank(val):
-                    continue
-                items.append(
-                    TranslateItem(
-                        id=f"r{r}::c{col}",
-                        text=str(val),
-                        hint=f"列={col}",
-                    )
-                )
+        items = ItemStore()
+        columns_items = extract_column_items(df, selected, limit=len(df), store=items)
 
         def apply(translations: dict[str, str]) -> Path:
-            out_df = df.copy()
-
-            if mode == "add_columns":
-                for col in selected:
-                    zh_col = f"{col}_zh"
-                    if zh_col not in out_df.columns:
-                        out_df[zh_col] = ""
-                for it in items:
-                    r, col = _parse_item_id(it.id)
-                    zh_col = f"{col}_zh"
-                    out_df.at[r, zh_col] = translations.get(it.id, "")
-            elif mode == "overwrite":
-                for it in items:
-                    r, col = _parse_item_id(it.id)
-                    out_df.at[r, col] = translations.get(it.id, out_df.at[r, col])
-            else:
-                raise ValueError(f"未知 mode: {mode}")
+            out_df = apply_column_translations(df, columns_items, translations, mode=mode)
+
+            # 新增列：透传行需要补齐对应数量的空值
+            extra = len(out_df.columns) - width
 
             export_dir.mkdir(parents=True, exist_ok=True)
             out_path = export_dir / f"{file_path.stem}_translated_{job_id}.csv"
-            out_df.to_csv(out_path, index=False, encoding="utf-8-sig")
+            with _open_csv(file_path) as src, out_path.open("w", encoding="utf-8-sig", newline="") as dst:
+                writer = csv.writer(dst, lineterminator="\n")
+                writer.writerow(raw_header + [str(c) for c in out_df.columns[width:]])
+                writer.writerows(out_df.itertuples(index=False, name=None))
+
+                records = _iter_records(src)
+                # 跳过表头与已写出的前 N 行
+                for _ in range(len(head_rows) + 1):
+                    next(records, None)
+
+                chunk: list[list[str]] = []
+                for row in records:
+                    if extra:
+                        row = row + [""] * (width - len(row) + extra)
+                    chunk.append(row)
+                    if len(chunk) >= _PASSTHROUGH_CHUNK_ROWS:
+                        writer.writerows(chunk)
+                        chunk.clear()
+                if chunk:
+                    writer.writerows(chunk)
             return out_path
 
         return PreparedTranslation(items=items, apply=apply)
-
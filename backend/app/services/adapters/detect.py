@@ -14,7 +14,7 @@ from dataclasses import dataclass
 class DetectedFormat:
     """内部统一格式标识。"""
 
-    name: str  # json/jsonl/csv/xlsx/unknown
+    name: str  # json/jsonl/csv/xlsx/parquet/unknown
 
 
 def detect_format(*, filename: str, content_type: str) -> DetectedFormat:
@@ -31,6 +31,8 @@ def detect_format(*, filename: str, content_type: str) -> DetectedFormat:
         return DetectedFormat("csv")
     if fname.endswith(".xlsx") or "spreadsheetml" in ctype or "excel" in ctype:
         return DetectedFormat("xlsx")
+    if fname.endswith(".parquet") or "parquet" in ctype:
+        return DetectedFormat("parquet")
 
     return DetectedFormat("unknown")
 
@@ -3,13 +3,13 @@
 from __future__ import annotations
 
 import json
-from dataclasses import dataclass
 from pathlib import Path
 from typing import Any
 
 from app.services.adapters.base import PreparedTranslation
-from app.services.adapters.json_path import JsonLeafRef, find_leaf_refs
-from app.services.translator.ark_translator import TranslateItem
+from app.services.adapters.json_path import compile_selector
+from app.services.adapters.json_stream import read_json_array_head_from_path, write_json_array
+from app.services.translator.item_store import ItemStore
 
 
 def _is_blank_text(value: Any) -> bool:
@@ -20,13 +20,6 @@ def _is_blank_text(value: Any) -> bool:
     return not value.strip()
 
 
-@dataclass(frozen=True)
-class _SetOp:
-    item_id: str
-    parent: Any  # dict 或 list
-    key: Any  # str 或 int
-
-
 class JsonAdapter:
     format_name = "json"
 
@@ -41,53 +34,59 @@ class JsonAdapter:
         export_dir: Path,
         job_id: str,
     ) -> PreparedTranslation:
-        data = json.loads(file_path.read_text(encoding="utf-8"))
-
         # 统一按“记录列表”处理：root 为 list -> 多条；root 为 dict -> 单条
-        if isinstance(data, list):
-            records = data
-            record_indices = list(range(min(max(0, int(row_limit or 0)), len(records))))
+        # - root 为 list 时只增量解析前 row_limit 条，其余元素导出时按字节透传（见 json_stream）
+        head = read_json_array_head_from_path(file_path, limit=int(row_limit or 0))
+        data: Any = None
+        if head is not None:
+            records = head.elements
         else:
+            data = json.loads(file_path.read_text(encoding="utf-8-sig"))
             records = [data]
-            record_indices = [0]
+        record_indices = list(range(len(records)))
+
+        # 所有字段路径编译一次：每条记录只遍历一次
+        selector = compile_selector(selected_fields)
 
-        items: list[TranslateItem] = []
-        ops: list[_SetOp] = []
-        counter = 0
+        # 翻译单元存进紧凑存储：item id 即存储下标，回填位置按同一下标保存在 parents/keys 中
+        items = ItemStore()
+        parents: list[Any] = []  # dict 或 list
+        keys: list[Any] = []  # str 或 int
 
         for ridx in record_indices:
             record = records[ridx]
-            for path in selected_fields:
-                for ref in find_leaf_refs(record, path):
-                    # 仅翻译字符串
-                    if _is_blank_text(ref.value):
-                        continue
-
-                    op_key: Any
-                    if mode == "add_columns":
-                        # dict 叶子：新增 sibling key；list 叶子：无法新增字段，只能跳过
-                        if isinstance(ref.parent, dict) and isinstance(ref.key, str):
-                            op_key = f"{ref.key}_zh"
-                        else:
-                            continue
-                    elif mode == "overwrite":
-                        op_key = ref.key
+            for path, ref in selector.iter_leaf_refs(record):
+                # 仅翻译字符串
+                if _is_blank_text(ref.value):
+                    continue
+
+                op_key: Any
+                if mode == "add_columns":
+                    # dict 叶子：新增 sibling key；list 叶子：无法新增字段，只能跳过
+                    if isinstance(ref.parent, dict) and isinstance(ref.key, str):
+                        op_key = f"{ref.key}_zh"
                     else:
-                        raise ValueError(f"未知 mode: {mode}")
+                        continue
+                elif mode == "overwrite":
+                    op_key = ref.key
+                else:
+                    raise ValueError(f"未知 mode: {mode}")
 
-                    item_id = f"t{counter}"
-                    counter += 1
-                    items.append(TranslateItem(id=item_id, text=str(ref.value), hint=f"path={path}"))
-                    ops.append(_SetOp(item_id=item_id, parent=ref.parent, key=op_key))
+                items.append(str(ref.value), f"path={path}")
+                parents.append(ref.parent)
+                keys.append(op_key)
 
         def apply(translations: dict[str, str]) -> Path:
             # 回填
-            for op in ops:
-                op.parent[op.key] = translations.get(op.item_id, "")
+            for i, (parent, key) in enumerate(zip(parents, keys)):
+                parent[key] = translations.get(str(i), "")
 
             export_dir.mkdir(parents=True, exist_ok=True)
             out_path = export_dir / f"{file_path.stem}_translated_{job_id}.json"
-            out_path.write_text(json.dumps(data, ensure_ascii=False, indent=2), encoding="utf-8")
+            if head is not None:
+                write_json_array(out_path, src_path=file_path, head=head)
+            else:
+                out_path.write_text(json.dumps(data, ensure_ascii=False, indent=2), encoding="utf-8")
             return out_path
 
         return PreparedTranslation(items=items, apply=apply)
@@ -3,6 +3,12 @@
 支持语法：
 - 点号路径：a.b.c
 - 列表通配：items[].text  （表示 items 是列表，对列表中每个元素取 text）
+- 多层通配：a[].b[].c
+
+两种用法：
+- `find_leaf_refs(obj, path)`：单条路径、单条记录的便捷函数；
+- `compile_selector(paths)`：任务开始时把所有路径编译成一棵前缀树，每条记录只遍历一次即可
+  取出所有路径的叶子（共享前缀的子树不会被重复遍历，路径字符串也不会被反复解析）。
 
 不引入第三方 jsonpath 依赖，保持 Demo 简洁可维护。
 """
@@ -10,12 +16,14 @@
 from __future__ import annotations
 
 from dataclasses import dataclass
-from typing import Any, Iterable, List
+from typing import Any, Iterable, Iterator, NamedTuple
+
 
+class JsonLeafRef(NamedTuple):
+    """指向一个可被替换/新增的叶子值。
 
-@dataclass(frozen=True)
-class JsonLeafRef:
-    """指向一个可被替换/新增的叶子值。"""
+    使用 NamedTuple 而不是 frozen dataclass：大文件里会创建上百万个引用，构造开销差几倍。
+    """
 
     parent: Any  # dict 或 list
     key: Any  # dict key(str) 或 list index(int)
@@ -82,3 +90,82 @@ def find_leaf_refs(obj: Any, path: str) -> list[JsonLeafRef]:
 
     return []
 
+
+
+@dataclass
+class _TrieNode:
+    """前缀树节点：children 的 key 为 (字段名, 是否列表通配)。"""
+
+    children: dict[tuple[str, bool], "_TrieNode"]
+    # 以该节点结尾的路径（在 paths 中的下标）
+    terminals: list[int]
+
+
+class JsonSelector:
+    """编译后的多路径选择器（见 `compile_selector`）。"""
+
+    def __init__(self, paths: Iterable[str]) -> None:
+        self.paths: list[str] = list(paths)
+        self._root = _TrieNode(children={}, terminals=[])
+        for i, path in enumerate(self.paths):
+            segs = _parse_segments(path)
+            if not segs:
+                continue
+            node = self._root
+            for seg in segs:
+                child = node.children.get(seg)
+                if child is None:
+                    child = node.children[seg] = _TrieNode(children={}, terminals=[])
+                node = child
+            node.terminals.append(i)
+
+    def find_all(self, obj: Any) -> list[list[JsonLeafRef]]:
+        """一次遍历取出所有路径的叶子引用：返回值与 `paths` 一一对应。
+
+        每条路径的结果与 `find_leaf_refs(obj, path)` 完全一致（包括顺序）。
+        """
+
+        out: list[list[JsonLeafRef]] = [[] for _ in self.paths]
+        self._visit(obj, self._root, out)
+        return out
+
+    def iter_leaf_refs(self, obj: Any) -> Iterator[tuple[str, JsonLeafRef]]:
+        """按 paths 顺序产出 (path, ref)。"""
+
+        for path, refs in zip(self.paths, self.find_all(obj)):
+            for ref in refs:
+                yield path, ref
+
+    def _visit(self, node: Any, trie: _TrieNode, out: list[list[JsonLeafRef]]) -> None:
+        if not isinstance(node, dict):
+            return
+        for (key, wildcard), child in trie.children.items():
+            if key not in node:
+                continue
+            val = node[key]
+
+            if child.terminals:
+                if wildcard:
+                    # 叶子是列表元素：可在 overwrite 模式下逐元素替换
+                    if isinstance(val, list):
+                        leaf_refs = [JsonLeafRef(parent=val, key=idx, value=elem) for idx, elem in enumerate(val)]
+                    else:
+                        leaf_refs = []
+                else:
+                    leaf_refs = [JsonLeafRef(parent=node, key=key, value=val)]
+                for i in child.terminals:
+                    out[i].extend(leaf_refs)
+
+            if child.children:
+                if wildcard:
+                    if isinstance(val, list):
+                        for elem in val:
+                            self._visit(elem, child, out)
+                else:
+                    self._visit(val, child, out)
+
+
+def compile_selector(paths: Iterable[str]) -> JsonSelector:
+    """把一组字段路径编译成前缀树选择器（每个任务编译一次）。"""
+
+    return JsonSelector(paths)
@@ -0,0 +1,252 @@
+"""顶层数组/对象 JSON 的增量读取与流式写出。
+
+背景：
+- `json.loads(file_path.read_text())` 会把整个文件变成 Python 对象：2GB 的 JSON 数组要占用数倍内存，
+  而任务往往只翻译前 50 条；导出时再 `json.dumps(indent=2)` 整个文档，成本同样与文件大小成正比。
+
+做法：
+- 读取：按块增量解码，用 `json.JSONDecoder.raw_decode` 逐个解析数组元素（C 实现），只解析前 N 个；
+  同时记录“最后一个已解析元素之后”在源文件中的字节偏移；
+- 写出：前 N 个元素重新序列化（保持 indent=2 风格），其余部分从该偏移开始按字节原样拷贝，
+  不解析、不重新序列化。
+
+- 预览：顶层为对象时同样只解析前 N 个成员（`read_json_object_head`），上传接口的耗时与文件大小无关。
+
+说明：
+- 流式写出只处理顶层为数组的文档；顶层为对象时 `read_json_array_head` 返回 None，
+  翻译任务回退到整体解析（对象整体就是一条记录）；
+- 源文件按 UTF-8 处理（兼容 BOM）。
+"""
+
+from __future__ import annotations
+
+import codecs
+import json
+import shutil
+from dataclasses import dataclass
+from pathlib import Path
+from typing import Any, BinaryIO, Optional
+
+
+_CHUNK_BYTES = 1024 * 1024
+_WHITESPACE = " \t\n\r"
+# 标量（数字/true/false/null）之后合法的下一个字符
+_DELIMITERS = ",]}:" + _WHITESPACE
+# 解码错误/标量结尾距缓冲区末尾不超过该字符数时，可能只是被块边界截断（如 "1." "tr" "\u12"）
+_TRUNCATION_WINDOW = 8
+# 单个值最多向后读取的字符数：超过即报错，避免语法错误时把整个文件读进缓冲区
+_MAX_VALUE_CHARS = 256 * 1024 * 1024
+_BOM = codecs.BOM_UTF8
+
+
+@dataclass
+class JsonArrayHead:
+    """顶层数组的前 N 个元素。"""
+
+    elements: list[Any]
+    # 最后一个已解析元素之后的字节偏移（若一个元素都没解析，则为 `[` 之后）；从这里开始的字节原样透传
+    tail_offset: int
+    # 数组是否已在前 N 个元素内结束
+    complete: bool
+
+
+@dataclass
+class JsonObjectHead:
+    """顶层对象的前 N 个成员（只用于预览）。"""
+
+    members: dict[str, Any]
+    # 对象是否已在前 N 个成员内结束
+    complete: bool
+
+
+class _IncrementalReader:
+    """按块解码的文本缓冲，能把缓冲区内的字符位置换算回源文件的字节偏移。"""
+
+    def __init__(self, f: BinaryIO) -> None:
+        self._f = f
+        self._decoder = codecs.getincrementaldecoder("utf-8")()
+        self._json = json.JSONDecoder()
+        self.buf = ""
+        self.pos = 0
+        # buf[0] 在源文件中的字节偏移
+        self._base = 0
+        self.eof = False
+
+        first = f.read(len(_BOM))
+        if first == _BOM:
+            self._base = len(_BOM)
+        else:
+            self.buf = self._decoder.decode(first)
+
+    def fill(self, size: Optional[int] = None) -> None:
+        if self.eof:
+            return
+        data = self._f.read(size or _CHUNK_BYTES)
+        if not data:
+            self.eof = True
+            self.buf += self._decoder.decode(b"", final=True)
+            return
+        self.buf += self._decoder.decode(data)
+
+    def compact(self) -> None:
+        """丢弃已消费的文本，避免缓冲区随读取量增长。"""
+
+        if self.pos:
+            self._base += len(self.buf[: self.pos].encode("utf-8"))
+            self.buf = self.buf[self.pos :]
+            self.pos = 0
+
+    def byte_offset(self) -> int:
+        return self._base + len(self.buf[: self.pos].encode("utf-8"))
+
+    def peek(self) -> str:
+        """跳过空白并返回下一个字符（到达文件末尾返回空字符串）。"""
+
+        while True:
+            while self.pos < len(self.buf) and self.buf[self.pos] in _WHITESPACE:
+                self.pos += 1
+            if self.pos < len(self.buf) or self.eof:
+                return self.buf[self.pos : self.pos + 1]
+            self.compact()
+            self.fill()
+
+    def _may_be_cut(self, end: int) -> bool:
+        """`raw_decode` 解析出的值（结束于 end）是否可能被块边界截断。"""
+
+        if self.eof:
+            return False
+        if end >= len(self.buf):
+            return True
+        # 字符串/数组/对象自带结束符；标量只有后面紧跟分隔符才算完整（"1.5" 可能被截成 "1."）
+        if self.buf[end - 1] in '"]}' or self.buf[end] in _DELIMITERS:
+            return False
+        return len(self.buf) - end < _TRUNCATION_WINDOW
+
+    def _may_be_truncated(self, err: json.JSONDecodeError) -> bool:
+        """解码错误是否可能只是因为缓冲区不完整（否则是真正的语法错误，直接抛出）。"""
+
+        if self.eof:
+            return False
+        # 未闭合字符串的错误位置在字符串开头，无法据此判断，只能继续读
+        if err.msg.startswith("Unterminated string"):
+            return True
+        return err.pos >= len(self.buf) - _TRUNCATION_WINDOW
+
+    def _grow(self, size: int) -> None:
+        if len(self.buf) - self.pos > _MAX_VALUE_CHARS:
+            raise ValueError(f"JSON 单个值过大或格式错误（偏移 {self.byte_offset()}）")
+        self.fill(size)
+
+    def decode_value(self) -> Any:
+        """解析从当前位置开始的一个 JSON 值（缓冲区不够时继续读取，读取量按倍数增长）。"""
+
+        size = _CHUNK_BYTES
+        while True:
+            try:
+                value, end = self._json.raw_decode(self.buf, self.pos)
+            except json.JSONDecodeError as e:
+                if not self._may_be_truncated(e):
+                    raise
+                self._grow(size)
+                size *= 2
+                continue
+
+            if self._may_be_cut(end):
+                self._grow(size)
+                size *= 2
+                continue
+
+            self.pos = end
+            return value
+
+
+def read_json_array_head(f: BinaryIO, *, limit: int) -> Optional[JsonArrayHead]:
+    """读取顶层数组的前 limit 个元素；顶层不是数组时返回 None。"""
+
+    limit = max(0, int(limit or 0))
+    reader = _IncrementalReader(f)
+
+    if reader.peek() != "[":
+        return None
+    reader.pos += 1
+    tail_offset = reader.byte_offset()
+
+    elements: list[Any] = []
+    while len(elements) < limit:
+        ch = reader.peek()
+        if ch == "]":
+            return JsonArrayHead(elements=elements, tail_offset=tail_offset, complete=True)
+        if elements:
+            if ch != ",":
+                raise ValueError(f"JSON 数组格式错误（偏移 {reader.byte_offset()}）")
+            reader.pos += 1
+            reader.peek()
+
+        elements.append(reader.decode_value())
+        tail_offset = reader.byte_offset()
+        reader.compact()
+
+    complete = reader.peek() == "]"
+    return JsonArrayHead(elements=elements, tail_offset=tail_offset, complete=complete)
+
+
+def read_json_array_head_from_path(path: Path, *, limit: int) -> Optional[JsonArrayHead]:
+    with path.open("rb") as f:
+        return read_json_array_head(f, limit=limit)
+
+
+def read_json_object_head(f: BinaryIO, *, limit: int) -> Optional[JsonObjectHead]:
+    """读取顶层对象的前 limit 个成员；顶层不是对象时返回 None。"""
+
+    limit = max(0, int(limit or 0))
+    reader = _IncrementalReader(f)
+
+    if reader.peek() != "{":
+        return None
+    reader.pos += 1
+
+    members: dict[str, Any] = {}
+    count = 0
+    while count < limit:
+        ch = reader.peek()
+        if ch == "}":
+            return JsonObjectHead(members=members, complete=True)
+        if count:
+            if ch != ",":
+                raise ValueError(f"JSON 对象格式错误（偏移 {reader.byte_offset()}）")
+            reader.pos += 1
+            ch = reader.peek()
+        if ch != '"':
+            raise ValueError(f"JSON 对象格式错误（偏移 {reader.byte_offset()}）")
+
+        key = reader.decode_value()
+        if reader.peek() != ":":
+            raise ValueError(f"JSON 对象格式错误（偏移 {reader.byte_offset()}）")
+        reader.pos += 1
+        reader.peek()
+
+        members[key] = reader.decode_value()
+        count += 1
+        reader.compact()
+
+    complete = reader.peek() == "}"
+    return JsonObjectHead(members=members, complete=complete)
+
+
+def read_json_object_head_from_path(path: Path, *, limit: int) -> Optional[JsonObjectHead]:
+    with path.open("rb") as f:
+        return read_json_object_head(f, limit=limit)
+
+
+def write_json_array(out_path: Path, *, src_path: Path, head: JsonArrayHead) -> None:
+    """写出：前 N 个元素重新序列化（indent=2），其余部分从源文件按字节拷贝。"""
+
+    with out_path.open("wb") as dst, src_path.open("rb") as src:
+        dst.write(b"[")
+        if head.elements:
+            body = ",\n".join(
+                "  " + json.dumps(e, ensure_ascii=False, indent=2).replace("\n", "\n  ") for e in head.elements
+            )
+            dst.write(b"\n" + body.encode("utf-8"))
+        src.seek(head.tail_offset)
+        shutil.copyfileobj(src, dst, _CHUNK_BYTES)
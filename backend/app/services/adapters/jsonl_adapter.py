@@ -1,15 +1,21 @@
-"""JSONL 适配器（每行一个 JSON）。"""
+"""JSONL 适配器（每行一个 JSON）。
+
+说明：
+- 只解析前 `row_limit` 个对象行；之后的行不会被读进内存；
+- 导出时只有真正被回填的行会重新序列化，其余行（空行、没有选中字段的行、row_limit 之外的行）
+  按原始字节直接拷贝，CPU 与内存开销只与被翻译的行数相关。
+"""
 
 from __future__ import annotations
 
 import json
-from dataclasses import dataclass
+import shutil
 from pathlib import Path
-from typing import Any, List, Optional
+from typing import Any
 
 from app.services.adapters.base import PreparedTranslation
-from app.services.adapters.json_path import find_leaf_refs
-from app.services.translator.ark_translator import TranslateItem
+from app.services.adapters.json_path import compile_selector
+from app.services.translator.item_store import ItemStore
 
 
 def _is_blank_text(value: Any) -> bool:
@@ -20,13 +26,6 @@ def _is_blank_text(value: Any) -> bool:
     return not value.strip()
 
 
-@dataclass(frozen=True)
-class _SetOp:
-    item_id: str
-    parent: Any
-    key: Any
-
-
 class JsonlAdapter:
     format_name = "jsonl"
 
@@ -41,29 +40,29 @@ class JsonlAdapter:
         export_dir: Path,
         job_id: str,
     ) -> PreparedTranslation:
-        # 读取：保留空行（None）以便原样输出
-        rows: list[Optional[Any]] = []
-        with file_path.open("r", encoding="utf-8") as f:
-            for line in f:
-                s = line.rstrip("\n")
-                if not s.strip():
-                    rows.append(None)
+        limit = max(0, int(row_limit or 0))
+        # 所有字段路径编译一次：每行只遍历一次
+        selector = compile_selector(selected_fields)
+
+        # 翻译单元存进紧凑存储：item id 即存储下标，回填位置按同一下标保存在 parents/keys 中
+        items = ItemStore()
+        parents: list[Any] = []  # dict 或 list
+        keys: list[Any] = []  # str 或 int
+        # 需要回填的行：物理行号 -> 解析后的对象（其余行导出时原样拷贝）
+        changed: dict[int, Any] = {}
+        seen_objects = 0
+
+        with file_path.open("rb") as f:
+            for idx, raw in enumerate(f):
+                # row_limit 以“对象行数”计数，而不是物理行数
+                if seen_objects >= limit:
+                    break
+                if not raw.strip():
                     continue
-                rows.append(json.loads(s))
-
-        obj_indices = [i for i, obj in enumerate(rows) if obj is not None]
-        translate_indices = obj_indices[: max(0, int(row_limit or 0))]
+                seen_objects += 1
+                obj = json.loads(raw)
 
-        items: list[TranslateItem] = []
-        ops: list[_SetOp] = []
-        counter = 0
-
-        for idx in translate_indices:
-            obj = rows[idx]
-            if obj is None:
-                continue
-            for path in selected_fields:
-                for ref in find_leaf_refs(obj, path):
+                for path, ref in selector.iter_leaf_refs(obj):
                     if _is_blank_text(ref.value):
                         continue
                     op_key: Any
@@ -77,23 +76,30 @@ class JsonlAdapter:
                     else:
                         raise ValueError(f"未知 mode: {mode}")
 
-                    item_id = f"t{counter}"
-                    counter += 1
-                    items.append(TranslateItem(id=item_id, text=str(ref.value), hint=f"line={idx} path={path}"))
-                    ops.append(_SetOp(item_id=item_id, parent=ref.parent, key=op_key))
+                    items.append(str(ref.value), f"path={path}")
+                    parents.append(ref.parent)
+                    keys.append(op_key)
+                    changed[idx] = obj
 
         def apply(translations: dict[str, str]) -> Path:
-            for op in ops:
-                op.parent[op.key] = translations.get(op.item_id, "")
+            for i, (parent, key) in enumerate(zip(parents, keys)):
+                parent[key] = translations.get(str(i), "")
 
             export_dir.mkdir(parents=True, exist_ok=True)
             out_path = export_dir / f"{file_path.stem}_translated_{job_id}.jsonl"
-            with out_path.open("w", encoding="utf-8") as out:
-                for obj in rows:
+            last_changed = max(changed) if changed else -1
+            with file_path.open("rb") as src, out_path.open("wb") as out:
+                for idx in range(last_changed + 1):
+                    raw = src.readline()
+                    obj = changed.get(idx)
                     if obj is None:
-                        out.write("\n")
-                    else:
-                        out.write(json.dumps(obj, ensure_ascii=False) + "\n")
+                        out.write(raw)
+                        continue
+                    # 保留原行的换行符（\n / \r\n / 文件末尾无换行）
+                    ending = raw[len(raw.rstrip(b"\r\n")) :]
+                    out.write(json.dumps(obj, ensure_ascii=False).encode("utf-8") + ending)
+                # 最后一个被回填的行之后：整体按字节拷贝
+                shutil.copyfileobj(src, out, 1024 * 1024)
             return out_path
 
         return PreparedTranslation(items=items, apply=apply)
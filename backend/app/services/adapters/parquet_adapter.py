@@ -0,0 +1,170 @@
+"""Parquet 适配器（pyarrow，按列投影 + 按行组读写）。
+
+背景：
+- 分析数据集大多以 Parquet 存放；之前只能先转成 CSV 再上传，既多一轮转换，
+  文本格式又比列式存储大得多、解析也慢。
+
+做法：
+- `prepare` 只读取选中的列，且只读覆盖前 `row_limit` 行的那几个行组（其余行组与列完全不解码）；
+- `apply` 逐个行组读取源文件并写出新的 Parquet：前 N 行所在的行组替换/新增翻译列，
+  其余行组原样透传（新增列补 null），内存上界是单个行组而不是整张表；
+- 输出保持源文件的行组划分与其他列的类型。
+
+说明：
+- 只翻译字符串类型的列（含字典编码的字符串列）；数值、时间等列不作为字段候选，也不会被改写；
+- 新增的 `<col>_zh` 列、被覆盖的列统一写为字符串列（源列为 large_string 时保持 large_string）。
+"""
+
+from __future__ import annotations
+
+from pathlib import Path
+from typing import Any, Optional
+
+import pandas as pd
+import pyarrow as pa
+import pyarrow.parquet as pq
+
+from app.services.adapters.base import PreparedTranslation
+from app.services.adapters.tabular import apply_column_translations, extract_column_items
+from app.services.translator.item_store import ItemStore
+
+
+def is_text_type(t: pa.DataType) -> bool:
+    """是否为可翻译的字符串类型。"""
+
+    if pa.types.is_dictionary(t):
+        t = t.value_type
+    return pa.types.is_string(t) or pa.types.is_large_string(t)
+
+
+def text_columns(schema: pa.Schema) -> list[str]:
+    """可作为字段候选的列（字符串列，按 schema 顺序）。"""
+
+    return [f.name for f in schema if is_text_type(f.type)]
+
+
+def _preview_value(value: Any) -> Any:
+    # 预览需要可 JSON 序列化：标量原样返回（NaN 转为 None），其余（时间、二进制、嵌套类型等）转成字符串
+    if value is None or isinstance(value, (str, bool, int)):
+        return value
+    if isinstance(value, float):
+        return None if value != value else value
+    return str(value)
+
+
+def read_parquet_head(file_path: Path, *, limit: int) -> tuple[pa.Schema, list[dict[str, Any]]]:
+    """读取 schema 与前 limit 行（只解码第一个批次，与文件大小无关）。"""
+
+    pf = pq.ParquetFile(file_path)
+    rows: list[dict[str, Any]] = []
+    if limit > 0:
+        for batch in pf.iter_batches(batch_size=limit):
+            rows = [{k: _preview_value(v) for k, v in r.items()} for r in batch.to_pylist()]
+            break
+    return pf.schema_arrow, rows
+
+
+def _head_row_groups(pf: pq.ParquetFile, limit: int) -> list[int]:
+    """覆盖前 limit 行所需的行组下标。"""
+
+    out: list[int] = []
+    rows = 0
+    for i in range(pf.num_row_groups):
+        if rows >= limit:
+            break
+        out.append(i)
+        rows += pf.metadata.row_group(i).num_rows
+    return out
+
+
+def _output_type(source: Optional[pa.Field]) -> pa.DataType:
+    if source is not None and pa.types.is_large_string(source.type):
+        return pa.large_string()
+    return pa.string()
+
+
+def _head_values(values: pd.Series) -> list[Optional[str]]:
+    return [None if v is None or (isinstance(v, float) and pd.isna(v)) else str(v) for v in values.tolist()]
+
+
+class ParquetAdapter:
+    format_name = "parquet"
+
+    def prepare(
+        self,
+        *,
+        file_path: Path,
+        selected_fields: list[str],
+        row_limit: int,
+        mode: str,
+        target_lang: str,  # noqa: ARG002
+        export_dir: Path,
+        job_id: str,
+    ) -> PreparedTranslation:
+        pf = pq.ParquetFile(file_path)
+        schema = pf.schema_arrow
+        candidates = set(text_columns(schema))
+        selected = [c for c in dict.fromkeys(selected_fields) if c in candidates]
+
+        # 列投影 + 行组裁剪：只解码选中列在前 N 行所在行组里的数据
+        limit = max(0, int(row_limit or 0))
+        row_groups = _head_row_groups(pf, limit) if selected else []
+        if row_groups:
+            head = pf.read_row_groups(row_groups, columns=selected).slice(0, limit)
+        else:
+            head = pa.table({c: pa.array([], type=pa.string()) for c in selected})
+        df = head.to_pandas()
+        head_rows = len(df)
+
+        items = ItemStore()
+        columns_items = extract_column_items(df, selected, limit=head_rows, store=items)
+
+        def apply(translations: dict[str, str]) -> Path:
+            out_df = apply_column_translations(df.copy(), columns_items, translations, mode=mode)
+
+            # 需要改写的列：overwrite 为选中列本身；add_columns 为 `<col>_zh`（已存在同名列时替换）
+            targets = [c.col for c in columns_items] if mode == "overwrite" else [f"{c.col}_zh" for c in columns_items]
+            target_types = {name: _output_type(schema.field(name) if name in schema.names else None) for name in targets}
+
+            fields: list[pa.Field] = []
+            for f in schema:
+                fields.append(pa.field(f.name, target_types[f.name]) if f.name in target_types else f)
+            fields.extend(pa.field(name, target_types[name]) for name in targets if name not in schema.names)
+            out_schema = pa.schema(fields, metadata=schema.metadata)
+
+            export_dir.mkdir(parents=True, exist_ok=True)
+            out_path = export_dir / f"{file_path.stem}_translated_{job_id}.parquet"
+
+            offset = 0
+            with pq.ParquetWriter(out_path, out_schema) as writer:
+                for i in range(pf.num_row_groups):
+                    table = pf.read_row_group(i)
+                    n = table.num_rows
+                    n_head = max(0, min(n, head_rows - offset))
+
+                    columns: dict[str, Any] = {}
+                    if n_head:
+                        for name in targets:
+                            typ = target_types[name]
+                            parts = [pa.array(_head_values(out_df[name].iloc[offset : offset + n_head]), type=typ)]
+                            if n > n_head:
+                                if name in schema.names:
+                                    parts.extend(table.column(name).slice(n_head).cast(typ).chunks)
+                                else:
+                                    parts.append(pa.nulls(n - n_head, type=typ))
+                            columns[name] = pa.chunked_array(parts, type=typ)
+                    else:
+                        # 透传行组：新增列补 null，已有的目标列只统一类型
+                        for name in targets:
+                            typ = target_types[name]
+                            if name in schema.names:
+                                columns[name] = table.column(name).cast(typ)
+                            else:
+                                columns[name] = pa.nulls(n, type=typ)
+
+                    arrays = [columns[f.name] if f.name in columns else table.column(f.name) for f in out_schema]
+                    writer.write_table(pa.Table.from_arrays(arrays, schema=out_schema), row_group_size=max(1, n))
+                    offset += n
+            return out_path
+
+        return PreparedTranslation(items=items, apply=apply)
@@ -9,6 +9,9 @@ from typing import Any
 import pandas as pd
 
 from app.schemas.files import Preview, PreviewJson, PreviewTable
+from app.services.adapters.json_stream import read_json_array_head_from_path, read_json_object_head_from_path
+from app.services.adapters.parquet_adapter import read_parquet_head, text_columns
+from app.services.adapters.xlsx_adapter import read_xlsx_heads
 
 
 def _df_to_preview_table(df: pd.DataFrame) -> PreviewTable:
@@ -35,30 +38,38 @@ def preview_and_candidates(*, file_path: Path, detected_format: str, limit: int
         return preview, preview.columns
 
     if fmt == "xlsx":
-        df = pd.read_excel(file_path, nrows=limit, engine="openpyxl")
-        preview = _df_to_preview_table(df)
-        return preview, preview.columns
+        # read_only 流式读取：只解析每个工作表的前 N 行（pd.read_excel 即使指定 nrows 也会解析整张表）
+        heads = read_xlsx_heads(file_path, limit=limit)
+        if not heads:
+            return PreviewTable(columns=[], rows=[]), []
+        preview = _df_to_preview_table(heads[0].df)
+        # 字段候选覆盖所有工作表（同名列在各工作表中都会被翻译）
+        candidates = list(dict.fromkeys(str(c) for h in heads for c in h.df.columns))
+        return preview, candidates
+
+    if fmt == "parquet":
+        # 只解码前 N 行；字段候选只包含字符串列（其他类型的列不会被翻译）
+        schema, rows = read_parquet_head(file_path, limit=limit)
+        return PreviewTable(columns=list(schema.names), rows=rows), text_columns(schema)
 
     if fmt == "json":
-        data = json.loads(file_path.read_text(encoding="utf-8"))
-        preview_value: Any = data
-        candidates: list[str] = []
-
-        if isinstance(data, dict):
-            candidates = [str(k) for k in data.keys()]
-            # 预览只展示前 N 个 key，避免超大对象撑爆页面
-            preview_value = {k: data[k] for k in list(data.keys())[:limit]}
-        elif isinstance(data, list):
-            # 预览只取前 N 个元素
-            preview_value = data[:limit]
+        # 只增量解析前 N 个数组元素 / 对象成员，不加载整个文件（上传耗时与文件大小无关）
+        head = read_json_array_head_from_path(file_path, limit=limit)
+        if head is not None:
             # 如果元素是 dict，则汇总 key
             keys: set[str] = set()
-            for item in preview_value:
+            for item in head.elements:
                 if isinstance(item, dict):
                     keys.update([str(k) for k in item.keys()])
-            candidates = sorted(keys)
+            return PreviewJson(value=head.elements), sorted(keys)
+
+        obj_head = read_json_object_head_from_path(file_path, limit=limit)
+        if obj_head is not None:
+            # 预览与字段候选只取前 N 个 key，避免超大对象撑爆页面（其余字段可在页面上手动添加）
+            return PreviewJson(value=obj_head.members), [str(k) for k in obj_head.members]
 
-        return PreviewJson(value=preview_value), candidates
+        # 顶层为标量：没有可选字段
+        return PreviewJson(value=json.loads(file_path.read_text(encoding="utf-8-sig"))), []
 
     if fmt == "jsonl":
         items: list[Any] = []
@@ -5,6 +5,7 @@ from __future__ import annotations
 from app.services.adapters.csv_adapter import CsvAdapter
 from app.services.adapters.json_adapter import JsonAdapter
 from app.services.adapters.jsonl_adapter import JsonlAdapter
+from app.services.adapters.parquet_adapter import ParquetAdapter
 from app.services.adapters.xlsx_adapter import XlsxAdapter
 from app.services.adapters.base import DataAdapter
 
@@ -14,6 +15,7 @@ _ADAPTERS: dict[str, DataAdapter] = {
     "xlsx": XlsxAdapter(),
     "json": JsonAdapter(),
     "jsonl": JsonlAdapter(),
+    "parquet": ParquetAdapter(),
 }
 
 
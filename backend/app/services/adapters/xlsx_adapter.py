@@ -1,32 +1,97 @@
-"""XLSX 适配器（pandas + openpyxl）。"""
+"""XLSX 适配器（openpyxl 流式读写）。
+
+背景：
+- `pd.read_excel` 会把整张表解析进内存，`to_excel` 再整体写回；
+  几十万行的工作表既慢又吃内存，而且只处理第一个工作表。
+
+做法：
+- 读取使用 openpyxl `read_only=True` 按行迭代：`prepare` 只把每个工作表的表头与前 `row_limit` 行放进 DataFrame；
+- 导出使用 `write_only=True` 流式写出：前 N 行写回填后的值，其余行从源文件逐行透传；
+- 覆盖工作簿中的所有工作表：选中的列在哪个工作表存在就翻译哪个（所有工作表共用一个 `ItemStore`）。
+
+说明：
+- 与 `pd.read_excel` 一致：读取单元格的缓存值（公式按计算结果导出），不保留样式；
+- 列名规则与 pandas 一致（见 `dedupe_columns`），与预览的字段候选对应；
+- 按文件对象打开工作簿：openpyxl 按路径打开时会校验扩展名，而内容寻址存储里的文件没有后缀。
+"""
 
 from __future__ import annotations
 
+import contextlib
+from dataclasses import dataclass
 from pathlib import Path
-from typing import Any
+from typing import Any, Iterator, Optional
 
 import pandas as pd
+from openpyxl import Workbook, load_workbook
 
 from app.services.adapters.base import PreparedTranslation
-from app.services.translator.ark_translator import TranslateItem
+from app.services.adapters.tabular import ColumnItems, apply_column_translations, dedupe_columns, extract_column_items
+from app.services.translator.item_store import ItemStore
+
+
+@dataclass
+class XlsxSheetHead:
+    """一个工作表的表头与前 N 行。"""
+
+    title: str
+    raw_header: list[Any]
+    df: pd.DataFrame
+
+
+def _fit_row(row: tuple[Any, ...], width: int) -> list[Any]:
+    values = list(row[:width])
+    if len(values) < width:
+        values.extend([None] * (width - len(values)))
+    return values
+
+
+@contextlib.contextmanager
+def _open_workbook(file_path: Path) -> Iterator[Any]:
+    """只读打开工作簿（不依赖文件后缀），退出时关闭工作簿与文件句柄。"""
+
+    with file_path.open("rb") as fh:
+        wb = load_workbook(fh, read_only=True, data_only=True)
+        try:
+            yield wb
+        finally:
+            wb.close()
 
 
-def _is_blank(value: Any) -> bool:
+def read_xlsx_heads(file_path: Path, *, limit: int, sheets: Optional[int] = None) -> list[XlsxSheetHead]:
+    """流式读取每个工作表的表头与前 limit 行（`sheets` 限制读取的工作表数量）。"""
+
+    limit = max(0, int(limit or 0))
+    with _open_workbook(file_path) as wb:
+        heads: list[XlsxSheetHead] = []
+        for ws in wb.worksheets[:sheets]:
+            rows = ws.iter_rows(values_only=True)
+            # read_only 模式下每行按工作表的维度补齐，表头行的长度即列数
+            raw_header = list(next(rows, ()))
+            width = len(raw_header)
+
+            head_rows: list[list[Any]] = []
+            if width:
+                for row in rows:
+                    if len(head_rows) >= limit:
+                        break
+                    head_rows.append(_fit_row(row, width))
+
+            df = pd.DataFrame(head_rows, columns=dedupe_columns(raw_header), dtype=object)
+            heads.append(XlsxSheetHead(title=ws.title, raw_header=raw_header, df=df))
+        return heads
+
+
+def _cell_value(value: Any) -> Any:
+    # DataFrame 里的缺失值写回为空单元格
     if value is None:
-        return True
+        return None
     try:
         if pd.isna(value):
-            return True
-    except Exception:  # noqa: BLE001
+            return None
+    except (TypeError, ValueError):
         pass
-    return not str(value).strip()
-
-
-def _parse_item_id(item_id: str) -> tuple[int, str]:
-    left, right = item_id.split("::", 1)
-    row_idx = int(left[1:])
-    col = right[1:]
-    return row_idx, col
+    return value
 
 
 class XlsxAdapter:
@@ -43,48 +108,48 @@ class XlsxAdapter:
         export_dir: Path,
         job_id: str,
     ) -> PreparedTranslation:
-        # 读取全量（Demo 简化）
-        df = pd.read_excel(file_path, engine="openpyxl")
-
-        selected = [c for c in selected_fields if c in df.columns]
-        limit = min(max(0, int(row_limit or 0)), len(df))
-
-        items: list[TranslateItem] = []
-        for r in range(limit):
-            for col in selected:
-                val = df.at[r, col]
-                if _is_blank(val):
-                    continue
-                items.append(
-                    TranslateItem(
-                        id=f"r{r}::c{col}",
-                        text=str(val),
-                        hint=f"列={col}",
-                    )
-                )
+        heads = read_xlsx_heads(file_path, limit=int(row_limit or 0))
+
+        items = ItemStore()
+        sheet_columns: list[list[ColumnItems]] = []
+        for head in heads:
+            selected = [c for c in selected_fields if c in head.df.columns]
+            sheet_columns.append(extract_column_items(head.df, selected, limit=len(head.df), store=items))
+
+        def _sheet_rows(
+            head: XlsxSheetHead, out_df: pd.DataFrame, src_rows: Iterator[tuple[Any, ...]]
+        ) -> Iterator[list[Any]]:
+            width = len(head.raw_header)
+            extra = len(out_df.columns) - width
+
+            yield head.raw_header + [str(c) for c in out_df.columns[width:]]
+            for row in out_df.itertuples(index=False, name=None):
+                yield [_cell_value(v) for v in row]
+
+            # 透传：跳过表头与已写出的前 N 行，其余行原样写出（新增列补空）
+            for _ in range(len(head.df) + 1):
+                next(src_rows, None)
+            for row in src_rows:
+                if extra:
+                    yield _fit_row(row, width) + [None] * extra
+                else:
+                    yield list(row)
 
         def apply(translations: dict[str, str]) -> Path:
-            out_df = df.copy()
-
-            if mode == "add_columns":
-                for col in selected:
-                    zh_col = f"{col}_zh"
-                    if zh_col not in out_df.columns:
-                        out_df[zh_col] = ""
-                for it in items:
-                    r, col = _parse_item_id(it.id)
-                    out_df.at[r, f"{col}_zh"] = translations.get(it.id, "")
-            elif mode == "overwrite":
-                for it in items:
-                    r, col = _parse_item_id(it.id)
-                    out_df.at[r, col] = translations.get(it.id, out_df.at[r, col])
-            else:
-                raise ValueError(f"未知 mode: {mode}")
-
             export_dir.mkdir(parents=True, exist_ok=True)
             out_path = export_dir / f"{file_path.stem}_translated_{job_id}.xlsx"
-            out_df.to_excel(out_path, index=False, engine="openpyxl")
+
+            with _open_workbook(file_path) as src:
+                out = Workbook(write_only=True)
+                for head, columns_items, ws in zip(heads, sheet_columns, src.worksheets):
+                    out_df = apply_column_translations(head.df, columns_items, translations, mode=mode)
+                    ws_out = out.create_sheet(title=head.title)
+                    if not head.raw_header:
+                        # 空工作表：原样保留为空表
+                        continue
+                    for row in _sheet_rows(head, out_df, ws.iter_rows(values_only=True)):
+                        ws_out.append(row)
+                out.save(out_path)
             return out_path
 
         return PreparedTranslation(items=items, apply=apply)
-
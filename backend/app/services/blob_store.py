@@ -0,0 +1,168 @@
+"""内容寻址的上传存储（SHA-256 去重 + 引用计数 + 预览缓存）。
+
+背景：
+- 之前每次上传都按新的 uuid 落盘并重新生成预览：同一份几百 MB 的导出被反复上传时，
+  磁盘占用与解析开销都成倍增长。
+
+做法：
+- 上传流在 `shutil.copyfileobj` 写入临时文件的同时计算 SHA-256（不额外读一遍文件）；
+  分片上传的文件在 complete 时读一遍计算（哈希状态无法跨请求保存）；
+- 内容以 `<sha256>` 存一份（`StoredBlob`），每个 `UploadedFile` 记录指向它并累加引用计数；
+  已存在的内容直接丢弃临时文件；
+- 预览/字段候选按（内容, 格式）缓存在 `StoredBlob.preview_cache` 中，重复上传不再解析。
+
+说明：
+- 存储文件名不带后缀：同一内容可能以不同的文件名/后缀上传，格式以各自的 `UploadedFile.detected_format` 为准
+  （适配器不依赖文件后缀）；
+- 上传记录被删除（过期未使用的上传，见 `api/endpoints/files.py`）时 `release_blob` 引用计数 -1，
+  降到 0 时删除文件与记录。
+"""
+
+from __future__ import annotations
+
+import hashlib
+import os
+import shutil
+from pathlib import Path
+from typing import Any, BinaryIO, Optional
+from uuid import uuid4
+
+from pydantic import TypeAdapter
+from sqlalchemy import delete, update
+from sqlalchemy.exc import IntegrityError
+from sqlalchemy.orm import Session
+
+from app.core.config import settings
+from app.core.paths import resolve_backend_path
+from app.models.stored_blob import StoredBlob
+from app.schemas.files import Preview
+
+
+_COPY_CHUNK_BYTES = 1024 * 1024
+_PREVIEW_ADAPTER: TypeAdapter[Preview] = TypeAdapter(Preview)
+
+
+class _HashingWriter:
+    """写入时顺带计算 SHA-256 与字节数（作为 copyfileobj 的目标）。"""
+
+    def __init__(self, f: BinaryIO) -> None:
+        self._f = f
+        self.sha256 = hashlib.sha256()
+        self.size_bytes = 0
+
+    def write(self, data: bytes) -> int:
+        self.sha256.update(data)
+        self.size_bytes += len(data)
+        return self._f.write(data)
+
+
+def save_upload_stream(src: BinaryIO) -> tuple[Path, str, int]:
+    """把上传流写入 UPLOADS_DIR 下的临时文件，返回（临时文件路径, sha256, 字节数）。"""
+
+    uploads_dir = resolve_backend_path(settings.UPLOADS_DIR)
+    uploads_dir.mkdir(parents=True, exist_ok=True)
+    tmp_path = uploads_dir / f".upload-{uuid4()}.tmp"
+    try:
+        with tmp_path.open("wb") as out:
+            writer = _HashingWriter(out)
+            shutil.copyfileobj(src, writer, _COPY_CHUNK_BYTES)
+    except Exception:
+        tmp_path.unlink(missing_ok=True)
+        raise
+    return tmp_path, writer.sha256.hexdigest(), writer.size_bytes
+
+
+def hash_file(path: Path) -> str:
+    """分块计算已落盘文件的 SHA-256（用于分片上传完成时）。"""
+
+    h = hashlib.sha256()
+    with path.open("rb") as f:
+        while chunk := f.read(_COPY_CHUNK_BYTES):
+            h.update(chunk)
+    return h.hexdigest()
+
+
+def acquire_blob(db: Session, *, tmp_path: Path, sha256: str, size_bytes: int) -> StoredBlob:
+    """登记一份上传内容（引用计数 +1）：内容已存在时丢弃临时文件，否则把临时文件改名为正式文件（不复制）。"""
+
+    blob = db.get(StoredBlob, sha256)
+    if blob is None or not resolve_backend_path(blob.storage_path).exists():
+        relative_path = Path(settings.UPLOADS_DIR) / sha256
+        if blob is None:
+            new_blob = StoredBlob(
+                sha256=sha256,
+                size_bytes=size_bytes,
+                storage_path=relative_path.as_posix(),
+                ref_count=1,
+                preview_cache={},
+            )
+            try:
+                os.replace(tmp_path, resolve_backend_path(relative_path))
+                db.add(new_blob)
+                db.commit()
+                return new_blob
+            except IntegrityError:
+                # 并发上传了相同内容：对方已经登记，按“已存在”处理
+                db.rollback()
+        else:
+            # 记录还在但文件丢失（例如被手动清理）：用本次上传的内容补回
+            os.replace(tmp_path, resolve_backend_path(blob.storage_path))
+
+    result = db.execute(
+        update(StoredBlob).where(StoredBlob.sha256 == sha256).values(ref_count=StoredBlob.ref_count + 1)
+    )
+    if not result.rowcount:
+        # 记录刚被 release_blob 删除（最后一个引用同时释放）：按新内容重新登记
+        db.rollback()
+        if not tmp_path.exists():
+            raise RuntimeError("上传内容登记失败，请重试")
+        return acquire_blob(db, tmp_path=tmp_path, sha256=sha256, size_bytes=size_bytes)
+    db.commit()
+    # 引用计数加上之后才丢弃临时文件：登记失败时内容还在
+    tmp_path.unlink(missing_ok=True)
+    blob = db.get(StoredBlob, sha256)
+    if blob is None:
+        raise RuntimeError("上传内容登记失败，请重试")
+    db.refresh(blob)
+    return blob
+
+
+def release_blob(db: Session, sha256: str) -> None:
+    """引用计数 -1；没有引用时删除文件与记录。"""
+
+    db.execute(update(StoredBlob).where(StoredBlob.sha256 == sha256).values(ref_count=StoredBlob.ref_count - 1))
+    db.commit()
+
+    blob = db.get(StoredBlob, sha256)
+    if blob is None:
+        return
+    storage_path = blob.storage_path
+    # 条件删除：两步之间并发的 acquire_blob 若已把计数加回去，这里删除 0 行，文件与记录都保留
+    result = db.execute(delete(StoredBlob).where(StoredBlob.sha256 == sha256, StoredBlob.ref_count <= 0))
+    if not result.rowcount:
+        db.rollback()
+        return
+    # 提交删除之前删文件：提交前记录仍在（并发的 acquire_blob 只会等锁后更新 0 行再重新登记），
+    # 不会出现“新上传的同内容文件被这里删掉”的窗口
+    resolve_backend_path(storage_path).unlink(missing_ok=True)
+    db.commit()
+
+
+def cached_preview(blob: StoredBlob, fmt: str) -> Optional[tuple[Preview, list[str]]]:
+    entry = (blob.preview_cache or {}).get(fmt)
+    if not isinstance(entry, dict):
+        return None
+    try:
+        preview = _PREVIEW_ADAPTER.validate_python(entry.get("preview"))
+    except Exception:  # noqa: BLE001
+        return None
+    candidates = [str(c) for c in entry.get("candidates") or []]
+    return preview, candidates
+
+
+def store_preview(db: Session, blob: StoredBlob, fmt: str, preview: Preview, candidates: list[str]) -> None:
+    cache: dict[str, Any] = dict(blob.preview_cache or {})
+    cache[fmt] = {"preview": preview.model_dump(mode="json"), "candidates": list(candidates)}
+    # JSON 列需要整体赋值才会被识别为已修改
+    blob.preview_cache = cache
+    db.commit()
@@ -0,0 +1,153 @@
+"""导出文件的预压缩与下载时的编码协商。
+
+背景：
+- 翻译结果（CSV/JSON/JSONL）是纯文本，压缩率通常有 5-10 倍；而同一个导出会被反复下载。
+  每次下载都按原始字节传输既慢又费带宽，而在线压缩（GZipMiddleware）又会让每次下载重复消耗 CPU，
+  且无法配合 Range 续传。
+
+做法：
+- 任务导出完成后，按 `EXPORT_PRECOMPRESS` 为文本导出各生成一份压缩副本（`<导出文件>.gz` / `.zst`）；
+- 下载时按请求的 `Accept-Encoding` 选择已存在的副本，以 `Content-Encoding` 返回（见 `api/endpoints/jobs.py`）。
+  每个副本都是独立的静态文件，ETag / Range 对它们同样适用。
+
+说明：
+- zstd 依赖可选包 `zstandard`，未安装时自动跳过；
+- xlsx 本身就是 zip 压缩格式，不再压缩；
+- 压缩失败不影响任务结果，下载时回退为原始文件。
+"""
+
+from __future__ import annotations
+
+import gzip
+import os
+import shutil
+from pathlib import Path
+from typing import Optional
+
+from app.core.config import settings
+
+
+_COPY_CHUNK_BYTES = 1024 * 1024
+# 编码 -> 副本后缀；顺序即协商时的优先级（q 值相同时）
+_SUFFIXES = {"zstd": ".zst", "gzip": ".gz"}
+# Accept-Encoding 没有提到 identity（也没有 `*`）时原始文件的 q 值：可接受，但低于任何显式列出的编码
+_IMPLICIT_IDENTITY_Q = 0.0001
+# 只压缩文本格式的导出
+_COMPRESSIBLE_SUFFIXES = {".csv", ".json", ".jsonl"}
+
+
+def _configured_encodings() -> list[str]:
+    raw = str(getattr(settings, "EXPORT_PRECOMPRESS", "") or "")
+    out: list[str] = []
+    for part in raw.split(","):
+        enc = part.strip().lower()
+        if enc in _SUFFIXES and enc not in out:
+            out.append(enc)
+    return out
+
+
+def variant_path(path: Path, encoding: str) -> Path:
+    return path.with_name(path.name + _SUFFIXES[encoding])
+
+
+def _compress_gzip(src: Path, dst: Path) -> None:
+    # mtime=0：同样的内容得到同样的字节，便于缓存
+    with (
+        src.open("rb") as fin,
+        dst.open("wb") as raw,
+        gzip.GzipFile(filename="", mode="wb", fileobj=raw, mtime=0) as fout,
+    ):
+        shutil.copyfileobj(fin, fout, _COPY_CHUNK_BYTES)
+
+
+def _compress_zstd(src: Path, dst: Path) -> bool:
+    try:
+        import zstandard  # type: ignore[import-not-found]
+    except ImportError:
+        return False
+    with src.open("rb") as fin, dst.open("wb") as fout:
+        zstandard.ZstdCompressor(level=10).copy_stream(fin, fout, read_size=_COPY_CHUNK_BYTES)
+    return True
+
+
+def precompress_export(path: Path) -> list[str]:
+    """为导出文件生成配置的压缩副本，返回实际生成的编码列表。"""
+
+    if path.suffix.lower() not in _COMPRESSIBLE_SUFFIXES:
+        return []
+
+    done: list[str] = []
+    for enc in _configured_encodings():
+        dst = variant_path(path, enc)
+        tmp = dst.with_name(dst.name + ".tmp")
+        try:
+            if enc == "gzip":
+                _compress_gzip(path, tmp)
+            elif not _compress_zstd(path, tmp):
+                continue
+            # 先写临时文件再改名：下载方不会看到写了一半的副本
+            os.replace(tmp, dst)
+            done.append(enc)
+        except Exception:  # noqa: BLE001
+            tmp.unlink(missing_ok=True)
+    return done
+
+
+def _parse_accept_encoding(header: str) -> dict[str, float]:
+    """解析 Accept-Encoding：编码 -> q 值（`*` 原样保留）。"""
+
+    out: dict[str, float] = {}
+    for part in header.split(","):
+        name, _, params = part.strip().partition(";")
+        name = name.strip().lower()
+        if not name:
+            continue
+        q = 1.0
+        for param in params.split(";"):
+            key, _, value = param.strip().partition("=")
+            if key.strip().lower() == "q":
+                try:
+                    q = float(value)
+                except ValueError:
+                    q = 0.0
+        out[name] = q
+    return out
+
+
+def negotiate_variant(path: Path, accept_encoding: str) -> tuple[Path, Optional[str]]:
+    """按 Accept-Encoding 选择要发送的文件：返回（文件路径, Content-Encoding 或 None）。
+
+    - 只在副本已存在且比原文件新时使用（原文件被重新导出后旧副本自动失效）；
+    - 原始文件（identity）也参与比较：取 q 值最高者，q 值相同时优先压缩副本（zstd > gzip）；
+    - 未列出的编码取 `*` 的 q 值；identity 未列出且没有 `*` 时视为可接受但优先级最低（RFC 9110）。
+    """
+
+    accepted = _parse_accept_encoding(accept_encoding or "")
+    if not accepted:
+        return path, None
+
+    identity_q = accepted.get("identity", accepted.get("*", _IMPLICIT_IDENTITY_Q))
+
+    try:
+        src_mtime = path.stat().st_mtime
+    except OSError:
+        return path, None
+
+    best: Optional[tuple[float, str, Path]] = None
+    for enc in _SUFFIXES:
+        q = accepted.get(enc, accepted.get("*", 0.0))
+        if q <= 0 or q < identity_q:
+            continue
+        candidate = variant_path(path, enc)
+        try:
+            if candidate.stat().st_mtime < src_mtime:
+                continue
+        except OSError:
+            continue
+        if best is None or q > best[0]:
+            best = (q, enc, candidate)
+
+    if best is None:
+        return path, None
+    return best[2], best[1]
+
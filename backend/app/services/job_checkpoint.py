@@ -0,0 +1,119 @@
+"""翻译任务断点（checkpoint）。
+
+背景：
+- 翻译结果在任务结束前只存在于 worker 内存里；worker 被 OOM kill / 重新部署 / 崩溃时，
+  整个任务只能从头再跑一遍，已经付费的模型调用全部浪费。
+
+做法：
+- 每个任务一个 JSONL 侧车文件（`CHECKPOINTS_DIR/<job_id>.jsonl`），每行一条 `[item_id, translated_text]`；
+- 任务按进度批次追加写入（进入 OS 缓冲），随进度落库的节奏（以及任务结束时）fsync；
+  重跑/重投递时先加载已完成的条目，只翻译缺失的部分；
+- 任务成功导出后删除断点文件。
+- 分片执行时每个分片写自己的文件（`<job_id>.shard<N>.jsonl`），避免多个 worker 并发追加同一文件。
+
+说明：
+- 只追加、不改写：进程崩溃不丢已写入的批次；机器掉电时最多丢失上次 fsync 之后的部分
+  （这部分也还没计入 DB 进度）。末尾的半行在加载时被忽略，下次追加前先补一个换行，不会与新记录粘成一行；
+- item_id 由适配器按“文件 + 字段 + 行数限制”确定性生成，同一任务重跑时保持一致。
+"""
+
+from __future__ import annotations
+
+import json
+import os
+from pathlib import Path
+from typing import IO, Optional
+
+from app.core.config import settings
+from app.core.paths import resolve_backend_path
+
+
+def checkpoint_path(job_id: str, shard: Optional[int] = None) -> Path:
+    """任务断点文件的绝对路径（分片执行时每个分片一个文件）。"""
+
+    name = job_id if shard is None else f"{job_id}.shard{shard}"
+    return resolve_backend_path(settings.CHECKPOINTS_DIR) / f"{name}.jsonl"
+
+
+class JobCheckpoint:
+    """单个任务的断点文件（追加写 + 批量刷盘）。"""
+
+    def __init__(self, path: Path) -> None:
+        self.path = path
+        self._fp: Optional[IO[str]] = None
+        self._pending: list[tuple[str, str]] = []
+
+    @classmethod
+    def for_job(cls, job_id: str, *, shard: Optional[int] = None) -> "JobCheckpoint":
+        return cls(checkpoint_path(job_id, shard))
+
+    def load(self) -> dict[str, str]:
+        """读取已完成的条目；损坏的行（例如崩溃时写了一半的末行）直接跳过。"""
+
+        out: dict[str, str] = {}
+        if not self.path.exists():
+            return out
+
+        with self.path.open("r", encoding="utf-8") as f:
+            for line in f:
+                try:
+                    row = json.loads(line)
+                except ValueError:
+                    continue
+                if isinstance(row, list) and len(row) == 2:
+                    out[str(row[0])] = str(row[1] or "")
+        return out
+
+    def add(self, item_id: str, translated_text: str) -> None:
+        """登记一条完成的结果（在 `flush()` 时落盘）。"""
+
+        self._pending.append((item_id, translated_text))
+
+    def _ends_with_partial_line(self) -> bool:
+        try:
+            with self.path.open("rb") as f:
+                if f.seek(0, os.SEEK_END) == 0:
+                    return False
+                f.seek(-1, os.SEEK_END)
+                return f.read(1) != b"\n"
+        except FileNotFoundError:
+            return False
+
+    def flush(self, *, sync: bool = False) -> None:
+        """把待写条目追加到文件（每个进度批次）；sync=True 时再 fsync（进度落库前、任务结束时）。"""
+
+        if self._pending:
+            if self._fp is None:
+                self.path.parent.mkdir(parents=True, exist_ok=True)
+                partial = self._ends_with_partial_line()
+                self._fp = self.path.open("a", encoding="utf-8")
+                if partial:
+                    # 上次崩溃留下的半行：先结束它，新记录从新的一行开始
+                    self._fp.write("\n")
+
+            self._fp.write(
+                "".join(json.dumps([item_id, text], ensure_ascii=False) + "\n" for item_id, text in self._pending)
+            )
+            self._fp.flush()
+            self._pending.clear()
+        if sync and self._fp is not None:
+            os.fsync(self._fp.fileno())
+
+    def close(self) -> None:
+        """刷盘并关闭文件句柄（断点文件保留，供下次重跑使用）。"""
+
+        try:
+            self.flush(sync=True)
+        finally:
+            if self._fp is not None:
+                self._fp.close()
+                self._fp = None
+
+    def delete(self) -> None:
+        """任务成功后删除断点文件。"""
+
+        if self._fp is not None:
+            self._fp.close()
+            self._fp = None
+        self._pending.clear()
+        self.path.unlink(missing_ok=True)
@@ -0,0 +1,248 @@
+"""任务实时进度：Redis 计数器 + 定时落库 + 事件推送。
+
+背景：
+- 之前 worker 每翻译 `TRANSLATION_BATCH_SIZE` 条就开一个 session、`db.get` 再 commit；
+  并发任务一多，进度写入本身就成了数据库的主要负载，也限制了进度能刷新得多细。
+
+做法：
+- worker 每产出一条结果就对 Redis hash `job:progress:<job_id>` 执行一次 HINCRBY（开销可忽略）；
+- 同时在本地累计“尚未落库的增量”，每隔 `JOB_PROGRESS_FLUSH_SECONDS` 秒以及任务结束时，
+  以原子增量（`progress_done + delta`）写回 DB；
+- 查询接口对运行中的任务优先读取 Redis 中的实时计数，DB 只负责持久化与兜底；
+- 进度（节流）与状态变化同时 PUBLISH 到 Redis 频道 `job:events:<job_id>` 与 `client:events:<client_id>`，
+  SSE 接口订阅后直接推给前端（见 `api/endpoints/jobs.py`），不再需要轮询。
+
+说明：
+- Redis 不可用时退化为“只按定时落库更新进度”，功能不受影响，只是进度粒度变粗；
+- 分片任务的多个 worker 累加同一个 hash / DB 行，增量语义保证不会互相覆盖。
+"""
+
+from __future__ import annotations
+
+import json
+import threading
+import time
+from typing import Any, Iterable, Optional
+
+import redis
+
+from app.core.config import settings
+from app.models.translation_job import TranslationJob
+
+
+_KEY_PREFIX = "job:progress"
+# 兜底过期时间：worker 异常退出、没来得及清理时，key 也会自动消失
+_KEY_TTL_SECONDS = 7 * 86400
+# 进度事件的最小推送间隔（秒）：逐条计数，但不逐条推送
+_PROGRESS_EVENT_INTERVAL_SECONDS = 0.25
+# 结束状态：收到后 SSE 流可以关闭
+TERMINAL_STATUSES = frozenset({"succeeded", "failed"})
+# Redis 不可用后，隔多久再尝试重连（期间只走 DB）
+_RECONNECT_COOLDOWN_SECONDS = 5.0
+
+_lock = threading.Lock()
+_client: Optional[redis.Redis] = None
+_retry_after = 0.0
+
+
+def _key(job_id: str) -> str:
+    return f"{_KEY_PREFIX}:{job_id}"
+
+
+def _get_client() -> Optional[redis.Redis]:
+    global _client, _retry_after
+
+    if _client is not None:
+        return _client
+    with _lock:
+        if _client is not None:
+            return _client
+        if time.monotonic() < _retry_after:
+            return None
+        try:
+            client = redis.Redis.from_url(settings.REDIS_URL, decode_responses=True)
+            client.ping()
+            _client = client
+        except Exception:  # noqa: BLE001
+            _client = None
+            _retry_after = time.monotonic() + _RECONNECT_COOLDOWN_SECONDS
+        return _client
+
+
+def _mark_unavailable() -> None:
+    global _client, _retry_after
+
+    with _lock:
+        _client = None
+        _retry_after = time.monotonic() + _RECONNECT_COOLDOWN_SECONDS
+
+
+def live_events_available() -> bool:
+    """Redis 是否可用（SSE 推送依赖 Redis pub/sub；不可用时前端回退为轮询）。"""
+
+    return _get_client() is not None
+
+
+def job_channel(job_id: str) -> str:
+    return f"job:events:{job_id}"
+
+
+def client_channel(client_id: str) -> str:
+    return f"client:events:{client_id}"
+
+
+def _publish(job_id: str, client_id: str, event: str, data: dict[str, Any]) -> None:
+    client = _get_client()
+    if client is None:
+        return
+    message = json.dumps({"event": event, "job_id": job_id, **data}, ensure_ascii=False)
+    try:
+        pipe = client.pipeline(transaction=False)
+        pipe.publish(job_channel(job_id), message)
+        if client_id:
+            pipe.publish(client_channel(client_id), message)
+        pipe.execute()
+    except Exception:  # noqa: BLE001
+        _mark_unavailable()
+
+
+def job_status_payload(job: TranslationJob) -> dict[str, Any]:
+    """状态事件的内容（与 `JobStatusResponse` 的进度/状态字段一致）。"""
+
+    download_url = None
+    if job.status == "succeeded" and job.result_path:
+        download_url = f"{settings.API_V1_PREFIX}/jobs/{job.id}/download"
+    return {
+        "status": job.status,
+        "progress_total": int(job.progress_total or 0),
+        "progress_done": int(job.progress_done or 0),
+        "progress_failed": int(job.progress_failed or 0),
+        "error_message": job.error_message or "",
+        "download_url": download_url,
+    }
+
+
+def publish_job_status(job: TranslationJob) -> None:
+    """推送任务状态变化（pending/running/succeeded/failed）；应在 DB 提交之后调用。"""
+
+    _publish(job.id, job.client_id or "", "status", job_status_payload(job))
+
+
+def reset_live_progress(job_id: str, *, done: int = 0, failed: int = 0) -> None:
+    """任务（重新）开始时初始化实时计数。"""
+
+    client = _get_client()
+    if client is None:
+        return
+    try:
+        pipe = client.pipeline(transaction=False)
+        pipe.hset(_key(job_id), mapping={"done": int(done), "failed": int(failed)})
+        pipe.expire(_key(job_id), _KEY_TTL_SECONDS)
+        pipe.execute()
+    except Exception:  # noqa: BLE001
+        _mark_unavailable()
+
+
+def clear_live_progress(job_id: str) -> None:
+    """任务结束、进度已落库后删除实时计数。"""
+
+    client = _get_client()
+    if client is None:
+        return
+    try:
+        client.delete(_key(job_id))
+    except Exception:  # noqa: BLE001
+        _mark_unavailable()
+
+
+def read_live_progress(job_ids: Iterable[str]) -> dict[str, tuple[int, int]]:
+    """批量读取实时进度：job_id -> (done, failed)；Redis 不可用或没有计数的任务不出现在结果中。"""
+
+    ids = list(job_ids)
+    if not ids:
+        return {}
+    client = _get_client()
+    if client is None:
+        return {}
+    try:
+        pipe = client.pipeline(transaction=False)
+        for job_id in ids:
+            pipe.hmget(_key(job_id), "done", "failed")
+        rows = pipe.execute()
+    except Exception:  # noqa: BLE001
+        _mark_unavailable()
+        return {}
+
+    out: dict[str, tuple[int, int]] = {}
+    for job_id, (done, failed) in zip(ids, rows):
+        if done is None and failed is None:
+            continue
+        out[job_id] = (int(done or 0), int(failed or 0))
+    return out
+
+
+class ProgressCounter:
+    """一个 worker 内某个任务（或分片）的进度计数器。"""
+
+    def __init__(self, job_id: str, *, client_id: str = "", flush_seconds: Optional[float] = None) -> None:
+        self.job_id = job_id
+        self.client_id = client_id
+        if flush_seconds is None:
+            flush_seconds = float(getattr(settings, "JOB_PROGRESS_FLUSH_SECONDS", 2.0) or 0.0)
+        self._flush_seconds = max(0.0, float(flush_seconds))
+        self._last_flush = time.monotonic()
+        # 尚未写回 DB 的增量
+        self._pending_done = 0
+        self._pending_failed = 0
+        # 最近一次从 Redis 读回的实时值（done, failed），以及它是否已推送
+        self._live: Optional[tuple[int, int]] = None
+        self._live_published = True
+        self._last_publish = 0.0
+
+    def add(self, done: int = 1, failed: int = 0) -> None:
+        """累加进度：立即写 Redis（并节流推送进度事件），DB 增量留到下一次 `take()`。"""
+
+        if not done and not failed:
+            return
+        self._pending_done += done
+        self._pending_failed += failed
+
+        client = _get_client()
+        if client is None:
+            return
+        try:
+            pipe = client.pipeline(transaction=False)
+            pipe.hincrby(_key(self.job_id), "done", done)
+            pipe.hincrby(_key(self.job_id), "failed", failed)
+            live_done, live_failed = pipe.execute()
+        except Exception:  # noqa: BLE001
+            _mark_unavailable()
+            return
+
+        self._live = (int(live_done), int(live_failed))
+        self._live_published = False
+        if time.monotonic() - self._last_publish >= _PROGRESS_EVENT_INTERVAL_SECONDS:
+            self._publish_progress()
+
+    def _publish_progress(self) -> None:
+        if self._live is None or self._live_published:
+            return
+        done, failed = self._live
+        _publish(self.job_id, self.client_id, "progress", {"progress_done": done, "progress_failed": failed})
+        self._live_published = True
+        self._last_publish = time.monotonic()
+
+    def due(self) -> bool:
+        """距上次落库是否已超过刷新间隔。"""
+
+        return time.monotonic() - self._last_flush >= self._flush_seconds
+
+    def take(self) -> tuple[int, int]:
+        """取出待落库的增量 (done, failed) 并重置计时（顺带推送被节流掉的最新进度）。"""
+
+        self._publish_progress()
+        out = (self._pending_done, self._pending_failed)
+        self._pending_done = 0
+        self._pending_failed = 0
+        self._last_flush = time.monotonic()
+        return out
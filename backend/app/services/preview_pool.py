@@ -0,0 +1,161 @@
+"""上传解析（预览/字段候选）专用的有界进程池。
+
+背景：
+- 之前上传接口是同步 endpoint：落盘之后直接在 FastAPI 默认线程池里跑 pandas / openpyxl / JSON 解析；
+  几个大文件同时上传就能占满线程池，连轻量的任务查询也要排队（且解析持有 GIL，影响整个进程）。
+
+做法：
+- 解析放到独立的进程池（`PREVIEW_WORKERS` 个进程，spawn 启动），API 事件循环只 await 结果；
+- 每次解析有超时（`PREVIEW_TIMEOUT_SECONDS`）：排队中的任务直接取消，已在执行的任务会连同进程池一起回收
+  （子进程被 kill 后重建，避免卡死的解析长期占着进程）；
+- 按文件大小准入：正在解析的文件总字节数不超过 `PREVIEW_MAX_INFLIGHT_BYTES`，
+  排队任务数不超过进程数的 `_QUEUE_FACTOR` 倍；超出时立即拒绝（接口返回 503，客户端稍后重试），
+  而不是让请求无限堆积。单个超过预算的文件只在池空闲时放行。
+
+说明：
+- `PREVIEW_WORKERS <= 0` 时退化为在线程池内解析（本地调试/测试用），准入与超时规则不变；
+- 超时回收进程池时，同一批次里其他正在执行的解析也会失败（按解析失败处理，客户端重试即可）。
+"""
+
+from __future__ import annotations
+
+import asyncio
+import multiprocessing
+import threading
+from concurrent.futures import Future, ProcessPoolExecutor
+from concurrent.futures.process import BrokenProcessPool
+from pathlib import Path
+from typing import Any, Callable, Optional, TypeVar
+
+from starlette.concurrency import run_in_threadpool
+
+from app.core.config import settings
+from app.schemas.files import Preview
+from app.services.adapters.preview import preview_and_candidates
+
+
+T = TypeVar("T")
+
+# 排队上限：进程数 × 该系数（含正在执行的任务）
+_QUEUE_FACTOR = 4
+
+_lock = threading.Lock()
+_pool: Optional[ProcessPoolExecutor] = None
+_inflight_tasks = 0
+_inflight_bytes = 0
+
+
+class PreviewPoolBusy(RuntimeError):
+    """解析任务过多（或待解析的数据量超出预算），本次请求未被接纳。"""
+
+
+def _workers() -> int:
+    return int(getattr(settings, "PREVIEW_WORKERS", 0) or 0)
+
+
+def _get_pool() -> ProcessPoolExecutor:
+    global _pool
+
+    with _lock:
+        if _pool is None:
+            # API 进程里已经有线程（事件循环 / 线程池），fork 出的子进程可能继承到被持有的锁，使用 spawn
+            _pool = ProcessPoolExecutor(max_workers=_workers(), mp_context=multiprocessing.get_context("spawn"))
+        return _pool
+
+
+def _discard_pool(pool: ProcessPoolExecutor) -> None:
+    """强制回收进程池（杀掉仍在执行的子进程）；下次提交时重建。"""
+
+    global _pool
+
+    with _lock:
+        if _pool is pool:
+            _pool = None
+    # ProcessPoolExecutor 没有公开的“终止正在执行的任务”接口，只能直接结束子进程
+    for proc in list((getattr(pool, "_processes", None) or {}).values()):
+        try:
+            proc.kill()
+        except Exception:  # noqa: BLE001
+            pass
+    pool.shutdown(wait=False, cancel_futures=True)
+
+
+def shutdown_preview_pool() -> None:
+    """应用退出时关闭进程池。"""
+
+    global _pool
+
+    with _lock:
+        pool, _pool = _pool, None
+    if pool is not None:
+        pool.shutdown(wait=False, cancel_futures=True)
+
+
+def _admit(size_bytes: int) -> None:
+    global _inflight_tasks, _inflight_bytes
+
+    budget = int(getattr(settings, "PREVIEW_MAX_INFLIGHT_BYTES", 0) or 0)
+    max_tasks = max(1, _workers()) * _QUEUE_FACTOR
+    with _lock:
+        if _inflight_tasks >= max_tasks:
+            raise PreviewPoolBusy("解析任务过多，请稍后重试")
+        if budget > 0 and _inflight_tasks and _inflight_bytes + size_bytes > budget:
+            raise PreviewPoolBusy("正在解析的文件过大，请稍后重试")
+        _inflight_tasks += 1
+        _inflight_bytes += size_bytes
+
+
+def _release(size_bytes: int) -> None:
+    global _inflight_tasks, _inflight_bytes
+
+    with _lock:
+        _inflight_tasks -= 1
+        _inflight_bytes -= size_bytes
+
+
+async def run_bounded(fn: Callable[..., T], *args: Any, size_bytes: int = 0, **kwargs: Any) -> T:
+    """在解析进程池中执行 `fn`（需可 pickle 的模块级函数），受准入与超时约束。
+
+    - 未被接纳时抛出 `PreviewPoolBusy`；超时抛出 `TimeoutError`。
+    """
+
+    size_bytes = max(0, int(size_bytes))
+    timeout = float(getattr(settings, "PREVIEW_TIMEOUT_SECONDS", 0) or 0) or None
+    _admit(size_bytes)
+    try:
+        if _workers() <= 0:
+            return await asyncio.wait_for(run_in_threadpool(fn, *args, **kwargs), timeout=timeout)
+
+        pool = _get_pool()
+        try:
+            future: Future[T] = pool.submit(fn, *args, **kwargs)
+        except BrokenProcessPool:
+            # 子进程异常退出（例如被 OOM kill）后进程池不可再用：重建后重试一次
+            _discard_pool(pool)
+            pool = _get_pool()
+            future = pool.submit(fn, *args, **kwargs)
+
+        try:
+            # 超时会连带取消 future：仍在排队的直接取消成功，已在执行的需要回收进程池
+            return await asyncio.wait_for(asyncio.wrap_future(future), timeout=timeout)
+        except TimeoutError:
+            if not future.cancelled():
+                _discard_pool(pool)
+            raise TimeoutError(f"解析超时（>{timeout:g}s）") from None
+        except BrokenProcessPool:
+            _discard_pool(pool)
+            raise
+    finally:
+        _release(size_bytes)
+
+
+async def run_preview(*, file_path: Path, detected_format: str, size_bytes: int, limit: int = 20) -> tuple[Preview, list[str]]:
+    """在解析进程池中生成预览与字段候选。"""
+
+    return await run_bounded(
+        preview_and_candidates,
+        size_bytes=size_bytes,
+        file_path=file_path,
+        detected_format=detected_format,
+        limit=limit,
+    )
@@ -6,26 +6,39 @@
 - 仅通过 Prompt 约束“输入是什么格式，输出就保持什么格式”
 
 工程要点：
-- RPM=1000：进程内平滑限流（若未来要多进程全局限流，可升级为 Redis 分布式 limiter）
+- RPM=1000：平滑限流；默认通过 Redis 全局共享配额（可选 TPM），Redis 不可用时回退进程内限流
 - 长文本切分：单元 > max_chars 时分片翻译后拼回
+- 短文本合并：多个短单元按“行编号协议”打包进一次请求，解析失败回退逐条翻译
 - Redis 缓存：减少重复翻译与成本（连接失败会自动降级为不缓存）
+- 进程内 L1 缓存：挡在 Redis 前面，命中时没有网络往返
 """
 
 from __future__ import annotations
 
 import concurrent.futures
+import contextlib
 import hashlib
+import queue
 import random
+import re
 import threading
 import time
 from dataclasses import dataclass
-from typing import Iterator, Optional
+from typing import Any, Callable, Iterable, Iterator, Optional
 
 import redis
 from openai import APIConnectionError, APIStatusError, APITimeoutError, OpenAI, RateLimitError
 
 from app.core.config import settings
-from app.prompts import DATA_TRANSLATOR_SYSTEM_PROMPT
+from app.prompts import DATA_TRANSLATOR_MULTI_CELL_SYSTEM_PROMPT, DATA_TRANSLATOR_SYSTEM_PROMPT
+from app.services.translator.concurrency import (
+    OUTCOME_ERROR,
+    OUTCOME_OK,
+    OUTCOME_OVERLOAD,
+    AimdConcurrencyController,
+)
+from app.services.translator.memory_cache import LruTranslationCache, get_process_l1_cache
+from app.services.translator.redis_limiter import RedisTokenBucketLimiter
 from app.services.translator.rpm_limiter import SmoothRpmLimiter
 from app.services.translator.splitter import split_text_by_max_chars
 
@@ -39,8 +52,94 @@ class TranslateItem:
     hint: str = ""
 
 
+@dataclass
+class TranslationStats:
+    """一次 `translate_items_stream` 的统计（回写到任务上，便于观察优化效果）。"""
+
+    parts_total: int = 0
+    parts_unique: int = 0
+    # 唯一文本中直接命中缓存（L1/Redis）的数量
+    cache_hits: int = 0
+    # 自适应并发：结束时的 limit 与遇到的过载（429/5xx/超时）次数；0 表示未开启
+    concurrency_limit: int = 0
+    overloads: int = 0
+    # 进程内 L1 缓存在本次调用期间的命中/未命中/淘汰增量（同进程并发任务时为近似值）；0 表示未挂 L1
+    l1_hits: int = 0
+    l1_misses: int = 0
+    l1_evictions: int = 0
+    # 任务内去重备忘录：窗口之后的重复文本命中数与淘汰数（淘汰多说明 TRANSLATION_DEDUP_MEMO_ENTRIES 偏小）
+    memo_hits: int = 0
+    memo_evictions: int = 0
+
+    @property
+    def dedup_ratio(self) -> float:
+        """被去重省掉的 part 占比（0 表示没有重复）。"""
+
+        if self.parts_total <= 0:
+            return 0.0
+        return 1.0 - (self.parts_unique / self.parts_total)
+
+    def as_dict(self) -> dict[str, Any]:
+        return {
+            "parts_total": self.parts_total,
+            "parts_unique": self.parts_unique,
+            "dedup_ratio": round(self.dedup_ratio, 4),
+            "cache_hits": self.cache_hits,
+            "concurrency_limit": self.concurrency_limit,
+            "overloads": self.overloads,
+            "l1_hits": self.l1_hits,
+            "l1_misses": self.l1_misses,
+            "l1_evictions": self.l1_evictions,
+            "memo_hits": self.memo_hits,
+            "memo_evictions": self.memo_evictions,
+        }
+
+
+def _estimate_tokens(system_prompt: str, user_content: str) -> int:
+    """粗略估算一次调用消耗的 token 数（用于 TPM 限流）。
+
+    不引入 tokenizer 依赖：按“约 2 字符/token”估算输入，并假设输出与用户输入等长。
+    """
+
+    return max(1, (len(system_prompt) + 2 * len(user_content)) // 2)
+
+
+def _is_retryable_error(exc: Exception) -> bool:
+    """429 / 5xx / 超时 / 连接错误：可重试，且视为上游过载（用于自适应并发下调）。
+
+    注意：RateLimitError 是 APIStatusError 的子类，必须先于 status 判断（429 需要重试）。
+    """
+
+    if isinstance(exc, RateLimitError):
+        return True
+    if isinstance(exc, APIStatusError):
+        return int(getattr(exc, "status_code", 0) or 0) >= 500
+    return isinstance(exc, (APIConnectionError, APITimeoutError))
+
+
+def _backoff_seconds(attempt: int) -> float:
+    """重试退避：指数增长 + 抖动，上限 20 秒。"""
+
+    return min(20.0, (0.6 * (2**attempt)) + random.random())
+
+
+# 任务内去重备忘录（已完成文本 -> 译文）的字节上限；条目数上限见 TRANSLATION_DEDUP_MEMO_ENTRIES
+_DEDUP_MEMO_MAX_BYTES = 32 * 1024 * 1024
+
+
+# 一个翻译单元（1 条或多条合并的文本）的执行结果：与输入文本一一对应的译文
+UnitFuture = concurrent.futures.Future[list[str]]
+
+
+# 多单元合并翻译的输出行：`[编号] 译文`
+_MULTI_CELL_LINE_RE = re.compile(r"^\[(\d+)\] ?(.*)$")
+
+
 class RedisTranslationCache:
-    """Redis 缓存（可选，失败自动降级）。"""
+    """Redis 缓存（可选，失败自动降级）。
+
+    可选挂一个进程内 L1（`LruTranslationCache`）：读时先查 L1，Redis 命中后回填 L1；写时两层都写。
+    """
 
     # 重要：缓存版本号。
     # 说明：我们曾经从 `json_schema(parse)` 路径缓存过“未翻译直接回传原文”的结果。
@@ -48,9 +147,18 @@ class RedisTranslationCache:
     # 说明：prompt/输出协议变更时，务必 bump 版本号，避免旧缓存污染新策略。
     _CACHE_VERSION = "v3"
 
-    def __init__(self, redis_url: str) -> None:
+    # 批量查询：单条 MGET 的 key 数，以及一个 pipeline 里最多放几条 MGET
+    _MGET_CHUNK = 500
+    _PIPELINE_COMMANDS = 20
+
+    def __init__(self, redis_url: str, *, l1: Optional[LruTranslationCache] = None) -> None:
         self._redis_url = redis_url
         self._client: Optional[redis.Redis] = None
+        self._l1 = l1
+
+    @property
+    def l1(self) -> Optional[LruTranslationCache]:
+        return self._l1
 
     def _get_client(self) -> Optional[redis.Redis]:
         if self._client is not None:
@@ -70,13 +178,22 @@ class RedisTranslationCache:
         return f"translation:{RedisTranslationCache._CACHE_VERSION}:{h}"
 
     def get(self, *, model: str, target_lang: str, text: str) -> Optional[str]:
+        key = self._key(model, target_lang, text)
+        if self._l1 is not None:
+            hit = self._l1.get(key)
+            if hit is not None:
+                return hit
+
         client = self._get_client()
         if client is None:
             return None
         try:
-            return client.get(self._key(model, target_lang, text))
+            value = client.get(key)
         except Exception:  # noqa: BLE001
             return None
+        if value is not None and self._l1 is not None:
+            self._l1.set(key, value)
+        return value
 
     def set(
         self,
@@ -87,11 +204,86 @@ class RedisTranslationCache:
         translated_text: str,
         ttl_seconds: int = 86400 * 30,
     ) -> None:
+        key = self._key(model, target_lang, text)
+        if self._l1 is not None:
+            self._l1.set(key, translated_text)
+
+        client = self._get_client()
+        if client is None:
+            return
+        try:
+            client.set(key, translated_text, ex=int(ttl_seconds))
+        except Exception:  # noqa: BLE001
+            return
+
+    def get_many(self, *, model: str, target_lang: str, texts: list[str]) -> dict[str, str]:
+        """批量查缓存：返回命中的 text -> translated_text。
+
+        - 先查 L1，剩余的按 `_MGET_CHUNK` 切块，多条 MGET 放进同一个 pipeline 一次往返；
+        - Redis 命中回填 L1；Redis 不可用时只返回 L1 命中。
+        """
+
+        hits: dict[str, str] = {}
+        missing: list[tuple[str, str]] = []  # (text, key)
+        for text in texts:
+            key = self._key(model, target_lang, text)
+            value = self._l1.get(key) if self._l1 is not None else None
+            if value is not None:
+                hits[text] = value
+            else:
+                missing.append((text, key))
+
+        if not missing:
+            return hits
+        client = self._get_client()
+        if client is None:
+            return hits
+
+        step = self._MGET_CHUNK * self._PIPELINE_COMMANDS
+        for start in range(0, len(missing), step):
+            window = missing[start : start + step]
+            try:
+                pipe = client.pipeline(transaction=False)
+                for i in range(0, len(window), self._MGET_CHUNK):
+                    pipe.mget([key for _, key in window[i : i + self._MGET_CHUNK]])
+                chunks = pipe.execute()
+            except Exception:  # noqa: BLE001
+                return hits
+
+            values = [v for chunk in chunks for v in chunk]
+            for (text, key), value in zip(window, values):
+                if value is None:
+                    continue
+                hits[text] = value
+                if self._l1 is not None:
+                    self._l1.set(key, value)
+        return hits
+
+    def set_many(
+        self,
+        *,
+        model: str,
+        target_lang: str,
+        pairs: list[tuple[str, str]],
+        ttl_seconds: int = 86400 * 30,
+    ) -> None:
+        """批量写缓存：(text, translated_text) 列表通过 pipeline 一次往返写入（带 TTL）。"""
+
+        if not pairs:
+            return
+        keyed = [(self._key(model, target_lang, text), out) for text, out in pairs]
+        if self._l1 is not None:
+            for key, out in keyed:
+                self._l1.set(key, out)
+
         client = self._get_client()
         if client is None:
             return
         try:
-            client.set(self._key(model, target_lang, text), translated_text, ex=int(ttl_seconds))
+            pipe = client.pipeline(transaction=False)
+            for key, out in keyed:
+                pipe.set(key, out, ex=int(ttl_seconds))
+            pipe.execute()
         except Exception:  # noqa: BLE001
             return
 
@@ -110,6 +302,16 @@ class ArkBatchTranslator:
         max_cell_chars: int,
         request_timeout_seconds: float = 120.0,
         enable_redis_cache: bool = True,
+        multi_cell_max_items: int = 1,
+        multi_cell_max_chars: int = 2000,
+        multi_cell_item_max_chars: int = 200,
+        tpm: int = 0,
+        distributed_limiter: bool = False,
+        adaptive_concurrency: bool = False,
+        min_concurrency: int = 4,
+        initial_concurrency: int = 32,
+        latency_target_seconds: float = 30.0,
+        max_concurrency: Optional[int] = None,
     ) -> None:
         if not api_key:
             raise ValueError("缺少 ARK_API_KEY")
@@ -117,7 +319,21 @@ class ArkBatchTranslator:
         self.model = model
         self._disable_thinking = bool(disable_thinking)
         self._max_cell_chars = int(max_cell_chars or 10000)
-        self._limiter = SmoothRpmLimiter(int(rpm or 1))
+        # 短文本合并：max_items <= 1 表示关闭（默认关闭，由 build_default_translator 按配置开启）
+        self._multi_cell_max_items = max(1, int(multi_cell_max_items or 1))
+        self._multi_cell_max_chars = max(1, int(multi_cell_max_chars or 1))
+        self._multi_cell_item_max_chars = max(1, int(multi_cell_item_max_chars or 1))
+        # 限流：distributed_limiter=True 时所有 worker 共享 Redis 中的 RPM/TPM 配额
+        self._limiter: SmoothRpmLimiter | RedisTokenBucketLimiter
+        if distributed_limiter:
+            self._limiter = RedisTokenBucketLimiter(
+                settings.REDIS_URL,
+                rpm=int(rpm or 1),
+                tpm=int(tpm or 0),
+                key_prefix=f"ratelimit:ark:{model}",
+            )
+        else:
+            self._limiter = SmoothRpmLimiter(int(rpm or 1))
         # 说明：
         # - 为避免多线程并发时共享 client 的潜在问题，这里使用“线程本地 client”。
         # - 这能让我们在提升吞吐（并发请求）时更稳健。
@@ -125,13 +341,29 @@ class ArkBatchTranslator:
         self._base_url = base_url
         self._timeout_seconds = float(request_timeout_seconds)
         self._client_local = threading.local()
-        self._cache = RedisTranslationCache(settings.REDIS_URL) if enable_redis_cache else None
-
-    def translate_items(self, items: list[TranslateItem], *, target_lang: str) -> dict[str, str]:
+        # 自适应并发（AIMD）：线程池大小是硬上限，真正发往上游的请求数由控制器按上游反馈动态调整
+        if max_concurrency is None:
+            max_concurrency = int(getattr(settings, "TRANSLATION_MAX_CONCURRENCY", 50) or 50)
+        self._max_concurrency = max(1, int(max_concurrency))
+        self._concurrency: Optional[AimdConcurrencyController] = None
+        if adaptive_concurrency:
+            self._concurrency = AimdConcurrencyController(
+                initial_limit=int(initial_concurrency),
+                min_limit=int(min_concurrency),
+                max_limit=self._max_concurrency,
+                latency_target_seconds=float(latency_target_seconds),
+            )
+        self._cache = (
+            RedisTranslationCache(settings.REDIS_URL, l1=get_process_l1_cache()) if enable_redis_cache else None
+        )
+        # 最近一次 translate_items_stream 的统计（任务结束后回写到 job.stats）
+        self.last_stats = TranslationStats()
+
+    def translate_items(self, items: Iterable[TranslateItem], *, target_lang: str) -> dict[str, str]:
         """翻译一组单元并返回映射：item_id -> translated_text。"""
         return dict(self.translate_items_stream(items, target_lang=target_lang))
 
-    def translate_items_stream(self, items: list[TranslateItem], *, target_lang: str) -> Iterator[tuple[str, str]]:
+    def translate_items_stream(self, items: Iterable[TranslateItem], *, target_lang: str) -> Iterator[tuple[str, str]]:
         """流式翻译：尽可能早地产出结果（按“原始 item”维度产出）。
 
         背景：
@@ -140,46 +372,49 @@ class ArkBatchTranslator:
         - 真正限制吞吐的是：翻译器内部对 expanded items 的模型调用是串行的。
 
         这里的策略：
-        - 一次性把所有 item（含长文本切分后的 part）提交到线程池并发执行；
-        - 仍通过 `SmoothRpmLimiter` 做进程内 RPM 平滑限流；
+        - items 可以是 list 也可以是生成器：按“窗口”惰性拉取，尚未产出的 item 数不超过窗口大小，
+          低于低水位时再补充（背压），因此内存占用与任务规模无关（重复文本同样占窗口，
+          否则同一个值反复出现时会一直挂到 in-flight 文本上，把整个输入读进内存）；
+        - 相同 part 文本只翻译一次：窗口内的重复文本挂到同一个请求上，已完成的文本通过
+          有界的任务内备忘录直接复用（去重统计见 `self.last_stats`）；
+        - 每次补充的新文本先做一次批量缓存查询（pipeline + MGET），命中的结果立即产出；
+        - 未命中的文本提交执行（短文本会被合并成“多单元请求”，一次调用翻译多条）；
+        - 新结果攒批后通过 pipeline 写回缓存，而不是每条结果一次 SET；
         - 对外只在同一 parent 的所有 part 完成后，才 yield 合并后的结果。
         """
 
-        # 并发度：用于提升吞吐，尽量打满 RPM
-        max_workers = int(getattr(settings, "TRANSLATION_MAX_CONCURRENCY", 50) or 50)
-        max_workers = max(1, max_workers)
+        write_batch = max(1, int(getattr(settings, "TRANSLATION_CACHE_WRITE_BATCH_SIZE", 200) or 200))
+        # 窗口：尚未产出的 item（parent）数上限；默认按“并发 × 每请求最多条数 × 2”估算，足以打满并发
+        window = int(getattr(settings, "TRANSLATION_STREAM_WINDOW", 0) or 0)
+        if window <= 0:
+            window = self._max_concurrency * self._multi_cell_max_items * 2
+        window = max(1, window)
+        low_water = window // 2
 
-        # parent -> 预期 part 数量 / 已完成数量 / part 结果缓冲
+        # parent -> 预期 part 数量 / 已完成数量 / part 结果缓冲（只保存 in-flight 的 parent）
         parent_expected: dict[str, int] = {}
         parent_done: dict[str, int] = {}
         parent_buf: dict[str, list[Optional[str]]] = {}
 
-        # future -> (parent_id, part_idx)
-        future_meta: dict[concurrent.futures.Future[str], tuple[str, int]] = {}
-
-        with concurrent.futures.ThreadPoolExecutor(max_workers=max_workers) as executor:
-            # 1) 提交任务（part 级别）
-            for it in items:
-                parent_id = it.id
-                text = str(it.text or "")
-                if not text.strip():
-                    yield (parent_id, "")
-                    continue
-
-                parts = split_text_by_max_chars(text, max_chars=self._max_cell_chars)
-                parent_expected[parent_id] = len(parts)
-                parent_done[parent_id] = 0
-                parent_buf[parent_id] = [None] * len(parts)
-
-                for idx, part in enumerate(parts):
-                    fut = executor.submit(self._translate_single_text, part, target_lang=target_lang)
-                    future_meta[fut] = (parent_id, idx)
-
-            # 2) 消费完成的 part；当 parent 所有 part 就绪后合并产出
-            for fut in concurrent.futures.as_completed(future_meta):
-                parent_id, idx = future_meta[fut]
-                out = fut.result()
-
+        # 任务内去重：in-flight 的 part 文本 -> 所有引用方 (parent_id, part_idx)
+        # 说明：Redis 缓存在这里帮不上忙——重复文本会在第一条结果写回前全部处于 in-flight 状态。
+        text_targets: dict[str, list[tuple[str, int]]] = {}
+        # 已完成文本的备忘录（有界 LRU）：窗口之后再次出现的重复文本直接复用
+        memo = LruTranslationCache(
+            max_entries=int(getattr(settings, "TRANSLATION_DEDUP_MEMO_ENTRIES", 100_000) or 0),
+            max_bytes=_DEDUP_MEMO_MAX_BYTES,
+        )
+
+        stats = TranslationStats()
+        self.last_stats = stats
+        # L1 是进程共享的累计计数：记下起点，结束时只回写本次调用的增量
+        l1: Optional[LruTranslationCache] = getattr(self._cache, "l1", None) if self._cache else None
+        l1_start = l1.stats() if l1 is not None else None
+
+        def _resolve(part: str, out: str) -> Iterator[tuple[str, str]]:
+            """把一条唯一文本的结果扇出给所有引用方；parent 的 part 齐了就合并产出。"""
+
+            for parent_id, idx in text_targets.pop(part, []):
                 buf = parent_buf.get(parent_id)
                 if buf is None:
                     # 防御性兜底：理论上不应发生
@@ -196,8 +431,219 @@ class ArkBatchTranslator:
                     parent_expected.pop(parent_id, None)
                     parent_done.pop(parent_id, None)
 
-    def _translate_single_text(self, text: str, *, target_lang: str) -> str:
-        """翻译单段文本（带缓存、限流、重试）。
+        item_iter = iter(items)
+        exhausted = False
+
+        # future -> [part_text, ...]（多单元请求对应多条文本，按提交顺序一一对应）
+        future_meta: dict[UnitFuture, list[str]] = {}
+        # 完成的 future 由回调放入队列，消费侧 O(1) 取出（避免对大量 future 反复 wait）
+        done_queue: queue.Queue[UnitFuture] = queue.Queue()
+        # 待写回缓存的 (text, translated_text)
+        pending_writes: list[tuple[str, str]] = []
+
+        def _flush_writes() -> None:
+            if self._cache and pending_writes:
+                self._cache.set_many(model=self.model, target_lang=target_lang, pairs=pending_writes)
+            pending_writes.clear()
+
+        with self._unit_executor(target_lang=target_lang) as submit_unit:
+
+            def _submit(texts: list[str]) -> None:
+                fut = submit_unit(texts)
+                future_meta[fut] = texts
+                fut.add_done_callback(done_queue.put)
+
+            def _refill() -> Iterator[tuple[str, str]]:
+                """从 items 惰性拉取，直到待产出的 item 数达到窗口或 items 耗尽。"""
+
+                nonlocal exhausted
+                fresh: list[str] = []
+
+                # 1) 展开 part 并去重（此阶段不发请求）
+                while len(parent_buf) < window:
+                    it = next(item_iter, None)
+                    if it is None:
+                        exhausted = True
+                        break
+
+                    parent_id = it.id
+                    text = str(it.text or "")
+                    if not text.strip():
+                        yield (parent_id, "")
+                        continue
+
+                    parts = split_text_by_max_chars(text, max_chars=self._max_cell_chars)
+                    parent_expected[parent_id] = len(parts)
+                    parent_done[parent_id] = 0
+                    parent_buf[parent_id] = [None] * len(parts)
+
+                    for idx, part in enumerate(parts):
+                        stats.parts_total += 1
+                        targets = text_targets.get(part)
+                        if targets is not None:
+                            targets.append((parent_id, idx))
+                            continue
+                        text_targets[part] = [(parent_id, idx)]
+
+                        remembered = memo.get(part)
+                        if remembered is not None:
+                            yield from _resolve(part, remembered)
+                            continue
+                        stats.parts_unique += 1
+                        fresh.append(part)
+
+                # 2) 批量查缓存：命中的文本立即扇出产出（全缓存命中的任务不会发出任何模型请求）
+                if self._cache and fresh:
+                    hits = self._cache.get_many(model=self.model, target_lang=target_lang, texts=fresh)
+                    stats.cache_hits += len(hits)
+                    for part, out in hits.items():
+                        memo.set(part, out)
+                        yield from _resolve(part, out)
+
+                # 3) 提交未命中的文本（短文本攒批后按“多单元请求”提交）
+                pack: list[str] = []
+                pack_chars = 0
+                for part in fresh:
+                    if part not in text_targets:
+                        continue
+                    if not self._is_multi_cell_candidate(part):
+                        _submit([part])
+                        continue
+
+                    if pack and pack_chars + len(part) > self._multi_cell_max_chars:
+                        _submit(pack)
+                        pack, pack_chars = [], 0
+                    pack.append(part)
+                    pack_chars += len(part)
+                    if len(pack) >= self._multi_cell_max_items:
+                        _submit(pack)
+                        pack, pack_chars = [], 0
+
+                if pack:
+                    _submit(pack)
+
+            # 4) 主循环：低于低水位就补充；否则等待任一请求完成，扇出产出并攒批写回缓存
+            try:
+                while True:
+                    if not exhausted and len(parent_buf) <= low_water:
+                        yield from _refill()
+
+                    if not future_meta:
+                        if exhausted:
+                            break
+                        continue
+
+                    fut = done_queue.get()
+                    texts = future_meta.pop(fut)
+                    outs = fut.result()
+
+                    for part, out in zip(texts, outs):
+                        pending_writes.append((part, out))
+                        memo.set(part, out)
+                        yield from _resolve(part, out)
+
+                    if len(pending_writes) >= write_batch:
+                        _flush_writes()
+            finally:
+                # 即使中途失败，也把已完成的结果写回缓存，重跑时可直接命中
+                _flush_writes()
+                if self._concurrency is not None:
+                    stats.concurrency_limit = self._concurrency.limit
+                    stats.overloads = self._concurrency.overloads
+                memo_stats = memo.stats()
+                stats.memo_hits = memo_stats["hits"]
+                stats.memo_evictions = memo_stats["evictions"]
+                if l1 is not None and l1_start is not None:
+                    l1_end = l1.stats()
+                    stats.l1_hits = l1_end["hits"] - l1_start["hits"]
+                    stats.l1_misses = l1_end["misses"] - l1_start["misses"]
+                    stats.l1_evictions = l1_end["evictions"] - l1_start["evictions"]
+
+    @contextlib.contextmanager
+    def _unit_executor(self, *, target_lang: str) -> Iterator[Callable[[list[str]], UnitFuture]]:
+        """提供“提交一个翻译单元 -> Future[list[str]]”的执行环境（线程池引擎）。
+
+        子类（例如 asyncio 引擎）只需覆盖该方法，即可复用去重/缓存/合并/扇出等全部流程。
+        """
+
+        # 并发度：用于提升吞吐，尽量打满 RPM（开启自适应并发时为上限）
+        with concurrent.futures.ThreadPoolExecutor(max_workers=self._max_concurrency) as executor:
+            yield lambda texts: executor.submit(self._translate_unit, texts, target_lang=target_lang)
+
+    def _is_multi_cell_candidate(self, text: str) -> bool:
+        """判断 part 是否可以进入“多单元合并请求”。
+
+        行编号协议要求每条单元占一行，因此只接受：单行、无首尾空白、足够短的文本；
+        其它文本（多行/长文本/首尾空白需要保真）仍逐条翻译。
+        """
+
+        if self._multi_cell_max_items <= 1:
+            return False
+        if len(text) > self._multi_cell_item_max_chars:
+            return False
+        if "\n" in text or "\r" in text:
+            return False
+        return text == text.strip()
+
+    def _translate_unit(self, texts: list[str], *, target_lang: str) -> list[str]:
+        """翻译一个提交单元：单条走逐条翻译，多条走多单元合并请求。"""
+
+        if len(texts) == 1:
+            return [self._translate_single_text(texts[0], target_lang=target_lang)]
+        return self._translate_multi_cell(texts, target_lang=target_lang)
+
+    def _translate_multi_cell(self, texts: list[str], *, target_lang: str) -> list[str]:
+        """把多条短文本打包进一次模型调用（行编号协议）。
+
+        - 缓存由 `translate_items_stream` 统一批量查询/写回，这里只负责模型调用；
+        - 输出必须与输入逐行对应（编号/行数一致），否则整批回退为逐条翻译；
+        - 回退时单条失败的异常照常抛出，由上层按任务失败处理。
+        """
+
+        user_content = self._multi_cell_user_content(texts)
+        parsed: Optional[list[str]] = None
+        try:
+            raw = self._chat_completion(DATA_TRANSLATOR_MULTI_CELL_SYSTEM_PROMPT, user_content)
+            parsed = self._parse_multi_cell_output(raw, expected=len(texts))
+        except APIStatusError:
+            # 4xx（例如合并后的请求体被拒绝）：回退逐条翻译，逐条请求会再暴露真正的问题
+            parsed = None
+
+        if parsed is None:
+            return [self._translate_single_text(s, target_lang=target_lang) for s in texts]
+        return parsed
+
+    @staticmethod
+    def _multi_cell_user_content(texts: list[str]) -> str:
+        """按行编号协议拼装多单元请求的用户消息。"""
+
+        return "\n".join(f"[{n}] {s}" for n, s in enumerate(texts, start=1))
+
+    @staticmethod
+    def _parse_multi_cell_output(raw: str, *, expected: int) -> Optional[list[str]]:
+        """解析 `[编号] 译文` 逐行输出；任何不符合协议的情况都返回 None（由调用方回退）。"""
+
+        out: dict[int, str] = {}
+        for line in str(raw or "").splitlines():
+            line = line.rstrip("\r")
+            if not line.strip():
+                # 容忍模型在行间插入空行
+                continue
+            m = _MULTI_CELL_LINE_RE.match(line.strip())
+            if not m:
+                return None
+            n = int(m.group(1))
+            text = m.group(2).strip()
+            if n < 1 or n > expected or n in out or not text:
+                return None
+            out[n] = text
+
+        if len(out) != expected:
+            return None
+        return [out[n] for n in range(1, expected + 1)]
+
+    def _translate_single_text(self, text: str, *, target_lang: str) -> str:  # noqa: ARG002
+        """翻译单段文本（带限流、重试；缓存由 `translate_items_stream` 统一批量处理）。
 
         注意：该函数不会对输出做 strip()，避免破坏“格式保真”要求。
         """
@@ -206,48 +652,59 @@ class ArkBatchTranslator:
         if not s.strip():
             return ""
 
-        if self._cache:
-            hit = self._cache.get(model=self.model, target_lang=target_lang, text=s)
-            if hit is not None:
-                return hit
-
-        system_prompt = DATA_TRANSLATOR_SYSTEM_PROMPT
         # 当前产品目标固定为中文 PM 场景，因此系统 prompt 直接写死为简体中文；
         # 如果未来需要支持其它目标语言，可在此处做 prompt 版本化/按语言切换。
+        return self._chat_completion(DATA_TRANSLATOR_SYSTEM_PROMPT, s)
 
+    def _chat_completion(self, system_prompt: str, user_content: str) -> str:
+        """发起一次模型调用（带限流、自适应并发与重试），返回原始输出文本。"""
+
+        est_tokens = _estimate_tokens(system_prompt, user_content)
         last_exc: Optional[Exception] = None
         for attempt in range(5):
-            self._limiter.acquire()
+            # 先进并发闸门、再预约速率配额：AIMD 收缩窗口时，排队中的请求不会提前占掉 RPM/TPM 名额
+            if self._concurrency is not None:
+                self._concurrency.acquire()
+            started = time.monotonic()
+            outcome = OUTCOME_ERROR
             try:
-                kwargs = {
-                    "model": self.model,
-                    "messages": [
-                        {"role": "system", "content": system_prompt},
-                        {"role": "user", "content": s},
-                    ],
-                    "temperature": 0.0,
-                }
-                if self._disable_thinking:
-                    kwargs["extra_body"] = {"thinking": {"type": "disabled"}}
-                resp = self._get_client().chat.completions.create(**kwargs)
-                out = resp.choices[0].message.content or ""
-                if self._cache:
-                    self._cache.set(model=self.model, target_lang=target_lang, text=s, translated_text=out)
-                return out
-            except APIStatusError as e:
-                last_exc = e
-                status = int(getattr(e, "status_code", 0) or 0)
-                if status < 500:
+                self._limiter.acquire(est_tokens)
+                # 延迟只统计上游耗时，不含限流等待
+                started = time.monotonic()
+                resp = self._get_client().chat.completions.create(
+                    **self._completion_kwargs(system_prompt, user_content)
+                )
+                outcome = OUTCOME_OK
+                return resp.choices[0].message.content or ""
+            except Exception as e:  # noqa: BLE001
+                if not _is_retryable_error(e):
                     # 4xx 更可能是参数/请求体问题，直接抛出便于定位
                     raise
-            except (RateLimitError, APIConnectionError, APITimeoutError) as e:
                 last_exc = e
+                outcome = OUTCOME_OVERLOAD
+            finally:
+                if self._concurrency is not None:
+                    self._concurrency.release(outcome=outcome, latency_seconds=time.monotonic() - started)
 
-            wait = min(20.0, (0.6 * (2**attempt)) + random.random())
-            time.sleep(wait)
+            time.sleep(_backoff_seconds(attempt))
 
         raise RuntimeError(f"模型调用失败（多次重试仍失败）: {last_exc}")
 
+    def _completion_kwargs(self, system_prompt: str, user_content: str) -> dict[str, Any]:
+        """chat.completions.create 的参数（同步/异步引擎共用）。"""
+
+        kwargs: dict[str, Any] = {
+            "model": self.model,
+            "messages": [
+                {"role": "system", "content": system_prompt},
+                {"role": "user", "content": user_content},
+            ],
+            "temperature": 0.0,
+        }
+        if self._disable_thinking:
+            kwargs["extra_body"] = {"thinking": {"type": "disabled"}}
+        return kwargs
+
     def _get_client(self) -> OpenAI:
         """获取线程本地 OpenAI client。"""
 
@@ -259,9 +716,9 @@ class ArkBatchTranslator:
 
 
 def build_default_translator() -> ArkBatchTranslator:
-    """从 settings 构建默认翻译器。"""
+    """从 settings 构建默认翻译器（按 TRANSLATION_ENGINE 选择线程池或 asyncio 引擎）。"""
 
-    return ArkBatchTranslator(
+    kwargs: dict[str, Any] = dict(
         api_key=settings.ARK_API_KEY,
         base_url=settings.ARK_BASE_URL,
         model=settings.ARK_MODEL,
@@ -270,5 +727,22 @@ def build_default_translator() -> ArkBatchTranslator:
         max_cell_chars=settings.TRANSLATION_MAX_CELL_CHARS,
         request_timeout_seconds=120.0,
         enable_redis_cache=True,
+        multi_cell_max_items=settings.TRANSLATION_MULTI_CELL_MAX_ITEMS,
+        multi_cell_max_chars=settings.TRANSLATION_MULTI_CELL_MAX_CHARS,
+        multi_cell_item_max_chars=settings.TRANSLATION_MULTI_CELL_ITEM_MAX_CHARS,
+        tpm=settings.ARK_TPM,
+        distributed_limiter=(settings.ARK_RATE_LIMITER or "").strip().lower() == "redis",
+        adaptive_concurrency=settings.TRANSLATION_ADAPTIVE_CONCURRENCY,
+        min_concurrency=settings.TRANSLATION_MIN_CONCURRENCY,
+        initial_concurrency=settings.TRANSLATION_INITIAL_CONCURRENCY,
+        latency_target_seconds=settings.TRANSLATION_LATENCY_TARGET_SECONDS,
     )
 
+    engine = (settings.TRANSLATION_ENGINE or "").strip().lower()
+    if engine == "asyncio":
+        # 延迟导入：async_engine 依赖本模块
+        from app.services.translator.async_engine import AsyncArkTranslator
+
+        return AsyncArkTranslator(max_concurrency=settings.TRANSLATION_ASYNC_MAX_CONCURRENCY, **kwargs)
+
+    return ArkBatchTranslator(**kwargs)
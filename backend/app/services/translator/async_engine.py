@@ -0,0 +1,183 @@
+"""asyncio 翻译引擎（AsyncOpenAI）。
+
+背景：
+- 线程池引擎为每个线程创建一个线程本地 `OpenAI` client（各自一套连接池），
+  几百个线程意味着大量内存与上下文切换。
+- 本引擎在一个独立线程里跑单个事件循环：所有请求共享一个 `AsyncOpenAI`（一套连接池），
+  并发由协程承担，单 worker 可以维持数千个 in-flight 请求而 RSS 只占线程方案的一小部分。
+
+对外契约不变：
+- 仍然是同步的 `translate_items_stream(items) -> Iterator[(item_id, text)]`（Celery 任务无需改动）。
+- 去重、批量缓存、短文本合并、结果扇出等流程全部复用 `ArkBatchTranslator`，
+  这里只替换“提交一个翻译单元”的执行环境（`_unit_executor`）。
+
+并发控制：
+- `asyncio.Semaphore(max_concurrency)`：硬上限；
+- RPM/TPM：使用同一个限流器的 `reserve()` 拿到等待时间后 `await asyncio.sleep()`，不阻塞事件循环；
+- 自适应并发（AIMD）：复用 `AimdConcurrencyController`，通过 `try_acquire()` + `asyncio.Condition` 等待名额。
+
+注意：同一实例同一时间只服务一个 `translate_items_stream`（与 Celery 任务“一次一个翻译器”的用法一致）。
+"""
+
+from __future__ import annotations
+
+import asyncio
+import concurrent.futures
+import contextlib
+import threading
+import time
+from typing import Any, Callable, Iterator, Optional
+
+from openai import APIStatusError, AsyncOpenAI
+
+from app.prompts import DATA_TRANSLATOR_MULTI_CELL_SYSTEM_PROMPT, DATA_TRANSLATOR_SYSTEM_PROMPT
+from app.services.translator.ark_translator import (
+    ArkBatchTranslator,
+    UnitFuture,
+    _backoff_seconds,
+    _estimate_tokens,
+    _is_retryable_error,
+)
+from app.services.translator.concurrency import OUTCOME_ERROR, OUTCOME_OK, OUTCOME_OVERLOAD
+
+
+class AsyncArkTranslator(ArkBatchTranslator):
+    """基于单事件循环 + AsyncOpenAI 的翻译器（与 `ArkBatchTranslator` 接口一致）。"""
+
+    def __init__(self, **kwargs: Any) -> None:
+        super().__init__(**kwargs)
+        # 以下对象都属于事件循环线程，在 `_open()` 中创建
+        self._aclient: Optional[AsyncOpenAI] = None
+        self._asem: Optional[asyncio.Semaphore] = None
+        self._agate: Optional[asyncio.Condition] = None
+
+    @contextlib.contextmanager
+    def _unit_executor(self, *, target_lang: str) -> Iterator[Callable[[list[str]], UnitFuture]]:
+        """在后台线程启动事件循环；提交的单元以 `concurrent.futures.Future` 的形式返回给调用方。"""
+
+        loop = asyncio.new_event_loop()
+        thread = threading.Thread(target=self._run_loop, args=(loop,), name="ark-async-engine", daemon=True)
+        thread.start()
+
+        try:
+            asyncio.run_coroutine_threadsafe(self._open(), loop).result()
+
+            def _submit(texts: list[str]) -> UnitFuture:
+                coro = self._atranslate_unit(texts, target_lang=target_lang)
+                return asyncio.run_coroutine_threadsafe(coro, loop)
+
+            yield _submit
+        finally:
+            # 调用方提前结束（异常/中断）时取消尚未完成的请求，再关闭连接池与事件循环
+            with contextlib.suppress(concurrent.futures.TimeoutError):
+                asyncio.run_coroutine_threadsafe(self._aclose(), loop).result(timeout=30)
+            loop.call_soon_threadsafe(loop.stop)
+            thread.join()
+            loop.close()
+
+    @staticmethod
+    def _run_loop(loop: asyncio.AbstractEventLoop) -> None:
+        asyncio.set_event_loop(loop)
+        loop.run_forever()
+
+    async def _open(self) -> None:
+        self._aclient = AsyncOpenAI(api_key=self._api_key, base_url=self._base_url, timeout=self._timeout_seconds)
+        self._asem = asyncio.Semaphore(self._max_concurrency)
+        self._agate = asyncio.Condition()
+
+    async def _aclose(self) -> None:
+        current = asyncio.current_task()
+        tasks = [t for t in asyncio.all_tasks() if t is not current]
+        for t in tasks:
+            t.cancel()
+        await asyncio.gather(*tasks, return_exceptions=True)
+
+        if self._aclient is not None:
+            await self._aclient.close()
+        self._aclient = None
+        self._asem = None
+        self._agate = None
+
+    async def _atranslate_unit(self, texts: list[str], *, target_lang: str) -> list[str]:
+        """与 `_translate_unit` 对应：单条逐条翻译；多条走行编号协议，解析失败回退逐条。"""
+
+        if len(texts) == 1:
+            return [await self._atranslate_single_text(texts[0], target_lang=target_lang)]
+
+        parsed: Optional[list[str]] = None
+        try:
+            raw = await self._achat_completion(
+                DATA_TRANSLATOR_MULTI_CELL_SYSTEM_PROMPT, self._multi_cell_user_content(texts)
+            )
+            parsed = self._parse_multi_cell_output(raw, expected=len(texts))
+        except APIStatusError:
+            parsed = None
+
+        if parsed is None:
+            outs = await asyncio.gather(*(self._atranslate_single_text(s, target_lang=target_lang) for s in texts))
+            return list(outs)
+        return parsed
+
+    async def _atranslate_single_text(self, text: str, *, target_lang: str) -> str:  # noqa: ARG002
+        s = str(text or "")
+        if not s.strip():
+            return ""
+        return await self._achat_completion(DATA_TRANSLATOR_SYSTEM_PROMPT, s)
+
+    async def _achat_completion(self, system_prompt: str, user_content: str) -> str:
+        """与 `_chat_completion` 对应的异步版本（限流、并发闸门与重试策略一致）。"""
+
+        assert self._aclient is not None and self._asem is not None
+
+        est_tokens = _estimate_tokens(system_prompt, user_content)
+        last_exc: Optional[Exception] = None
+        for attempt in range(5):
+            async with self._asem:
+                # 与同步引擎一致：先进并发闸门、再预约速率配额
+                await self._gate_acquire()
+                started = time.monotonic()
+                outcome = OUTCOME_ERROR
+                try:
+                    wait = await self._areserve(est_tokens)
+                    if wait > 0:
+                        await asyncio.sleep(wait)
+                    started = time.monotonic()
+                    resp = await self._aclient.chat.completions.create(
+                        **self._completion_kwargs(system_prompt, user_content)
+                    )
+                    outcome = OUTCOME_OK
+                    return resp.choices[0].message.content or ""
+                except Exception as e:  # noqa: BLE001
+                    if not _is_retryable_error(e):
+                        raise
+                    last_exc = e
+                    outcome = OUTCOME_OVERLOAD
+                finally:
+                    await self._gate_release(outcome=outcome, latency_seconds=time.monotonic() - started)
+
+            await asyncio.sleep(_backoff_seconds(attempt))
+
+        raise RuntimeError(f"模型调用失败（多次重试仍失败）: {last_exc}")
+
+    async def _areserve(self, tokens: int) -> float:
+        """预约速率配额（不阻塞事件循环）。
+
+        `RedisTokenBucketLimiter.reserve` 是一次同步的 Redis Lua 往返，直接调用会卡住复用所有请求的事件循环；
+        放到默认线程池执行，事件循环只等待结果。
+        """
+
+        loop = asyncio.get_running_loop()
+        return await loop.run_in_executor(None, self._limiter.reserve, tokens)
+
+    async def _gate_acquire(self) -> None:
+        if self._concurrency is None or self._agate is None:
+            return
+        async with self._agate:
+            await self._agate.wait_for(self._concurrency.try_acquire)
+
+    async def _gate_release(self, *, outcome: str, latency_seconds: float) -> None:
+        if self._concurrency is None or self._agate is None:
+            return
+        self._concurrency.release(outcome=outcome, latency_seconds=latency_seconds)
+        async with self._agate:
+            self._agate.notify_all()
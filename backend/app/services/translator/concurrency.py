@@ -0,0 +1,118 @@
+"""自适应并发控制（AIMD）。
+
+背景：
+- 线程池大小（`TRANSLATION_MAX_CONCURRENCY`）是固定的上限；上游变慢或开始返回 429 时，
+  继续保持几百个 in-flight 请求只会让情况更糟。
+
+策略（与 TCP 拥塞控制同思路）：
+- 慢启动：从未遇到过载前，每次“健康”的成功请求 +1，快速逼近上游可承受的并发；
+- 加性增：遇到过载后，每次健康成功 +1/limit（约等于每轮 +1）；
+- 乘性减：429 / 5xx / 超时 / 连接错误时 limit *= decrease_factor；
+  一个冷却窗口内只减一次，避免同一波失败把 limit 连续砍到底；
+- “健康”= 成功且耗时不超过 latency_target_seconds；慢但成功的请求不加也不减。
+
+说明：
+- 调用方先进闸门、再预约 RPM/TPM 额度（`ark_translator._chat_completion` / `async_engine._achat_completion`）：
+  闸门计的是“已拿到并发名额”的请求，既包括正在等待限流的，也包括正在发往上游的；
+  排队等闸门的请求不会提前占掉速率额度。线程池大小仍是硬上限。
+- 当前 limit 会在变化时打日志，并由翻译器写入任务统计。
+"""
+
+from __future__ import annotations
+
+import logging
+import threading
+import time
+
+
+logger = logging.getLogger(__name__)
+
+
+# 请求结果分类（由调用方在 release 时给出）
+OUTCOME_OK = "ok"
+OUTCOME_OVERLOAD = "overload"  # 429 / 5xx / 超时 / 连接错误：需要降并发
+OUTCOME_ERROR = "error"  # 其它失败（例如 4xx 参数错误）：与上游负载无关，不调整
+
+
+class AimdConcurrencyController:
+    """线程安全的 AIMD 并发闸门。"""
+
+    # 日志节流：limit 上升时最多每隔多少秒打一条（下降总是打印）
+    _LOG_INTERVAL_SECONDS = 10.0
+
+    def __init__(
+        self,
+        *,
+        initial_limit: int,
+        min_limit: int,
+        max_limit: int,
+        decrease_factor: float = 0.5,
+        latency_target_seconds: float = 30.0,
+        cooldown_seconds: float = 2.0,
+    ) -> None:
+        self._max_limit = max(1, int(max_limit))
+        self._min_limit = max(1, min(int(min_limit), self._max_limit))
+        self._limit = float(max(self._min_limit, min(int(initial_limit), self._max_limit)))
+        self._decrease_factor = min(0.95, max(0.05, float(decrease_factor)))
+        self._latency_target_seconds = max(0.0, float(latency_target_seconds))
+        self._cooldown_seconds = max(0.0, float(cooldown_seconds))
+
+        self._cond = threading.Condition()
+        self._inflight = 0
+        self._slow_start = True
+        self._last_decrease_ts = 0.0
+        self._last_log_ts = 0.0
+
+        self.overloads = 0
+
+    @property
+    def limit(self) -> int:
+        return int(self._limit)
+
+    @property
+    def inflight(self) -> int:
+        return self._inflight
+
+    def acquire(self) -> None:
+        """阻塞等待直到 in-flight 数低于当前 limit。"""
+
+        with self._cond:
+            while self._inflight >= int(self._limit):
+                self._cond.wait()
+            self._inflight += 1
+
+    def try_acquire(self) -> bool:
+        """非阻塞获取名额：成功返回 True（供 asyncio 调用方配合自己的等待原语使用）。"""
+
+        with self._cond:
+            if self._inflight >= int(self._limit):
+                return False
+            self._inflight += 1
+            return True
+
+    def release(self, *, outcome: str, latency_seconds: float) -> None:
+        """释放一个名额，并根据本次请求结果调整 limit。"""
+
+        with self._cond:
+            self._inflight = max(0, self._inflight - 1)
+            old_limit = int(self._limit)
+            now = time.monotonic()
+
+            if outcome == OUTCOME_OVERLOAD:
+                self.overloads += 1
+                self._slow_start = False
+                if now - self._last_decrease_ts >= self._cooldown_seconds:
+                    self._limit = max(float(self._min_limit), self._limit * self._decrease_factor)
+                    self._last_decrease_ts = now
+            elif outcome == OUTCOME_OK and latency_seconds <= self._latency_target_seconds:
+                step = 1.0 if self._slow_start else 1.0 / max(1.0, self._limit)
+                self._limit = min(float(self._max_limit), self._limit + step)
+
+            new_limit = int(self._limit)
+            self._cond.notify_all()
+
+        if new_limit < old_limit:
+            logger.warning("translator concurrency limit decreased: %s -> %s (overload)", old_limit, new_limit)
+        elif new_limit > old_limit and now - self._last_log_ts >= self._LOG_INTERVAL_SECONDS:
+            self._last_log_ts = now
+            logger.info("translator concurrency limit increased: %s -> %s", old_limit, new_limit)
@@ -0,0 +1,176 @@
+"""紧凑的翻译单元存储（列式）。
+
+背景：
+- 每个单元格一个 frozen `TranslateItem`（id 字符串 + text + hint f-string），
+  百万级单元的任务光对象开销就是几百 MB。
+
+做法：
+- 文本按 UTF-8 追加进一个连续缓冲区，用 `array('Q')` 记录偏移；
+- item id 就是存储中的整数下标（对外以字符串形式出现，例如 "0"、"1"）；
+- hint 按字段驻留（同一列/同一路径只存一份），每个单元只记一个 `array('I')` 下标；
+- 文本超过阈值后转存到临时文件（mmap 读取），进程内存不随任务规模增长。
+
+对外接口：
+- 实现 `Sequence[TranslateItem]`：按下标/切片访问、迭代时才按需构造 `TranslateItem`，
+  翻译器与任务代码无需关心底层存储。
+"""
+
+from __future__ import annotations
+
+import mmap
+import tempfile
+from array import array
+from typing import IO, Iterator, Optional, Sequence, Union, overload
+
+from app.core.config import settings
+from app.core.paths import resolve_backend_path
+from app.services.translator.ark_translator import TranslateItem
+
+
+class ItemStore(Sequence[TranslateItem]):
+    """追加写、按下标读的翻译单元存储。"""
+
+    __slots__ = ("_offsets", "_hint_ids", "_hints", "_hint_index", "_buf", "_spill_bytes", "_file", "_mmap")
+
+    def __init__(self, *, spill_bytes: Optional[int] = None) -> None:
+        self._offsets = array("Q", [0])
+        self._hint_ids = array("I")
+        self._hints: list[str] = []
+        self._hint_index: dict[str, int] = {}
+        self._buf = bytearray()
+
+        if spill_bytes is None:
+            spill_bytes = int(getattr(settings, "TRANSLATION_ITEM_STORE_SPILL_BYTES", 0) or 0)
+        # <=0 表示不转存（全部保存在内存）
+        self._spill_bytes = int(spill_bytes)
+        self._file: Optional[IO[bytes]] = None
+        self._mmap: Optional[mmap.mmap] = None
+
+    # --- 写入 ---
+
+    def append(self, text: str, hint: str = "") -> str:
+        """追加一个单元，返回它的 item id。"""
+
+        hid = self._hint_index.get(hint)
+        if hid is None:
+            hid = self._hint_index[hint] = len(self._hints)
+            self._hints.append(hint)
+
+        data = text.encode("utf-8")
+        item_id = str(len(self._hint_ids))
+        self._hint_ids.append(hid)
+        self._offsets.append(self._offsets[-1] + len(data))
+
+        if self._file is not None:
+            self._file.write(data)
+        else:
+            self._buf += data
+            if self._spill_bytes > 0 and len(self._buf) > self._spill_bytes:
+                self._spill()
+        return item_id
+
+    def extend(self, texts: Sequence[str], hint: str = "") -> range:
+        """批量追加同一字段的多个单元，返回它们的下标区间。"""
+
+        start = len(self)
+        for text in texts:
+            self.append(text, hint)
+        return range(start, len(self))
+
+    def _spill(self) -> None:
+        spill_dir = resolve_backend_path(settings.STORAGE_DIR)
+        spill_dir.mkdir(parents=True, exist_ok=True)
+        # TemporaryFile：关闭（或进程退出）后自动删除
+        self._file = tempfile.TemporaryFile(dir=spill_dir, prefix="items-")
+        self._file.write(self._buf)
+        self._buf = bytearray()
+
+    @property
+    def spilled(self) -> bool:
+        return self._file is not None
+
+    def close(self) -> None:
+        """释放临时文件（转存时）。"""
+
+        if self._mmap is not None:
+            self._mmap.close()
+            self._mmap = None
+        if self._file is not None:
+            self._file.close()
+            self._file = None
+
+    def __enter__(self) -> "ItemStore":
+        return self
+
+    def __exit__(self, *exc: object) -> None:
+        self.close()
+
+    # --- 读取 ---
+
+    def _text_bytes(self, start: int, end: int) -> bytes:
+        if self._file is None:
+            return bytes(self._buf[start:end])
+
+        if self._mmap is None or len(self._mmap) < end:
+            # 转存后追加的数据需要先刷盘，再重新映射
+            self._file.flush()
+            if self._mmap is not None:
+                self._mmap.close()
+            self._mmap = mmap.mmap(self._file.fileno(), 0, access=mmap.ACCESS_READ)
+        return self._mmap[start:end]
+
+    def text(self, index: int) -> str:
+        return self._text_bytes(self._offsets[index], self._offsets[index + 1]).decode("utf-8")
+
+    def hint(self, index: int) -> str:
+        return self._hints[self._hint_ids[index]]
+
+    def __len__(self) -> int:
+        return len(self._hint_ids)
+
+    @overload
+    def __getitem__(self, index: int) -> TranslateItem: ...
+
+    @overload
+    def __getitem__(self, index: slice) -> "ItemStoreView": ...
+
+    def __getitem__(self, index: Union[int, slice]) -> Union[TranslateItem, "ItemStoreView"]:
+        if isinstance(index, slice):
+            return ItemStoreView(self, range(len(self))[index])
+        if index < 0:
+            index += len(self)
+        if not 0 <= index < len(self):
+            raise IndexError(index)
+        return TranslateItem(id=str(index), text=self.text(index), hint=self.hint(index))
+
+    def __iter__(self) -> Iterator[TranslateItem]:
+        for i in range(len(self)):
+            yield self[i]
+
+
+class ItemStoreView(Sequence[TranslateItem]):
+    """ItemStore 的只读切片（不复制数据，例如分片任务只处理其中一段）。"""
+
+    __slots__ = ("_store", "_range")
+
+    def __init__(self, store: ItemStore, rng: range) -> None:
+        self._store = store
+        self._range = rng
+
+    def __len__(self) -> int:
+        return len(self._range)
+
+    @overload
+    def __getitem__(self, index: int) -> TranslateItem: ...
+
+    @overload
+    def __getitem__(self, index: slice) -> "ItemStoreView": ...
+
+    def __getitem__(self, index: Union[int, slice]) -> Union[TranslateItem, "ItemStoreView"]:
+        if isinstance(index, slice):
+            return ItemStoreView(self._store, self._range[index])
+        return self._store[self._range[index]]
+
+    def __iter__(self) -> Iterator[TranslateItem]:
+        for i in self._range:
+            yield self._store[i]
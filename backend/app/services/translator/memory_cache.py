@@ -0,0 +1,109 @@
+"""进程内 L1 翻译缓存（有界 LRU）。
+
+设计目标：
+- 放在 Redis 缓存前面，命中时不产生任何网络往返（Redis GET 在数百个线程里都是热点）。
+- 同一 worker 进程内的所有任务共享（见 `get_process_l1_cache()`），重复数据集的任务基本不再访问 Redis。
+- 容量同时受“条目数”和“字节数”约束，超出时按 LRU 淘汰，避免进程内存无界增长。
+
+说明：
+- 只做进程内共享：Celery prefork 的每个子进程各有一份，互不同步（Redis 仍是跨进程的 L2）。
+- 字节数按 key + value 的 UTF-8 长度估算，不追求与真实 RSS 精确一致。
+"""
+
+from __future__ import annotations
+
+import threading
+from collections import OrderedDict
+from typing import Optional
+
+from app.core.config import settings
+
+
+class LruTranslationCache:
+    """线程安全的有界 LRU 缓存（key/value 都是字符串）。"""
+
+    def __init__(self, *, max_entries: int, max_bytes: int) -> None:
+        self._max_entries = max(0, int(max_entries or 0))
+        self._max_bytes = max(0, int(max_bytes or 0))
+        self._lock = threading.Lock()
+        self._data: OrderedDict[str, tuple[str, int]] = OrderedDict()
+        self._bytes = 0
+
+        self.hits = 0
+        self.misses = 0
+        self.evictions = 0
+
+    @property
+    def enabled(self) -> bool:
+        return self._max_entries > 0 and self._max_bytes > 0
+
+    @staticmethod
+    def _entry_size(key: str, value: str) -> int:
+        return len(key.encode("utf-8")) + len(value.encode("utf-8"))
+
+    def get(self, key: str) -> Optional[str]:
+        if not self.enabled:
+            return None
+        with self._lock:
+            entry = self._data.get(key)
+            if entry is None:
+                self.misses += 1
+                return None
+            self._data.move_to_end(key)
+            self.hits += 1
+            return entry[0]
+
+    def set(self, key: str, value: str) -> None:
+        if not self.enabled:
+            return
+        size = self._entry_size(key, value)
+        if size > self._max_bytes:
+            # 单条就超过总容量：不缓存，避免把其它条目全部挤掉
+            return
+        with self._lock:
+            old = self._data.pop(key, None)
+            if old is not None:
+                self._bytes -= old[1]
+            self._data[key] = (value, size)
+            self._bytes += size
+
+            while self._data and (len(self._data) > self._max_entries or self._bytes > self._max_bytes):
+                _, (_, evicted_size) = self._data.popitem(last=False)
+                self._bytes -= evicted_size
+                self.evictions += 1
+
+    def clear(self) -> None:
+        with self._lock:
+            self._data.clear()
+            self._bytes = 0
+
+    def stats(self) -> dict[str, int]:
+        """命中/未命中/淘汰计数与当前占用（用于日志与排查）。"""
+
+        with self._lock:
+            return {
+                "entries": len(self._data),
+                "bytes": self._bytes,
+                "hits": self.hits,
+                "misses": self.misses,
+                "evictions": self.evictions,
+            }
+
+
+_process_cache: Optional[LruTranslationCache] = None
+_process_cache_lock = threading.Lock()
+
+
+def get_process_l1_cache() -> LruTranslationCache:
+    """获取当前进程共享的 L1 缓存（按 settings 懒加载创建）。"""
+
+    global _process_cache
+    if _process_cache is not None:
+        return _process_cache
+    with _process_cache_lock:
+        if _process_cache is None:
+            _process_cache = LruTranslationCache(
+                max_entries=int(getattr(settings, "TRANSLATION_L1_CACHE_MAX_ENTRIES", 0) or 0),
+                max_bytes=int(getattr(settings, "TRANSLATION_L1_CACHE_MAX_BYTES", 0) or 0),
+            )
+        return _process_cache
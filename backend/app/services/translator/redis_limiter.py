@@ -0,0 +1,148 @@
+"""Redis 分布式限流器（RPM + 可选 TPM）。
+
+背景：
+- `SmoothRpmLimiter` 是进程内限流：N 个 worker 进程/容器会把实际 RPM 放大 N 倍，触发 429。
+- 这里把“下一次允许放行的时间点”放到 Redis 里，由 Lua 脚本原子地读改写，所有进程共享同一份配额。
+
+算法（与 `SmoothRpmLimiter` 语义一致，只是状态在 Redis）：
+- RPM：平滑放行。每次预约把 `tat`（theoretical arrival time）推后 60/rpm 秒，调用方等待到自己的时间点。
+- TPM（可选）：GCRA 令牌桶。每次按本次请求的估算 token 数推后 `tat_tokens`，允许最多 1 分钟的突发。
+- 时间统一取 Redis 的 `TIME`，避免多机时钟漂移。
+
+降级：
+- Redis 不可用时回退到进程内 `SmoothRpmLimiter`（至少保证单进程不超限），并在冷却后自动重试连接。
+"""
+
+from __future__ import annotations
+
+import threading
+import time
+from typing import Any, Optional
+
+import redis
+
+from app.services.translator.rpm_limiter import SmoothRpmLimiter
+
+
+# KEYS[1]: RPM 的 tat；KEYS[2]: TPM 的 tat
+# ARGV: interval(秒/请求), tokens, token_interval(秒/token, 0 表示不限 TPM), burst(秒), ttl_ms
+_RESERVE_LUA = """
+local t = redis.call('TIME')
+local now = tonumber(t[1]) + tonumber(t[2]) / 1000000
+local interval = tonumber(ARGV[1])
+local tokens = tonumber(ARGV[2])
+local token_interval = tonumber(ARGV[3])
+local burst = tonumber(ARGV[4])
+local ttl = tonumber(ARGV[5])
+
+-- 过期时间至少覆盖到预约的时间点之后，避免 key 提前过期导致配额被“重置”
+local function expire_ms(tat_value)
+  return math.floor(math.max(ttl, (tat_value - now) * 1000 + ttl))
+end
+
+local tat = tonumber(redis.call('GET', KEYS[1]) or '0')
+local start = math.max(tat, now)
+local wait = start - now
+redis.call('SET', KEYS[1], tostring(start + interval), 'PX', expire_ms(start + interval))
+
+if token_interval > 0 and tokens > 0 then
+  local ttat = tonumber(redis.call('GET', KEYS[2]) or '0')
+  local new_ttat = math.max(ttat, now) + tokens * token_interval
+  local twait = new_ttat - now - burst
+  if twait > wait then
+    wait = twait
+  end
+  redis.call('SET', KEYS[2], tostring(new_ttat), 'PX', expire_ms(new_ttat))
+end
+
+return tostring(wait)
+"""
+
+
+class RedisTokenBucketLimiter:
+    """全局 RPM/TPM 限流器（`SmoothRpmLimiter.acquire()` 的 drop-in 替代）。"""
+
+    # Redis 不可用后，隔多久再尝试重连（期间直接走本地限流）
+    _RECONNECT_COOLDOWN_SECONDS = 5.0
+
+    def __init__(self, redis_url: str, *, rpm: int, tpm: int = 0, key_prefix: str = "ratelimit:ark") -> None:
+        safe_rpm = int(rpm) if rpm is not None else 0
+        self._rpm = max(1, safe_rpm)
+        self._tpm = max(0, int(tpm or 0))
+        self._interval_seconds = 60.0 / float(self._rpm)
+        self._token_interval_seconds = (60.0 / float(self._tpm)) if self._tpm > 0 else 0.0
+
+        self._redis_url = redis_url
+        self._rpm_key = f"{key_prefix}:rpm"
+        self._tpm_key = f"{key_prefix}:tpm"
+        self._lock = threading.Lock()
+        self._client: Optional[redis.Redis] = None
+        self._script: Any = None
+        self._retry_after = 0.0
+
+        self._fallback = SmoothRpmLimiter(self._rpm)
+
+    @property
+    def rpm(self) -> int:
+        return self._rpm
+
+    @property
+    def tpm(self) -> int:
+        return self._tpm
+
+    def _get_script(self) -> Any:
+        if self._script is not None:
+            return self._script
+        with self._lock:
+            if self._script is not None:
+                return self._script
+            if time.monotonic() < self._retry_after:
+                return None
+            try:
+                client = redis.Redis.from_url(self._redis_url, decode_responses=True)
+                client.ping()
+                self._client = client
+                self._script = client.register_script(_RESERVE_LUA)
+            except Exception:  # noqa: BLE001
+                self._client = None
+                self._script = None
+                self._retry_after = time.monotonic() + self._RECONNECT_COOLDOWN_SECONDS
+            return self._script
+
+    def _mark_unavailable(self) -> None:
+        with self._lock:
+            self._client = None
+            self._script = None
+            self._retry_after = time.monotonic() + self._RECONNECT_COOLDOWN_SECONDS
+
+    def reserve(self, tokens: int = 0) -> float:
+        """预约一个放行名额（含 tokens 个 TPM 配额），返回需要等待的秒数（不阻塞）。"""
+
+        script = self._get_script()
+        if script is None:
+            return self._fallback.reserve(tokens)
+
+        # key 的基础过期时间：空闲一段时间后自动清理
+        ttl_ms = int(max(60.0, self._interval_seconds * 2) * 1000)
+        try:
+            raw = script(
+                keys=[self._rpm_key, self._tpm_key],
+                args=[
+                    repr(self._interval_seconds),
+                    int(max(0, tokens)),
+                    repr(self._token_interval_seconds),
+                    60,
+                    ttl_ms,
+                ],
+            )
+            return max(0.0, float(raw))
+        except Exception:  # noqa: BLE001
+            self._mark_unavailable()
+            return self._fallback.reserve(tokens)
+
+    def acquire(self, tokens: int = 0) -> None:
+        """阻塞等待直到当前请求被放行。"""
+
+        wait_seconds = self.reserve(tokens)
+        if wait_seconds > 0:
+            time.sleep(wait_seconds)
@@ -5,8 +5,9 @@
 - 采用“平滑放行”（固定间隔放行 1 次），避免短时间 burst 触发 429。
 
 说明：
-- 该实现为“进程内限流”。Celery 多进程/多机器部署时，整体 RPM 可能仍会叠加。
-  Demo 阶段先保持简单；如需全局限流，可升级为 Redis 分布式令牌桶。
+- 该实现为“进程内限流”。Celery 多进程/多机器部署时，整体 RPM 会叠加；
+  全局限流见 `redis_limiter.RedisTokenBucketLimiter`（Redis 不可用时回退到本实现）。
+- `reserve()` 只做“预约”并返回需要等待的秒数，便于非阻塞调用方（例如 asyncio）自行等待。
 """
 
 from __future__ import annotations
@@ -29,15 +30,20 @@ class SmoothRpmLimiter:
     def rpm(self) -> int:
         return self._rpm
 
-    def acquire(self) -> None:
-        """阻塞等待直到当前请求被放行。"""
+    def reserve(self, tokens: int = 0) -> float:  # noqa: ARG002 - 进程内实现只限 RPM
+        """预约一个放行名额，返回需要等待的秒数（不阻塞）。"""
 
         with self._lock:
             now = time.monotonic()
             wait_seconds = max(0.0, self._next_ts - now)
             base = max(self._next_ts, now)
             self._next_ts = base + self._interval_seconds
+        return wait_seconds
+
+    def acquire(self, tokens: int = 0) -> None:
+        """阻塞等待直到当前请求被放行。"""
 
+        wait_seconds = self.reserve(tokens)
         if wait_seconds > 0:
             time.sleep(wait_seconds)
 
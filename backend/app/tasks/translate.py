@@ -1,30 +1,87 @@
 """翻译任务（Celery）。
 
 说明：
-- 任务状态以 DB 为准（前端轮询 `/api/v1/jobs/{job_id}`）。
+- 任务状态以 DB 为准（前端轮询 `/api/v1/jobs/{job_id}`）；运行中的进度逐条写 Redis、定时落库（见 `job_progress`）。
 - 导出文件写入 `settings.EXPORTS_DIR`，并把相对路径写回 DB。
+- 已完成的翻译按进度批次写入断点文件（见 `job_checkpoint`），任务重跑/重投递时只翻译缺失的单元。
+
+分片执行（`TRANSLATION_SHARD_SIZE > 0` 且单元数超过分片大小时）：
+- 入口任务只做准备与拆分：按单元下标切成若干分片，以 Celery chord 投递；
+- 每个分片任务由任意空闲 worker 执行：重新 prepare（单元 id 是确定性的）后取自己的下标区间翻译，
+  结果写入分片自己的断点文件，进度通过 SQL 原子自增汇总到同一个任务上
+  （每个分片已计入的条数记在 `JobShardProgress`，重投递的分片只补计差额）；
+- 所有分片结束后由汇总任务读取分片断点、调用 `prepared.apply` 导出。
+- 任一分片失败会把任务标记为 failed，其它分片在下一次写进度时发现后提前退出；
+  续跑时各分片只翻译自己缺失的部分。
+- 每次派发带一个派发标记（`shard_dispatch_id`，同时作为 chord 的任务 id）并传给分片与汇总任务：
+  续跑会换一个新标记，上一次派发中仍在运行的分片写进度时发现标记已变化即退出，
+  不再累加进度、不覆盖新派发的失败原因，其汇总任务也不会导出。
 """
 
 from __future__ import annotations
 
+from dataclasses import dataclass
 from pathlib import Path
-from typing import Any
+from typing import Any, Iterable, Iterator, Optional, Sequence, Union
+from uuid import uuid4
+
+from celery import chord
+from sqlalchemy import delete, or_, update
+from sqlalchemy.exc import IntegrityError
 
 from app.core.celery_app import celery_app
 from app.core.config import settings
 from app.core.paths import BACKEND_ROOT, resolve_backend_path
 from app.db.session import SessionLocal
+from app.models.job_shard_progress import JobShardProgress
 from app.models.translation_job import TranslationJob
 from app.models.uploaded_file import UploadedFile
+from app.services.adapters.base import PreparedTranslation
 from app.services.adapters.registry import get_adapter
+from app.services.export_compression import precompress_export
+from app.services.job_checkpoint import JobCheckpoint
+from app.services.job_progress import (
+    ProgressCounter,
+    clear_live_progress,
+    publish_job_status,
+    reset_live_progress,
+)
 from app.services.translator.ark_translator import TranslateItem, build_default_translator
 
 
-@celery_app.task(name="app.tasks.translate.translate_job_task")
-def translate_job_task(job_id: str) -> dict[str, str]:
-    """后台翻译任务入口。"""
+@dataclass
+class _PreparedJob:
+    """准备阶段的产物（已脱离 ORM 对象，可在 session 之外使用）。"""
+
+    prepared: PreparedTranslation
+    target_lang: str
+    mode: str
+    client_id: str
+
+
+class _JobAborted(Exception):
+    """任务已被其它分片（或其它投递）标记为失败：当前执行提前结束，不覆盖已有的失败原因。"""
+
+    def __init__(self) -> None:
+        super().__init__("任务已被标记为失败，提前结束")
+
+
+def _fail(job_id: str, message: str, *, dispatch_id: str = "") -> dict[str, str]:
+    """把任务标记为失败；dispatch_id 不为空时只在它仍是当前派发时生效（过期的分片不覆盖新的执行）。"""
+
+    with SessionLocal() as db:
+        job = db.get(TranslationJob, job_id)
+        if job and (not dispatch_id or job.shard_dispatch_id == dispatch_id):
+            job.status = "failed"
+            job.error_message = message
+            db.commit()
+            publish_job_status(job)
+    return {"job_id": job_id, "status": "failed"}
+
+
+def _prepare_job(job_id: str) -> Union[_PreparedJob, dict[str, str]]:
+    """读取任务与文件元信息并准备翻译单元；失败时把任务标记为 failed 并返回任务结果。"""
 
-    # 1) 读取任务与文件元信息
     with SessionLocal() as db:
         job = db.get(TranslationJob, job_id)
         if not job:
@@ -32,154 +89,177 @@ def translate_job_task(job_id: str) -> dict[str, str]:
 
         uploaded = db.get(UploadedFile, job.file_id)
         if not uploaded:
-            job.status = "failed"
-            job.error_message = "找不到上传文件记录"
-            db.commit()
-            return {"job_id": job_id, "status": "failed"}
+            return _fail(job_id, "找不到上传文件记录")
 
         adapter = get_adapter(uploaded.detected_format)
         if adapter is None:
-            job.status = "failed"
-            job.error_message = f"暂不支持该格式: {uploaded.detected_format}"
-            db.commit()
-            return {"job_id": job_id, "status": "failed"}
+            return _fail(job_id, f"暂不支持该格式: {uploaded.detected_format}")
 
         file_path = resolve_backend_path(uploaded.storage_path)
         export_dir = resolve_backend_path(settings.EXPORTS_DIR)
 
         # 防御式检查：上传记录存在，但文件可能已被清理/移动
         if not file_path.exists():
-            job.status = "failed"
-            job.error_message = "找不到上传文件（文件可能已被清理或路径无效）"
-            db.commit()
-            return {"job_id": job_id, "status": "failed"}
+            return _fail(job_id, "找不到上传文件（文件可能已被清理或路径无效）")
 
         selected_fields_obj: Any = job.selected_fields
         selected_fields: list[str] = selected_fields_obj if isinstance(selected_fields_obj, list) else []
         selected_fields = [str(x) for x in selected_fields if str(x).strip()]
 
-        # 2) 准备翻译单元（并初始化进度）
-        try:
-            prepared = adapter.prepare(
-                file_path=file_path,
-                selected_fields=selected_fields,
-                row_limit=int(job.row_limit or 0),
-                mode=job.mode,
-                target_lang=job.target_lang,
-                export_dir=export_dir,
-                job_id=job.id,
-            )
-        except Exception as e:  # noqa: BLE001
-            job.status = "failed"
-            job.error_message = f"准备翻译单元失败: {str(e)[:200]}"
-            db.commit()
-            return {"job_id": job_id, "status": "failed"}
+        # 把必要字段拷贝出来，避免下方持有 ORM 对象
+        row_limit = int(job.row_limit or 0)
+        mode = job.mode
+        target_lang = job.target_lang
+        client_id = job.client_id or ""
 
-        items: list[TranslateItem] = prepared.items
+    try:
+        prepared = adapter.prepare(
+            file_path=file_path,
+            selected_fields=selected_fields,
+            row_limit=row_limit,
+            mode=mode,
+            target_lang=target_lang,
+            export_dir=export_dir,
+            job_id=job_id,
+        )
+    except Exception as e:  # noqa: BLE001
+        return _fail(job_id, f"准备翻译单元失败: {str(e)[:200]}")
 
-        # 边界情况：所选字段没有可翻译的文本内容
-        # - 可能原因：字段下全是数字/时间戳/null，或字段路径不匹配
-        # - 处理方式：明确告知用户，让其调整字段选择后重试
-        if not items:
-            job.status = "failed"
-            job.error_message = (
-                "所选字段没有可翻译的文本内容。"
-                "可能原因：字段值为空/数字/时间戳，或字段路径不存在。"
-                "请检查字段选择后重新创建任务。"
-            )
-            db.commit()
-            return {"job_id": job_id, "status": "failed"}
-
-        job.status = "running"
-        job.error_message = ""
-        job.progress_total = len(items)
-        job.progress_done = 0
-        job.progress_failed = 0
-        job.result_path = ""
-        db.commit()
+    return _PreparedJob(prepared=prepared, target_lang=target_lang, mode=mode, client_id=client_id)
 
-        # 把必要字段拷贝出来，避免下方持有 ORM 对象
-        target_lang = job.target_lang
-        mode = job.mode
 
-    # 3) 执行翻译（分批更新进度）
+def _build_translator() -> Any:
     # 开发联调：允许使用 mock 翻译，便于在没有 Key 的情况下走通全链路
     if settings.TRANSLATION_DRY_RUN:
         class _MockTranslator:
-            def translate_items_stream(self, xs: list[TranslateItem], *, target_lang: str):  # noqa: ANN001,ARG002
+            def translate_items_stream(self, xs: Iterable[TranslateItem], *, target_lang: str):  # noqa: ANN001,ARG002
                 for it in xs:
                     yield (it.id, f"【mock】{it.text}")
 
-        translator: Any = _MockTranslator()
-    else:
-        try:
-            translator = build_default_translator()
-        except Exception as e:  # noqa: BLE001
-            with SessionLocal() as db:
-                job = db.get(TranslationJob, job_id)
-                if job:
-                    job.status = "failed"
-                    job.error_message = f"初始化翻译器失败: {str(e)[:200]}"
-                    db.commit()
-            return {"job_id": job_id, "status": "failed"}
+        return _MockTranslator()
+    return build_default_translator()
+
+
+def _flush_progress(counter: ProgressCounter, *, dispatch_id: str = "", shard: Optional[int] = None) -> str:
+    """把计数器里尚未落库的进度原子地累加到 DB（多个分片并发写同一行），返回任务当前状态。
+
+    dispatch_id 不为空（分片）：只在它仍是任务当前的派发时累加；已被续跑替换时按 failed 返回，调用方提前退出。
+    同时在同一事务里累加该分片的已计入条数（见 `JobShardProgress`）。
+    """
+
+    done, failed = counter.take()
+    with SessionLocal() as db:
+        if done or failed:
+            stmt = update(TranslationJob).where(TranslationJob.id == counter.job_id)
+            if dispatch_id:
+                stmt = stmt.where(TranslationJob.shard_dispatch_id == dispatch_id)
+            advanced = db.execute(
+                stmt.values(
+                    progress_done=TranslationJob.progress_done + done,
+                    progress_failed=TranslationJob.progress_failed + failed,
+                )
+            ).rowcount
+            if advanced and dispatch_id and shard is not None:
+                db.execute(
+                    update(JobShardProgress)
+                    .where(JobShardProgress.dispatch_id == dispatch_id, JobShardProgress.shard == shard)
+                    .values(counted_done=JobShardProgress.counted_done + done)
+                )
+            db.commit()
+        job = db.get(TranslationJob, counter.job_id)
+        if not job:
+            return "missing"
+        if dispatch_id and job.shard_dispatch_id != dispatch_id:
+            return "failed"
+        return job.status
+
+
+def _restore_checkpoint(
+    checkpoint: JobCheckpoint, items: Sequence[TranslateItem]
+) -> tuple[dict[str, str], Iterator[TranslateItem]]:
+    """加载断点中属于 items 的结果，返回（已完成的译文, 惰性的待翻译单元迭代器）。
+
+    items 可能是百万级的 `ItemStore`：这里不建 id 集合、不复制列表，待翻译单元在翻译器拉取时才构造。
+    """
 
+    saved = checkpoint.load()
     translations: dict[str, str] = {}
+    if saved:
+        for it in items:
+            text = saved.get(it.id)
+            if text is not None:
+                translations[it.id] = text
+    return translations, (it for it in items if it.id not in translations)
 
-    # cell-level 批次：用于更新进度
-    # - 数值越小，前端进度条越“实时”，但 DB 写入更频繁
-    # - 使用 settings.TRANSLATION_BATCH_SIZE 作为可调参数（默认 20）
+
+def _run_translation(
+    job_id: str,
+    translator: Any,
+    items: Iterable[TranslateItem],
+    *,
+    target_lang: str,
+    client_id: str,
+    checkpoint: JobCheckpoint,
+    translations: dict[str, str],
+    dispatch_id: str = "",
+    shard: Optional[int] = None,
+) -> None:
+    """翻译 items 写入 translations，并按批次刷断点、累加进度（dispatch_id 见 `_flush_progress`）。"""
+
+    # cell-level 批次：断点写入（不 fsync）的频率（使用 settings.TRANSLATION_BATCH_SIZE，默认 20）
     cell_batch_size = max(1, int(getattr(settings, "TRANSLATION_BATCH_SIZE", 20) or 20))
+
+    # 说明：
+    # - 翻译器内部会尽量并发地跑满 RPM；这里不要再用 batch 切片去“限制翻译提交”；
+    # - 实时进度逐条写 Redis；DB 只按 JOB_PROGRESS_FLUSH_SECONDS 定时落库（见 job_progress）。
+    counter = ProgressCounter(job_id, client_id=client_id)
+    pending = 0
     try:
-        # 说明：
-        # - 翻译器内部会尽量并发地跑满 RPM；这里不要再用 batch 切片去“限制翻译提交”；
-        # - `cell_batch_size` 只用于控制“写 DB 更新进度”的频率。
-        done = 0
-        last_flushed_done = 0
         for item_id, translated_text in translator.translate_items_stream(items, target_lang=target_lang):
             translations[str(item_id)] = str(translated_text or "")
-            done += 1
-
-            if done - last_flushed_done >= cell_batch_size:
-                with SessionLocal() as db:
-                    job = db.get(TranslationJob, job_id)
-                    if job:
-                        job.progress_done = min(int(job.progress_total or 0), done)
-                        db.commit()
-                last_flushed_done = done
-
-        # 收尾：把最后不足一个 batch 的进度写回
-        if done != last_flushed_done:
-            with SessionLocal() as db:
-                job = db.get(TranslationJob, job_id)
-                if job:
-                    job.progress_done = min(int(job.progress_total or 0), done)
-                    db.commit()
-    except Exception as e:  # noqa: BLE001
-        with SessionLocal() as db:
-            job = db.get(TranslationJob, job_id)
-            if job:
-                job.status = "failed"
-                job.error_message = f"翻译失败: {str(e)[:200]}"
-                db.commit()
-        return {"job_id": job_id, "status": "failed"}
+            checkpoint.add(str(item_id), translations[str(item_id)])
+            counter.add(1)
+            pending += 1
+
+            if pending >= cell_batch_size:
+                checkpoint.flush()
+                pending = 0
+            if counter.due():
+                # 先刷断点（fsync）再落库进度：DB 进度里算上的条目一定已经落盘
+                checkpoint.flush(sync=True)
+                pending = 0
+                if _flush_progress(counter, dispatch_id=dispatch_id, shard=shard) == "failed":
+                    raise _JobAborted()
+    finally:
+        # 收尾（含中途失败）：把剩余的断点与进度写回
+        checkpoint.flush(sync=True)
+        _flush_progress(counter, dispatch_id=dispatch_id, shard=shard)
+
+
+def _finish(
+    job_id: str,
+    job_ctx: _PreparedJob,
+    translations: dict[str, str],
+    stats_dict: dict[str, Any],
+    checkpoints: list[JobCheckpoint],
+) -> dict[str, str]:
+    """回填导出并写回完成状态；成功后删除断点。"""
 
-    # 4) 回填并导出
     try:
-        out_path = prepared.apply(translations)
+        out_path = job_ctx.prepared.apply(translations)
     except Exception as e:  # noqa: BLE001
-        with SessionLocal() as db:
-            job = db.get(TranslationJob, job_id)
-            if job:
-                job.status = "failed"
-                job.error_message = f"导出失败: {str(e)[:200]}"
-                db.commit()
-        return {"job_id": job_id, "status": "failed"}
+        for cp in checkpoints:
+            cp.close()
+        return _fail(job_id, f"导出失败: {str(e)[:200]}")
+
+    # 文本导出预压缩（在标记成功之前完成：下载方看到 succeeded 时副本已就绪）
+    precompress_export(Path(out_path))
 
-    # 5) 写回任务完成状态
     with SessionLocal() as db:
         job = db.get(TranslationJob, job_id)
         if job:
             job.status = "succeeded"
+            job.stats = stats_dict
             p = Path(out_path)
             try:
                 p = p.relative_to(BACKEND_ROOT)
@@ -187,6 +267,286 @@ def translate_job_task(job_id: str) -> dict[str, str]:
                 pass
             job.result_path = p.as_posix()
             db.commit()
+            publish_job_status(job)
+
+    # 导出已落盘且状态已写回：断点、分片计数与实时进度不再需要
+    for cp in checkpoints:
+        cp.delete()
+    with SessionLocal() as db:
+        db.execute(delete(JobShardProgress).where(JobShardProgress.job_id == job_id))
+        db.commit()
+    clear_live_progress(job_id)
+
+    return {"job_id": job_id, "status": "succeeded", "mode": job_ctx.mode, "target_lang": job_ctx.target_lang}
+
+
+def _shard_ranges(total: int, shard_size: int) -> list[tuple[int, int]]:
+    return [(start, min(total, start + shard_size)) for start in range(0, total, shard_size)]
+
+
+def _merge_shard_stats(results: list[dict[str, Any]]) -> dict[str, Any]:
+    """合并各分片的翻译统计：计数求和，去重率按合计值重算。"""
+
+    merged: dict[str, Any] = {"shards": len(results)}
+    for r in results:
+        for k, v in (r.get("stats") or {}).items():
+            if k == "dedup_ratio" or not isinstance(v, (int, float)):
+                continue
+            if k == "concurrency_limit":
+                merged[k] = max(int(merged.get(k, 0)), int(v))
+            else:
+                merged[k] = merged.get(k, 0) + v
+
+    parts_total = int(merged.get("parts_total", 0))
+    if parts_total > 0:
+        merged["dedup_ratio"] = round(1.0 - int(merged.get("parts_unique", 0)) / parts_total, 4)
+    return merged
+
+
+@celery_app.task(name="app.tasks.translate.translate_job_task")
+def translate_job_task(job_id: str) -> dict[str, str]:
+    """后台翻译任务入口。"""
+
+    # 重投递（acks_late）可能把已完成的任务再送来一次：直接跳过
+    with SessionLocal() as db:
+        job = db.get(TranslationJob, job_id)
+        if job and job.status == "succeeded":
+            return {"job_id": job_id, "status": "succeeded"}
+        # 分片已派发（chord 正在执行）：重投递的入口任务不能再派发一遍，否则每个分片翻译两次、进度重复累加
+        if job and job.status == "running" and job.shard_dispatch_id:
+            return {"job_id": job_id, "status": "sharded"}
+
+    # 1) 读取任务与文件元信息，准备翻译单元
+    job_ctx = _prepare_job(job_id)
+    if isinstance(job_ctx, dict):
+        return job_ctx
+
+    # 转存到临时文件的 ItemStore 在任务结束（含回填导出）后立即释放，不等 GC
+    with job_ctx.prepared:
+        return _translate_job(job_id, job_ctx)
+
+
+def _translate_job(job_id: str, job_ctx: _PreparedJob) -> dict[str, str]:
+    items = job_ctx.prepared.items
+
+    # 边界情况：所选字段没有可翻译的文本内容
+    # - 可能原因：字段下全是数字/时间戳/null，或字段路径不匹配
+    # - 处理方式：明确告知用户，让其调整字段选择后重试
+    if not items:
+        return _fail(
+            job_id,
+            "所选字段没有可翻译的文本内容。"
+            "可能原因：字段值为空/数字/时间戳，或字段路径不存在。"
+            "请检查字段选择后重新创建任务。",
+        )
+
+    # 2) 大任务：拆成分片投递给多个 worker（进度由各分片累加，含各自断点恢复的部分）
+    shard_size = int(getattr(settings, "TRANSLATION_SHARD_SIZE", 0) or 0)
+    if shard_size > 0 and len(items) > shard_size:
+        ranges = _shard_ranges(len(items), shard_size)
+        dispatch_id = str(uuid4())
+        with SessionLocal() as db:
+            # 原子地认领派发（派发标记同时作为 chord 的任务 id）：并发/重投递的入口任务只有一个能继续
+            claimed = db.execute(
+                update(TranslationJob)
+                .where(
+                    TranslationJob.id == job_id,
+                    or_(TranslationJob.shard_dispatch_id == "", TranslationJob.shard_dispatch_id.is_(None)),
+                )
+                .values(shard_dispatch_id=dispatch_id)
+            ).rowcount
+            db.commit()
+            if not claimed:
+                return {"job_id": job_id, "status": "sharded"}
+
+            job = db.get(TranslationJob, job_id)
+            if job:
+                job.status = "running"
+                job.error_message = ""
+                job.progress_total = len(items)
+                job.progress_done = 0
+                job.progress_failed = 0
+                job.stats = {}
+                job.result_path = ""
+                reset_live_progress(job_id)
+                db.commit()
+                publish_job_status(job)
+
+        chord(
+            translate_shard_task.s(job_id, idx, start, end, len(items), dispatch_id)
+            for idx, (start, end) in enumerate(ranges)
+        )(assemble_job_task.s(job_id, len(ranges), dispatch_id), task_id=dispatch_id)
+        return {"job_id": job_id, "status": "sharded", "shards": str(len(ranges))}
+
+    # 断点续跑：加载上次已完成的结果，只翻译缺失的单元
+    checkpoint = JobCheckpoint.for_job(job_id)
+    translations, remaining = _restore_checkpoint(checkpoint, items)
+    resumed = len(translations)
+
+    with SessionLocal() as db:
+        job = db.get(TranslationJob, job_id)
+        if job:
+            job.status = "running"
+            job.error_message = ""
+            job.progress_total = len(items)
+            job.progress_done = resumed
+            job.progress_failed = 0
+            job.stats = {}
+            job.result_path = ""
+            # 先初始化实时计数再提交 running 状态：查询接口看到 running 时计数已就绪
+            reset_live_progress(job_id, done=resumed)
+            db.commit()
+            publish_job_status(job)
+
+    # 3) 执行翻译（分批更新进度）
+    try:
+        translator = _build_translator()
+    except Exception as e:  # noqa: BLE001
+        return _fail(job_id, f"初始化翻译器失败: {str(e)[:200]}")
+
+    try:
+        _run_translation(
+            job_id,
+            translator,
+            remaining,
+            target_lang=job_ctx.target_lang,
+            client_id=job_ctx.client_id,
+            checkpoint=checkpoint,
+            translations=translations,
+        )
+    except _JobAborted:
+        # 任务已被标记为失败（保留原有的失败原因），已完成的部分仍在断点文件中
+        checkpoint.close()
+        return {"job_id": job_id, "status": "failed"}
+    except Exception as e:  # noqa: BLE001
+        # 已完成的部分保留在断点文件中，可通过 `/jobs/{job_id}/resume` 继续
+        checkpoint.close()
+        return _fail(job_id, f"翻译失败: {str(e)[:200]}")
+
+    # 翻译统计（例如去重率）；mock 翻译器没有该属性
+    stats = getattr(translator, "last_stats", None)
+    stats_dict: dict[str, Any] = stats.as_dict() if stats is not None else {}
+    if resumed:
+        stats_dict["resumed_items"] = resumed
+
+    # 4) 回填导出，写回任务完成状态
+    return _finish(job_id, job_ctx, translations, stats_dict, [checkpoint])
+
+
+def _shard_counted(job_id: str, dispatch_id: str, shard: int) -> int:
+    """该分片在本次派发中已计入任务进度的条数（首次执行时登记为 0）。"""
+
+    if not dispatch_id:
+        return 0
+    with SessionLocal() as db:
+        row = db.get(JobShardProgress, (dispatch_id, shard))
+        if row is not None:
+            return int(row.counted_done or 0)
+        db.add(JobShardProgress(dispatch_id=dispatch_id, shard=shard, job_id=job_id, counted_done=0))
+        try:
+            db.commit()
+        except IntegrityError:
+            # 同一分片的另一次投递刚登记过
+            db.rollback()
+            row = db.get(JobShardProgress, (dispatch_id, shard))
+            return int(row.counted_done or 0) if row is not None else 0
+        return 0
+
+
+@celery_app.task(name="app.tasks.translate.translate_shard_task")
+def translate_shard_task(
+    job_id: str, shard: int, start: int, end: int, expected_total: int, dispatch_id: str = ""
+) -> dict[str, Any]:
+    """翻译一个分片（items[start:end]），结果写入分片断点文件。
+
+    dispatch_id：所属派发的标记；任务被续跑（换了新标记）后本分片不再累加进度并提前退出。
+    """
+
+    job_ctx = _prepare_job(job_id)
+    if isinstance(job_ctx, dict):
+        return {"shard": shard, "status": job_ctx["status"]}
+
+    with job_ctx.prepared:
+        return _translate_shard(job_id, job_ctx, shard, start, end, expected_total, dispatch_id)
+
+
+def _translate_shard(
+    job_id: str, job_ctx: _PreparedJob, shard: int, start: int, end: int, expected_total: int, dispatch_id: str
+) -> dict[str, Any]:
+    items = job_ctx.prepared.items
+    if len(items) != expected_total:
+        _fail(job_id, "分片准备结果与任务不一致（源文件可能已变化），请重新创建任务", dispatch_id=dispatch_id)
+        return {"shard": shard, "status": "failed"}
+
+    # ItemStore 的切片是视图，不复制数据
+    checkpoint = JobCheckpoint.for_job(job_id, shard=shard)
+    translations, remaining = _restore_checkpoint(checkpoint, items[start:end])
+    resumed = len(translations)
+
+    # 断点恢复的部分也计入进度（入口任务把进度清零后由各分片累加）；
+    # 重投递时其中一部分已被前一次执行计入，只补计差额（断点先于进度落盘，差额不会为负）
+    counted = _shard_counted(job_id, dispatch_id, shard)
+    counter = ProgressCounter(job_id, client_id=job_ctx.client_id)
+    counter.add(max(0, resumed - counted))
+    if _flush_progress(counter, dispatch_id=dispatch_id, shard=shard) == "failed":
+        return {"shard": shard, "status": "failed"}
+
+    try:
+        translator = _build_translator()
+        _run_translation(
+            job_id,
+            translator,
+            remaining,
+            target_lang=job_ctx.target_lang,
+            client_id=job_ctx.client_id,
+            checkpoint=checkpoint,
+            translations=translations,
+            dispatch_id=dispatch_id,
+            shard=shard,
+        )
+    except _JobAborted:
+        checkpoint.close()
+        return {"shard": shard, "status": "failed"}
+    except Exception as e:  # noqa: BLE001
+        checkpoint.close()
+        _fail(job_id, f"翻译失败（分片 {shard}）: {str(e)[:200]}", dispatch_id=dispatch_id)
+        return {"shard": shard, "status": "failed"}
+
+    checkpoint.close()
+    stats = getattr(translator, "last_stats", None)
+    stats_dict: dict[str, Any] = stats.as_dict() if stats is not None else {}
+    if resumed:
+        stats_dict["resumed_items"] = resumed
+    return {"shard": shard, "status": "succeeded", "stats": stats_dict}
+
+
+@celery_app.task(name="app.tasks.translate.assemble_job_task")
+def assemble_job_task(results: list[dict[str, Any]], job_id: str, shards: int, dispatch_id: str = "") -> dict[str, str]:
+    """所有分片结束后：合并分片断点，回填导出。"""
+
+    if any(r.get("status") != "succeeded" for r in results):
+        # 失败原因已由分片写入任务
+        return {"job_id": job_id, "status": "failed"}
+
+    if dispatch_id:
+        with SessionLocal() as db:
+            job = db.get(TranslationJob, job_id)
+            if job is None or job.shard_dispatch_id != dispatch_id:
+                # 任务已被续跑（新的派发负责导出）：过期派发的汇总不能提前标记成功、删除新派发正在写的断点
+                return {"job_id": job_id, "status": "superseded"}
+
+    job_ctx = _prepare_job(job_id)
+    if isinstance(job_ctx, dict):
+        return job_ctx
+
+    with job_ctx.prepared:
+        checkpoints = [JobCheckpoint.for_job(job_id, shard=i) for i in range(shards)]
+        translations: dict[str, str] = {}
+        for cp in checkpoints:
+            translations.update(cp.load())
 
-    return {"job_id": job_id, "status": "succeeded", "mode": mode, "target_lang": target_lang}
+        missing = sum(1 for it in job_ctx.prepared.items if it.id not in translations)
+        if missing:
+            return _fail(job_id, f"分片结果缺失 {missing} 条，请续跑任务")
 
+        return _finish(job_id, job_ctx, translations, _merge_shard_stats(results), checkpoints)
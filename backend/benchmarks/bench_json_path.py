@@ -0,0 +1,79 @@
+"""JSON 字段路径选择性能对比：逐路径 `find_leaf_refs` vs 编译后的 `compile_selector`。
+
+用法（在 backend/ 目录下）：
+
+    python -m benchmarks.bench_json_path
+    python -m benchmarks.bench_json_path --records 50000 --fields 40
+
+数据模拟“字段很多的 JSONL”：每条记录有若干顶层字段、一个共享前缀的嵌套对象和一个对象列表，
+选中的路径大量共享前缀（例如 `detail.f0`、`detail.f1`、`items[].f0` ...）。
+"""
+
+from __future__ import annotations
+
+import argparse
+import json
+import sys
+import time
+from pathlib import Path
+from typing import Any, Callable
+
+# 允许直接 `python benchmarks/bench_json_path.py` 运行
+sys.path.insert(0, str(Path(__file__).resolve().parents[1]))
+
+from app.services.adapters.json_path import compile_selector, find_leaf_refs  # noqa: E402
+
+
+def _make_record(i: int, fields: int) -> dict[str, Any]:
+    return {
+        **{f"f{k}": f"value {i}-{k}" for k in range(fields)},
+        "detail": {f"f{k}": f"detail {i}-{k}" for k in range(fields)},
+        "items": [{f"f{k}": f"item {i}-{j}-{k}" for k in range(fields)} for j in range(3)],
+    }
+
+
+def _make_paths(fields: int) -> list[str]:
+    paths: list[str] = []
+    for k in range(fields):
+        paths += [f"f{k}", f"detail.f{k}", f"items[].f{k}"]
+    return paths
+
+
+def _bench(name: str, fn: Callable[[], int], repeat: int) -> float:
+    best = float("inf")
+    leaves = 0
+    for _ in range(repeat):
+        started = time.perf_counter()
+        leaves = fn()
+        best = min(best, time.perf_counter() - started)
+    print(f"{name:<28} {best * 1000:10.1f} ms  ({leaves} leaves)")
+    return best
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--records", type=int, default=20_000)
+    parser.add_argument("--fields", type=int, default=20)
+    parser.add_argument("--repeat", type=int, default=3)
+    args = parser.parse_args()
+
+    # 与 JsonlAdapter 一致：记录来自逐行 json.loads
+    lines = [json.dumps(_make_record(i, args.fields)) for i in range(args.records)]
+    records = [json.loads(line) for line in lines]
+    paths = _make_paths(args.fields)
+    print(f"records={args.records} paths={len(paths)}")
+
+    def _per_path() -> int:
+        return sum(len(find_leaf_refs(rec, p)) for rec in records for p in paths)
+
+    def _compiled() -> int:
+        selector = compile_selector(paths)
+        return sum(len(refs) for rec in records for refs in selector.find_all(rec))
+
+    baseline = _bench("find_leaf_refs (per path)", _per_path, args.repeat)
+    compiled = _bench("compile_selector (trie)", _compiled, args.repeat)
+    print(f"speedup: {baseline / compiled:.2f}x")
+
+
+if __name__ == "__main__":
+    main()
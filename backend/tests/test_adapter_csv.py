@@ -67,3 +67,35 @@ def test_csv_adapter_overwrite(tmp_path: Path) -> None:
     assert out_df.at[0, "col1"] == "ZH_hello"
     assert out_df.at[1, "col1"] == "ZH_world"
 
+
+
+def test_csv_adapter_streams_untranslated_rows(tmp_path: Path) -> None:
+    """CSV：只读取前 N 行；其余行（含引号内换行、数值）原样透传，新增列补空值。"""
+
+    in_path = tmp_path / "input.csv"
+    lines = ["col1,col2", "hello,1.50", '"multi\nline",2']
+    lines += [f"row{i},{i}" for i in range(1000)]
+    in_path.write_text("\n".join(lines) + "\n", encoding="utf-8")
+
+    adapter = CsvAdapter()
+    prepared = adapter.prepare(
+        file_path=in_path,
+        selected_fields=["col1"],
+        row_limit=2,
+        mode="add_columns",
+        target_lang="zh-CN",
+        export_dir=tmp_path,
+        job_id="job3",
+    )
+
+    assert [it.text for it in prepared.items] == ["hello", "multi\nline"]
+
+    out_path = prepared.apply({it.id: f"ZH_{it.text}" for it in prepared.items})
+    out_df = pd.read_csv(out_path, encoding="utf-8-sig", keep_default_na=False, dtype=str)
+
+    assert out_df.columns.tolist() == ["col1", "col2", "col1_zh"]
+    assert len(out_df) == 1002
+    assert out_df.at[0, "col2"] == "1.50"
+    assert out_df.at[1, "col1_zh"] == "ZH_multi\nline"
+    assert out_df.at[1001, "col1"] == "row999"
+    assert out_df.at[1001, "col1_zh"] == ""
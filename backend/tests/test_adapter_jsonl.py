@@ -45,3 +45,37 @@ def test_jsonl_adapter_add_columns_preserve_blank_lines(tmp_path: Path) -> None:
     assert obj2["text"] == "World"
     assert "text_zh" not in obj2  # row_limit=1，不应翻译第二个对象
 
+
+
+def test_jsonl_adapter_copies_unchanged_lines_verbatim(tmp_path: Path) -> None:
+    """JSONL：没有被回填的行（含 row_limit 之外的行）按原始字节输出，不重新序列化。"""
+
+    in_path = tmp_path / "input.jsonl"
+    raw = (
+        b'{"text": "Hello",   "n": 1}\r\n'
+        b'{"other": "no selected field"}\n'
+        b'{"text":"World"}\n'
+        b'{"text": "Beyond"  }'
+    )
+    in_path.write_bytes(raw)
+
+    prepared = JsonlAdapter().prepare(
+        file_path=in_path,
+        selected_fields=["text"],
+        row_limit=2,
+        mode="overwrite",
+        target_lang="zh-CN",
+        export_dir=tmp_path,
+        job_id="job2",
+    )
+
+    assert [it.text for it in prepared.items] == ["Hello"]
+    out_path = prepared.apply({prepared.items[0].id: "你好"})
+
+    out = out_path.read_bytes()
+    assert out == (
+        '{"text": "你好", "n": 1}\r\n'.encode("utf-8")
+        + b'{"other": "no selected field"}\n'
+        + b'{"text":"World"}\n'
+        + b'{"text": "Beyond"  }'
+    )
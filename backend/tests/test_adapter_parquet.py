@@ -0,0 +1,95 @@
+from __future__ import annotations
+
+from pathlib import Path
+
+import pyarrow as pa
+import pyarrow.parquet as pq
+
+from app.services.adapters.detect import detect_format
+from app.services.adapters.parquet_adapter import ParquetAdapter
+from app.services.adapters.preview import preview_and_candidates
+
+
+def _write_sample(path: Path) -> None:
+    """3 个行组（每组 4 行）：文本列、字典编码文本列、整数列。"""
+
+    table = pa.table(
+        {
+            "text": [f"t{i}" if i != 1 else None for i in range(12)],
+            "tag": pa.array([f"g{i % 2}" for i in range(12)]).dictionary_encode(),
+            "n": list(range(12)),
+        }
+    )
+    pq.write_table(table, path, row_group_size=4)
+
+
+def test_parquet_detect_and_preview(tmp_path: Path) -> None:
+    in_path = tmp_path / "input.parquet"
+    _write_sample(in_path)
+
+    assert detect_format(filename="input.parquet", content_type="").name == "parquet"
+    assert detect_format(filename="blob", content_type="application/vnd.apache.parquet").name == "parquet"
+
+    preview, candidates = preview_and_candidates(file_path=in_path, detected_format="parquet", limit=3)
+    # 只有字符串列是字段候选
+    assert candidates == ["text", "tag"]
+    assert preview.columns == ["text", "tag", "n"]
+    assert preview.rows == [
+        {"text": "t0", "tag": "g0", "n": 0},
+        {"text": None, "tag": "g1", "n": 1},
+        {"text": "t2", "tag": "g0", "n": 2},
+    ]
+
+
+def test_parquet_adapter_add_columns_keeps_row_groups_and_types(tmp_path: Path) -> None:
+    """Parquet：add_columns 只翻译前 N 行的选中文本列，其余行组透传且新增列补 null。"""
+
+    in_path = tmp_path / "input.parquet"
+    _write_sample(in_path)
+
+    prepared = ParquetAdapter().prepare(
+        file_path=in_path,
+        # 非文本列会被忽略
+        selected_fields=["text", "n"],
+        row_limit=6,
+        mode="add_columns",
+        target_lang="zh-CN",
+        export_dir=tmp_path,
+        job_id="job1",
+    )
+    # 第 1 行为 null，不产生翻译单元
+    assert [it.text for it in prepared.items] == ["t0", "t2", "t3", "t4", "t5"]
+
+    out_path = prepared.apply({it.id: f"ZH_{it.text}" for it in prepared.items if it.text != "t3"})
+    out = pq.ParquetFile(out_path)
+
+    assert out.num_row_groups == 3
+    assert out.schema_arrow.field("n").type == pa.int64()
+    assert out.schema_arrow.field("text_zh").type == pa.string()
+
+    table = out.read()
+    assert table.column("n").to_pylist() == list(range(12))
+    assert table.column("text").to_pylist() == [f"t{i}" if i != 1 else None for i in range(12)]
+    # 前 6 行内：缺失译文写空字符串；之后：null
+    assert table.column("text_zh").to_pylist() == ["ZH_t0", "", "ZH_t2", "", "ZH_t4", "ZH_t5"] + [None] * 6
+
+
+def test_parquet_adapter_overwrite_dictionary_column(tmp_path: Path) -> None:
+    in_path = tmp_path / "input.parquet"
+    _write_sample(in_path)
+
+    prepared = ParquetAdapter().prepare(
+        file_path=in_path,
+        selected_fields=["tag"],
+        row_limit=3,
+        mode="overwrite",
+        target_lang="zh-CN",
+        export_dir=tmp_path,
+        job_id="job2",
+    )
+    out_path = prepared.apply({it.id: f"ZH_{it.text}" for it in prepared.items})
+
+    table = pq.read_table(out_path)
+    assert table.schema.field("tag").type == pa.string()
+    assert table.column("tag").to_pylist() == ["ZH_g0", "ZH_g1", "ZH_g0"] + [f"g{i % 2}" for i in range(3, 12)]
+    assert table.column("text").to_pylist()[:3] == ["t0", None, "t2"]
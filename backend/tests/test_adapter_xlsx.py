@@ -42,3 +42,59 @@ def test_xlsx_adapter_add_columns(tmp_path: Path) -> None:
     # 第二行未翻译：一般会是 NaN（Excel 空单元格）
     assert pd.isna(out_df.at[1, "col1_zh"])
 
+
+
+def test_xlsx_adapter_streams_all_sheets(tmp_path: Path) -> None:
+    """XLSX：所有工作表都会处理；前 N 行之外的行原样透传。"""
+
+    in_path = tmp_path / "multi.xlsx"
+    with pd.ExcelWriter(in_path, engine="openpyxl") as writer:
+        pd.DataFrame({"col1": ["a0", "a1", "a2"], "n": [1, 2, 3]}).to_excel(writer, sheet_name="first", index=False)
+        pd.DataFrame({"other": ["x"], "col1": ["b0"]}).to_excel(writer, sheet_name="second", index=False)
+
+    adapter = XlsxAdapter()
+    prepared = adapter.prepare(
+        file_path=in_path,
+        selected_fields=["col1"],
+        row_limit=2,
+        mode="add_columns",
+        target_lang="zh-CN",
+        export_dir=tmp_path,
+        job_id="job2",
+    )
+
+    assert sorted(it.text for it in prepared.items) == ["a0", "a1", "b0"]
+    assert len({it.id for it in prepared.items}) == 3
+
+    out_path = prepared.apply({it.id: f"ZH_{it.text}" for it in prepared.items})
+    sheets = pd.read_excel(out_path, sheet_name=None, engine="openpyxl")
+
+    assert list(sheets) == ["first", "second"]
+    first = sheets["first"]
+    assert first.columns.tolist() == ["col1", "n", "col1_zh"]
+    assert first["col1_zh"].tolist()[:2] == ["ZH_a0", "ZH_a1"]
+    assert pd.isna(first.at[2, "col1_zh"])
+    assert first["n"].tolist() == [1, 2, 3]
+    assert sheets["second"].to_dict(orient="records") == [{"other": "x", "col1": "b0", "col1_zh": "ZH_b0"}]
+
+
+def test_xlsx_adapter_reads_file_without_suffix(tmp_path: Path) -> None:
+    """内容寻址存储的文件名不带后缀：适配器按内容读取，不依赖 `.xlsx` 扩展名。"""
+
+    in_path = tmp_path / "0123abcd"
+    with pd.ExcelWriter(in_path, engine="openpyxl") as writer:
+        pd.DataFrame({"col1": ["Hello"]}).to_excel(writer, index=False)
+
+    prepared = XlsxAdapter().prepare(
+        file_path=in_path,
+        selected_fields=["col1"],
+        row_limit=1,
+        mode="overwrite",
+        target_lang="zh-CN",
+        export_dir=tmp_path / "exports",
+        job_id="job3",
+    )
+    (item,) = list(prepared.items)
+    out_path = prepared.apply({item.id: "你好"})
+    assert out_path.suffix == ".xlsx"
+    assert pd.read_excel(out_path, engine="openpyxl").at[0, "col1"] == "你好"
@@ -49,3 +49,316 @@ def test_translate_items_stream_handles_empty_text():
 
     assert out == {"x": ""}
 
+
+
+def _make_multi_cell_translator(**overrides):  # noqa: ANN003,ANN202
+    kwargs = dict(
+        api_key="dummy",
+        base_url="https://example.com",
+        model="dummy",
+        rpm=10_000,
+        disable_thinking=True,
+        max_cell_chars=10_000,
+        request_timeout_seconds=1.0,
+        enable_redis_cache=False,
+        multi_cell_max_items=3,
+        multi_cell_max_chars=1000,
+        multi_cell_item_max_chars=20,
+    )
+    kwargs.update(overrides)
+    return ArkBatchTranslator(**kwargs)
+
+
+def test_translate_items_stream_packs_short_cells(monkeypatch):
+    """验证：短文本按 max_items 打包成多单元请求，并按编号拆回各 item。"""
+
+    translator = _make_multi_cell_translator()
+    calls: list[str] = []
+
+    def _fake_chat_completion(system_prompt: str, user_content: str) -> str:  # noqa: ARG001
+        calls.append(user_content)
+        out = []
+        for line in user_content.splitlines():
+            marker, text = line.split(" ", 1)
+            out.append(f"{marker} ZH_{text}")
+        return "\n".join(out)
+
+    def _fail_single(text: str, *, target_lang: str) -> str:  # noqa: ARG001
+        raise AssertionError("短文本不应逐条翻译")
+
+    monkeypatch.setattr(translator, "_chat_completion", _fake_chat_completion)
+    monkeypatch.setattr(translator, "_translate_single_text", _fail_single)
+
+    items = [TranslateItem(id=f"i{i}", text=f"label {i}") for i in range(5)]
+    out = dict(translator.translate_items_stream(items, target_lang="zh"))
+
+    assert out == {f"i{i}": f"ZH_label {i}" for i in range(5)}
+    # 5 条短文本，每批最多 3 条 -> 2 次模型调用
+    assert len(calls) == 2
+
+
+def test_translate_items_stream_multi_cell_parse_failure_falls_back(monkeypatch):
+    """验证：多单元输出不符合协议时，整批回退为逐条翻译；长/多行文本不参与合并。"""
+
+    translator = _make_multi_cell_translator()
+
+    def _bad_chat_completion(system_prompt: str, user_content: str) -> str:  # noqa: ARG001
+        # 少一行：协议不匹配
+        return "[1] 只有一行"
+
+    singles: list[str] = []
+
+    def _fake_single(text: str, *, target_lang: str) -> str:  # noqa: ARG001
+        singles.append(text)
+        return f"<{text}>"
+
+    monkeypatch.setattr(translator, "_chat_completion", _bad_chat_completion)
+    monkeypatch.setattr(translator, "_translate_single_text", _fake_single)
+
+    items = [
+        TranslateItem(id="a", text="open"),
+        TranslateItem(id="b", text="closed"),
+        TranslateItem(id="c", text="line1\nline2"),
+    ]
+    out = dict(translator.translate_items_stream(items, target_lang="zh"))
+
+    assert out == {"a": "<open>", "b": "<closed>", "c": "<line1\nline2>"}
+    assert sorted(singles) == ["closed", "line1\nline2", "open"]
+
+
+def test_parse_multi_cell_output_rejects_mismatch():
+    """验证：编号重复/缺失/多余内容都会被判定为解析失败。"""
+
+    parse = ArkBatchTranslator._parse_multi_cell_output
+    assert parse("[1] 甲\n\n[2] 乙", expected=2) == ["甲", "乙"]
+    assert parse("[1] 甲\n[1] 乙", expected=2) is None
+    assert parse("[1] 甲", expected=2) is None
+    assert parse("翻译如下：\n[1] 甲\n[2] 乙", expected=2) is None
+
+
+def test_translate_items_stream_dedups_identical_texts(monkeypatch):
+    """验证：任务内相同文本只翻译一次，结果扇出到所有 item，并统计去重率。"""
+
+    translator = _make_multi_cell_translator(multi_cell_max_items=1, max_cell_chars=3)
+    calls: list[str] = []
+
+    def _fake_single(text: str, *, target_lang: str) -> str:  # noqa: ARG001
+        calls.append(text)
+        return f"<{text}>"
+
+    monkeypatch.setattr(translator, "_translate_single_text", _fake_single)
+
+    items = [
+        TranslateItem(id="a", text="done"),
+        TranslateItem(id="b", text="done"),
+        TranslateItem(id="c", text="abcdone"),  # 切分为 ["abc", "don", "e"]，后两段与 "done" 的切分结果重复
+        TranslateItem(id="d", text="abc"),
+    ]
+    out = dict(translator.translate_items_stream(items, target_lang="zh"))
+
+    assert out == {
+        "a": "<don><e>",
+        "b": "<don><e>",
+        "c": "<abc><don><e>",
+        "d": "<abc>",
+    }
+    assert sorted(calls) == ["abc", "don", "e"]
+    assert translator.last_stats.parts_total == 8
+    assert translator.last_stats.parts_unique == 3
+
+
+
+def test_translate_items_stream_pulls_generator_lazily(monkeypatch):
+    """验证：items 可以是生成器，按窗口惰性拉取；窗口之外的重复文本通过备忘录复用。"""
+
+    from app.core.config import settings
+
+    monkeypatch.setattr(settings, "TRANSLATION_STREAM_WINDOW", 2)
+    translator = _make_multi_cell_translator(multi_cell_max_items=1)
+    calls: list[str] = []
+
+    def _fake_single(text: str, *, target_lang: str) -> str:  # noqa: ARG001
+        calls.append(text)
+        return f"<{text}>"
+
+    monkeypatch.setattr(translator, "_translate_single_text", _fake_single)
+
+    pulled: list[int] = []
+
+    def _gen():  # noqa: ANN202
+        for i in range(100):
+            pulled.append(i)
+            yield TranslateItem(id=str(i), text=f"t{i % 5}")
+
+    stream = translator.translate_items_stream(_gen(), target_lang="zh")
+    first = next(stream)
+
+    # 产出第一条结果时只拉取了窗口大小的 items，而不是整个生成器
+    assert first[1] == f"<t{first[0]}>"
+    assert len(pulled) <= 3
+
+    out = dict([first, *stream])
+    assert len(out) == 100
+    assert out["99"] == "<t4>"
+    assert sorted(calls) == ["t0", "t1", "t2", "t3", "t4"]
+    assert translator.last_stats.parts_total == 100
+    assert translator.last_stats.parts_unique == 5
+
+
+def test_translate_items_stream_window_counts_repeated_text(monkeypatch):
+    """验证：同一文本反复出现时，重复项同样占窗口，不会在第一条结果产出前把整个输入读进内存。"""
+
+    from app.core.config import settings
+
+    monkeypatch.setattr(settings, "TRANSLATION_STREAM_WINDOW", 8)
+    translator = _make_multi_cell_translator(multi_cell_max_items=1)
+    monkeypatch.setattr(translator, "_translate_single_text", lambda text, *, target_lang: f"<{text}>")
+
+    pulled = 0
+
+    def _gen():  # noqa: ANN202
+        nonlocal pulled
+        for i in range(10_000):
+            pulled += 1
+            yield TranslateItem(id=str(i), text="same")
+
+    stream = translator.translate_items_stream(_gen(), target_lang="zh")
+    assert next(stream)[1] == "<same>"
+    assert pulled <= 9
+
+    assert sum(1 for _ in stream) == 9_999
+    assert translator.last_stats.parts_unique == 1
+
+
+def test_translate_items_stream_reports_l1_and_memo_stats(monkeypatch):
+    """验证：L1 缓存与去重备忘录的命中/淘汰计数回写到 stats（只计本次调用的增量）。"""
+
+    from app.core.config import settings
+    from app.services.translator.ark_translator import RedisTranslationCache
+    from app.services.translator.memory_cache import LruTranslationCache
+
+    monkeypatch.setattr(settings, "TRANSLATION_STREAM_WINDOW", 1)
+    monkeypatch.setattr(settings, "TRANSLATION_DEDUP_MEMO_ENTRIES", 1)
+    monkeypatch.setattr(settings, "TRANSLATION_CACHE_WRITE_BATCH_SIZE", 1)
+    translator = _make_multi_cell_translator(multi_cell_max_items=1)
+    monkeypatch.setattr(translator, "_translate_single_text", lambda text, *, target_lang: f"<{text}>")
+
+    l1 = LruTranslationCache(max_entries=2, max_bytes=1 << 20)
+    cache = RedisTranslationCache("redis://unused", l1=l1)
+    monkeypatch.setattr(cache, "_get_client", lambda: None)  # Redis 不可用：只走 L1
+    cache.set_many(model=translator.model, target_lang="zh", pairs=[("cached", "已缓存")])
+    l1.get("别的任务留下的计数")
+    translator._cache = cache  # noqa: SLF001
+
+    items = [TranslateItem(id=str(i), text=t) for i, t in enumerate(["cached", "a", "b", "a", "a"])]
+    out = dict(translator.translate_items_stream(items, target_lang="zh"))
+    assert out == {"0": "已缓存", "1": "<a>", "2": "<b>", "3": "<a>", "4": "<a>"}
+
+    stats = translator.last_stats.as_dict()
+    # cached 与第二个 a 命中 L1；a、b 未命中；写入 b 时 L1（容量 2）淘汰 cached
+    assert (stats["l1_hits"], stats["l1_misses"], stats["l1_evictions"]) == (2, 2, 1)
+    # 备忘录容量 1：第二个 a 已被 b 挤掉，只有紧接着的第三个 a 命中
+    assert stats["memo_hits"] == 1
+    assert stats["memo_evictions"] == 3
+
+
+class _FakeBulkCache:
+    """只实现批量接口的内存缓存，用于验证翻译器的“预查 + 批量写回”流程。"""
+
+    def __init__(self, data: dict[str, str]) -> None:
+        self.data = dict(data)
+        self.get_many_calls = 0
+        self.set_many_calls: list[int] = []
+
+    def get_many(self, *, model: str, target_lang: str, texts: list[str]) -> dict[str, str]:  # noqa: ARG002
+        self.get_many_calls += 1
+        return {t: self.data[t] for t in texts if t in self.data}
+
+    def set_many(self, *, model: str, target_lang: str, pairs: list[tuple[str, str]]) -> None:  # noqa: ARG002
+        self.set_many_calls.append(len(pairs))
+        self.data.update(pairs)
+
+
+def test_translate_items_stream_bulk_cache_prepass(monkeypatch):
+    """验证：缓存命中在任何模型调用前产出；未命中结果批量写回缓存。"""
+
+    translator = _make_multi_cell_translator(multi_cell_max_items=1)
+    cache = _FakeBulkCache({"cached": "已缓存"})
+    translator._cache = cache  # noqa: SLF001
+
+    calls: list[str] = []
+
+    def _fake_single(text: str, *, target_lang: str) -> str:  # noqa: ARG001
+        calls.append(text)
+        return f"<{text}>"
+
+    monkeypatch.setattr(translator, "_translate_single_text", _fake_single)
+
+    items = [
+        TranslateItem(id="a", text="fresh"),
+        TranslateItem(id="b", text="cached"),
+        TranslateItem(id="c", text="cached"),
+    ]
+    stream = translator.translate_items_stream(items, target_lang="zh")
+
+    # 前两个结果来自缓存，此时尚未发起任何模型调用
+    first_two = [next(stream), next(stream)]
+    assert first_two == [("b", "已缓存"), ("c", "已缓存")]
+    assert calls == []
+
+    rest = dict(stream)
+    assert rest == {"a": "<fresh>"}
+    assert calls == ["fresh"]
+    assert cache.get_many_calls == 1
+    assert cache.set_many_calls == [1]
+    assert cache.data["fresh"] == "<fresh>"
+    assert translator.last_stats.cache_hits == 1
+
+
+def test_chat_completion_retries_rate_limit_and_reports_overload(monkeypatch):
+    """验证：429 会被重试（而不是当作 4xx 直接抛出），并让自适应并发下调。"""
+
+    from openai import RateLimitError
+
+    import app.services.translator.ark_translator as ark_mod
+
+    translator = _make_multi_cell_translator(
+        adaptive_concurrency=True,
+        min_concurrency=1,
+        initial_concurrency=8,
+    )
+    monkeypatch.setattr(ark_mod.time, "sleep", lambda _s: None)
+
+    calls = {"n": 0}
+
+    class _Completions:
+        def create(self, **_kwargs):  # noqa: ANN003,ANN202
+            calls["n"] += 1
+            if calls["n"] == 1:
+                # 不依赖具体 HTTP 库构造 response：只需要异常类型与 status_code
+                err = RateLimitError.__new__(RateLimitError)
+                Exception.__init__(err, "slow down")
+                err.status_code = 429
+                raise err
+
+            class _Msg:
+                content = "你好"
+
+            class _Choice:
+                message = _Msg()
+
+            class _Resp:
+                choices = [_Choice()]
+
+            return _Resp()
+
+    class _Client:
+        class chat:  # noqa: N801
+            completions = _Completions()
+
+    monkeypatch.setattr(translator, "_get_client", lambda: _Client())
+
+    assert translator._chat_completion("sys", "hello") == "你好"  # noqa: SLF001
+    assert calls["n"] == 2
+    assert translator._concurrency.overloads == 1  # noqa: SLF001
+    assert translator._concurrency.limit == 4  # noqa: SLF001
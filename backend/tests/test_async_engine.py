@@ -0,0 +1,124 @@
+from __future__ import annotations
+
+import asyncio
+
+from app.services.translator.ark_translator import TranslateItem
+from app.services.translator.async_engine import AsyncArkTranslator
+
+
+def _make_translator(**overrides) -> AsyncArkTranslator:  # noqa: ANN003
+    kwargs = dict(
+        api_key="dummy",
+        base_url="https://example.com",
+        model="dummy",
+        rpm=100_000,
+        disable_thinking=True,
+        max_cell_chars=3,
+        request_timeout_seconds=1.0,
+        enable_redis_cache=False,
+        multi_cell_max_items=1,
+        max_concurrency=50,
+    )
+    kwargs.update(overrides)
+    return AsyncArkTranslator(**kwargs)
+
+
+def test_async_engine_stream_matches_thread_engine_contract(monkeypatch) -> None:
+    """asyncio 引擎：长文本切分合并、去重、空白文本处理与线程池引擎一致。"""
+
+    translator = _make_translator()
+    calls: list[str] = []
+
+    async def _fake_achat(system_prompt: str, user_content: str) -> str:  # noqa: ARG001
+        calls.append(user_content)
+        await asyncio.sleep(0)
+        return f"<{user_content}>"
+
+    monkeypatch.setattr(translator, "_achat_completion", _fake_achat)
+
+    items = [
+        TranslateItem(id="x", text="abcdef"),
+        TranslateItem(id="y", text="abc"),
+        TranslateItem(id="z", text="  "),
+    ]
+    out = dict(translator.translate_items_stream(items, target_lang="zh"))
+
+    assert out == {"x": "<abc><def>", "y": "<abc>", "z": ""}
+    assert sorted(calls) == ["abc", "def"]
+
+
+def test_async_engine_multi_cell_and_adaptive_gate(monkeypatch) -> None:
+    """asyncio 引擎：短文本合并请求 + 自适应并发闸门可用，名额全部归还。"""
+
+    translator = _make_translator(
+        max_cell_chars=10_000,
+        multi_cell_max_items=2,
+        adaptive_concurrency=True,
+        min_concurrency=1,
+        initial_concurrency=1,
+    )
+    inflight = {"now": 0, "max": 0}
+
+    async def _fake_request(**kwargs):  # noqa: ANN003,ANN202
+        inflight["now"] += 1
+        inflight["max"] = max(inflight["max"], inflight["now"])
+        await asyncio.sleep(0.01)
+        inflight["now"] -= 1
+        content = kwargs["messages"][1]["content"]
+
+        class _Msg:
+            pass
+
+        msg = _Msg()
+        msg.content = "\n".join(f"{line.split(' ', 1)[0]} ZH" for line in content.splitlines())
+
+        class _Resp:
+            choices = [type("C", (), {"message": msg})()]
+
+        return _Resp()
+
+    async def _open_with_fake_client(self=translator) -> None:  # noqa: ANN001
+        await AsyncArkTranslator._open(self)  # noqa: SLF001
+        self._aclient.chat.completions.create = _fake_request  # type: ignore[method-assign]
+
+    monkeypatch.setattr(translator, "_open", _open_with_fake_client)
+
+    items = [TranslateItem(id=f"i{i}", text=f"w{i}") for i in range(6)]
+    out = dict(translator.translate_items_stream(items, target_lang="zh"))
+
+    assert out == {f"i{i}": "ZH" for i in range(6)}
+    # 初始 limit=1 且慢启动每次 +1：并发会被闸门限制住，且结束后没有泄漏名额
+    assert inflight["max"] <= 2
+    assert translator._concurrency.inflight == 0  # noqa: SLF001
+
+
+def test_async_engine_rate_reservation_does_not_block_event_loop() -> None:
+    """限流预约（Redis 往返）在线程池中执行：等待期间事件循环仍在调度其他协程。"""
+
+    import time
+
+    translator = _make_translator()
+
+    class _SlowLimiter:
+        def reserve(self, tokens: int = 0) -> float:  # noqa: ARG002
+            time.sleep(0.2)
+            return 0.0
+
+    translator._limiter = _SlowLimiter()  # type: ignore[assignment]
+
+    async def _run() -> int:
+        ticks = 0
+
+        async def _ticker() -> None:
+            nonlocal ticks
+            while True:
+                await asyncio.sleep(0.01)
+                ticks += 1
+
+        ticker = asyncio.ensure_future(_ticker())
+        await translator._areserve(1)
+        ticker.cancel()
+        return ticks
+
+    # 预约耗时 0.2s：期间其他协程应被调度多次（同步调用时为 0）
+    assert asyncio.run(_run()) >= 5
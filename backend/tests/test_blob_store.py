@@ -0,0 +1,343 @@
+from __future__ import annotations
+
+"""上传内容去重（内容寻址存储）测试。"""
+
+import os
+from pathlib import Path
+
+import pytest
+from fastapi.testclient import TestClient
+from sqlalchemy import create_engine, select
+from sqlalchemy.orm import sessionmaker
+
+import app.api.endpoints.files as files_ep
+from app.core.config import settings
+from app.db import init_db as init_db_mod
+from app.db import session as session_mod
+from app.main import app
+from app.models.stored_blob import StoredBlob
+from app.models.uploaded_file import UploadedFile
+
+
+@pytest.fixture()
+def isolated_runtime(monkeypatch: pytest.MonkeyPatch, tmp_path: Path) -> sessionmaker:
+    """隔离 DB 与文件存储目录，避免污染本地开发数据。"""
+
+    storage_dir = tmp_path / "storage"
+    monkeypatch.setattr(settings, "STORAGE_DIR", storage_dir)
+    monkeypatch.setattr(settings, "UPLOADS_DIR", storage_dir / "uploads")
+    monkeypatch.setattr(settings, "EXPORTS_DIR", storage_dir / "exports")
+
+    db_url = f"sqlite:///{(tmp_path / 'test.db').as_posix()}"
+    engine = create_engine(db_url, connect_args={"check_same_thread": False}, future=True, echo=False)
+    SessionLocal = sessionmaker(bind=engine, autoflush=False, autocommit=False, expire_on_commit=False)
+
+    monkeypatch.setattr(session_mod, "engine", engine)
+    monkeypatch.setattr(session_mod, "SessionLocal", SessionLocal)
+    monkeypatch.setattr(init_db_mod, "engine", engine)
+
+    init_db_mod.init_db()
+    return SessionLocal
+
+
+def test_identical_uploads_share_one_blob_and_cached_preview(
+    isolated_runtime: sessionmaker, monkeypatch: pytest.MonkeyPatch
+) -> None:
+    calls: list[str] = []
+    real_preview = files_ep.run_preview
+
+    async def _counting_preview(**kwargs):  # noqa: ANN003,ANN202
+        calls.append(kwargs["detected_format"])
+        return await real_preview(**kwargs)
+
+    monkeypatch.setattr(files_ep, "run_preview", _counting_preview)
+
+    content = b'[{"a": "hello", "b": 1}]'
+    client_a, client_b = TestClient(app), TestClient(app)
+    try:
+        r1 = client_a.post("/api/v1/files/upload", files={"file": ("one.json", content, "application/json")})
+        r2 = client_b.post("/api/v1/files/upload", files={"file": ("two.json", content, "application/json")})
+    finally:
+        client_a.close()
+        client_b.close()
+
+    assert r1.status_code == 200 and r2.status_code == 200
+    # 第二次上传命中预览缓存：结果一致且没有重新解析
+    assert calls == ["json"]
+    assert r2.json()["field_candidates"] == r1.json()["field_candidates"] == ["a", "b"]
+    assert r2.json()["preview"] == r1.json()["preview"]
+
+    with isolated_runtime() as db:
+        uploads = db.execute(select(UploadedFile)).scalars().all()
+        blobs = db.execute(select(StoredBlob)).scalars().all()
+
+    assert len(uploads) == 2 and len({u.id for u in uploads}) == 2
+    assert len(blobs) == 1 and blobs[0].ref_count == 2
+    assert {u.storage_path for u in uploads} == {blobs[0].storage_path}
+    assert {u.sha256 for u in uploads} == {blobs[0].sha256}
+    # 磁盘上只有一份内容（临时文件已清理）
+    assert [p.name for p in Path(settings.UPLOADS_DIR).iterdir()] == [blobs[0].sha256]
+
+
+def test_unparseable_upload_releases_blob(isolated_runtime: sessionmaker) -> None:
+    client = TestClient(app)
+    try:
+        r = client.post("/api/v1/files/upload", files={"file": ("bad.json", b'{"a": ', "application/json")})
+    finally:
+        client.close()
+
+    assert r.status_code == 400
+    with isolated_runtime() as db:
+        assert db.execute(select(StoredBlob)).scalars().all() == []
+    assert list(Path(settings.UPLOADS_DIR).iterdir()) == []
+
+
+def test_chunked_upload_resumes_and_completes(isolated_runtime: sessionmaker, monkeypatch: pytest.MonkeyPatch) -> None:
+    monkeypatch.setattr(settings, "UPLOAD_CHUNK_BYTES", 8)
+    content = b'[{"a": "hello"}, {"a": "world"}]'
+
+    client = TestClient(app)
+    try:
+        r = client.post("/api/v1/files/uploads", json={"filename": "big.json", "size_bytes": len(content)})
+        assert r.status_code == 200
+        upload_id = r.json()["upload_id"]
+        assert r.json()["chunk_size"] == 8
+
+        assert client.put(f"/api/v1/files/uploads/{upload_id}?offset=0", content=content[:8]).status_code == 200
+        # 偏移不连续 / 分片过大 / 未传完就 complete：都被拒绝，进度不变
+        assert client.put(f"/api/v1/files/uploads/{upload_id}?offset=0", content=content[:8]).status_code == 409
+        assert client.put(f"/api/v1/files/uploads/{upload_id}?offset=8", content=content[8:20]).status_code == 413
+        assert client.post(f"/api/v1/files/uploads/{upload_id}/complete").status_code == 400
+
+        # “断线”后查询进度，从已接收的偏移继续
+        offset = client.get(f"/api/v1/files/uploads/{upload_id}").json()["received_bytes"]
+        assert offset == 8
+        while offset < len(content):
+            r = client.put(f"/api/v1/files/uploads/{upload_id}?offset={offset}", content=content[offset : offset + 8])
+            assert r.status_code == 200
+            offset = r.json()["received_bytes"]
+
+        r = client.post(f"/api/v1/files/uploads/{upload_id}/complete")
+        assert r.status_code == 200
+        assert r.json()["detected_format"] == "json"
+        assert r.json()["field_candidates"] == ["a"]
+
+        # 会话已结束
+        assert client.get(f"/api/v1/files/uploads/{upload_id}").status_code == 404
+    finally:
+        client.close()
+
+    # 分片文件被原地改名为内容寻址的正式文件
+    with isolated_runtime() as db:
+        (blob,) = db.execute(select(StoredBlob)).scalars().all()
+    assert Path(blob.storage_path).read_bytes() == content
+    assert list((Path(settings.UPLOADS_DIR) / ".partial").iterdir()) == []
+
+
+def test_complete_keeps_session_when_preview_pool_busy(
+    isolated_runtime: sessionmaker, monkeypatch: pytest.MonkeyPatch
+) -> None:
+    """解析繁忙（503）时会话与分片文件都保留，按 Retry-After 重试 complete 即可完成。"""
+
+    from app.services.preview_pool import PreviewPoolBusy
+
+    real_preview = files_ep.run_preview
+    busy = [True]
+
+    async def _busy_once(**kwargs):  # noqa: ANN003,ANN202
+        if busy:
+            busy.clear()
+            raise PreviewPoolBusy("解析任务繁忙，请稍后重试")
+        return await real_preview(**kwargs)
+
+    monkeypatch.setattr(files_ep, "run_preview", _busy_once)
+    content = b'[{"a": "hello"}]'
+
+    client = TestClient(app)
+    try:
+        upload_id = client.post("/api/v1/files/uploads", json={"filename": "x.json", "size_bytes": len(content)}).json()[
+            "upload_id"
+        ]
+        assert client.put(f"/api/v1/files/uploads/{upload_id}?offset=0", content=content).status_code == 200
+
+        r = client.post(f"/api/v1/files/uploads/{upload_id}/complete")
+        assert r.status_code == 503
+        assert r.headers["retry-after"] == "5"
+        assert client.get(f"/api/v1/files/uploads/{upload_id}").json()["received_bytes"] == len(content)
+        with isolated_runtime() as db:
+            assert db.execute(select(StoredBlob)).scalars().all() == []
+
+        r = client.post(f"/api/v1/files/uploads/{upload_id}/complete")
+        assert r.status_code == 200
+        assert r.json()["field_candidates"] == ["a"]
+        assert client.get(f"/api/v1/files/uploads/{upload_id}").status_code == 404
+    finally:
+        client.close()
+
+    assert list((Path(settings.UPLOADS_DIR) / ".partial").iterdir()) == []
+
+
+def test_chunk_writes_are_serialized_per_session(isolated_runtime: sessionmaker) -> None:
+    """另一个请求正在写同一会话时直接 409，不截断、不改写分片文件。"""
+
+    fcntl = pytest.importorskip("fcntl")
+    content = b"0123456789abcdef"
+
+    client = TestClient(app)
+    try:
+        upload_id = client.post("/api/v1/files/uploads", json={"filename": "x.csv", "size_bytes": len(content)}).json()[
+            "upload_id"
+        ]
+        assert client.put(f"/api/v1/files/uploads/{upload_id}?offset=0", content=content[:8]).status_code == 200
+        (partial,) = (Path(settings.UPLOADS_DIR) / ".partial").iterdir()
+
+        # 模拟正在写入的请求：持有分片文件的锁
+        with partial.open("r+b") as held:
+            fcntl.flock(held.fileno(), fcntl.LOCK_EX)
+            r = client.put(f"/api/v1/files/uploads/{upload_id}?offset=8", content=content[8:])
+            assert r.status_code == 409
+            assert partial.read_bytes() == content[:8]
+
+        r = client.put(f"/api/v1/files/uploads/{upload_id}?offset=8", content=content[8:])
+        assert r.status_code == 200 and r.json()["received_bytes"] == len(content)
+    finally:
+        client.close()
+    assert partial.read_bytes() == content
+
+
+def test_expired_upload_sessions_are_purged(isolated_runtime: sessionmaker) -> None:
+    from datetime import timedelta
+
+    from sqlalchemy import update
+
+    from app.core.time import utcnow
+    from app.models.upload_session import UploadSession
+
+    client = TestClient(app)
+    try:
+        stale_id = client.post("/api/v1/files/uploads", json={"filename": "a.csv", "size_bytes": 10}).json()["upload_id"]
+        partial_dir = Path(settings.UPLOADS_DIR) / ".partial"
+        # 过期会话，以及没有会话引用的残留分片文件
+        with isolated_runtime() as db:
+            db.execute(
+                update(UploadSession)
+                .where(UploadSession.id == stale_id)
+                .values(updated_at=utcnow() - timedelta(hours=settings.UPLOAD_SESSION_TTL_HOURS + 1))
+            )
+            db.commit()
+        orphan = partial_dir / "orphan"
+        orphan.write_bytes(b"x")
+        old = (utcnow() - timedelta(hours=settings.UPLOAD_SESSION_TTL_HOURS + 1)).timestamp()
+        os.utime(orphan, (old, old))
+
+        fresh_id = client.post("/api/v1/files/uploads", json={"filename": "b.csv", "size_bytes": 10}).json()["upload_id"]
+
+        assert client.get(f"/api/v1/files/uploads/{stale_id}").status_code == 404
+        assert client.get(f"/api/v1/files/uploads/{fresh_id}").status_code == 200
+        assert [p.name for p in partial_dir.iterdir()] == [fresh_id]
+    finally:
+        client.close()
+
+
+def test_release_keeps_blob_reacquired_concurrently(isolated_runtime: sessionmaker) -> None:
+    """release_blob 读到计数为 0 之后、删除之前有并发 acquire_blob：条件删除落空，文件与记录都保留。"""
+
+    from sqlalchemy import event
+
+    from app.services.blob_store import acquire_blob, release_blob
+
+    uploads = Path(settings.UPLOADS_DIR)
+    uploads.mkdir(parents=True, exist_ok=True)
+
+    def _acquire() -> int:
+        tmp = uploads / ".upload-test.tmp"
+        tmp.write_bytes(b"same content")
+        with isolated_runtime() as db:
+            return acquire_blob(db, tmp_path=tmp, sha256="abc", size_bytes=12).ref_count
+
+    assert _acquire() == 1
+
+    reacquired: list[int] = []
+
+    def _before_delete(_conn, _cursor, statement: str, *_args: object) -> None:  # noqa: ANN001
+        if statement.lstrip().upper().startswith("DELETE") and not reacquired:
+            reacquired.append(_acquire())
+
+    engine = session_mod.engine
+    event.listen(engine, "before_cursor_execute", _before_delete)
+    try:
+        with isolated_runtime() as db:
+            release_blob(db, "abc")
+    finally:
+        event.remove(engine, "before_cursor_execute", _before_delete)
+
+    assert reacquired == [1]
+    with isolated_runtime() as db:
+        blob = db.get(StoredBlob, "abc")
+        assert blob is not None and blob.ref_count == 1
+    assert [p.name for p in uploads.iterdir()] == ["abc"]
+
+    with isolated_runtime() as db:
+        release_blob(db, "abc")
+        assert db.get(StoredBlob, "abc") is None
+    assert list(uploads.iterdir()) == []
+
+
+def test_expired_unused_uploads_release_blob(isolated_runtime: sessionmaker, monkeypatch: pytest.MonkeyPatch) -> None:
+    """过期且没有任务引用的上传被删除并释放内容引用；被任务使用的上传与共享的内容保留。"""
+
+    from datetime import timedelta
+
+    from sqlalchemy import update
+
+    import app.api.endpoints.jobs as jobs_ep
+    from app.core.time import utcnow
+    from app.models.translation_job import TranslationJob
+
+    monkeypatch.setattr(jobs_ep.translate_job_task, "delay", lambda *_args, **_kwargs: None)
+
+    shared = b'[{"a": "shared"}]'
+    client = TestClient(app)
+    try:
+        used = client.post("/api/v1/files/upload", files={"file": ("used.json", shared, "application/json")}).json()
+        stale = client.post("/api/v1/files/upload", files={"file": ("stale.json", shared, "application/json")}).json()
+        alone = client.post(
+            "/api/v1/files/upload", files={"file": ("alone.json", b'[{"a": "x"}]', "application/json")}
+        ).json()
+        r = client.post(
+            "/api/v1/jobs",
+            json={
+                "file_id": used["file_id"],
+                "selected_fields": ["a"],
+                "row_limit": 1,
+                "mode": "add_columns",
+                "target_lang": "zh-CN",
+            },
+        )
+        assert r.status_code == 200
+
+        with isolated_runtime() as db:
+            db.execute(
+                update(UploadedFile).values(
+                    created_at=utcnow() - timedelta(hours=settings.UPLOAD_RETENTION_HOURS + 1)
+                )
+            )
+            db.commit()
+
+        # 新的上传触发清理
+        r = client.post("/api/v1/files/upload", files={"file": ("new.json", b'[{"a": "y"}]', "application/json")})
+        assert r.status_code == 200
+    finally:
+        client.close()
+
+    with isolated_runtime() as db:
+        remaining = {u.id for u in db.execute(select(UploadedFile)).scalars()}
+        blobs = {b.sha256: b for b in db.execute(select(StoredBlob)).scalars()}
+        job_files = {j.file_id for j in db.execute(select(TranslationJob)).scalars()}
+
+    assert used["file_id"] in remaining and job_files == {used["file_id"]}
+    assert stale["file_id"] not in remaining and alone["file_id"] not in remaining
+    # 共享内容还被任务使用的上传引用：计数减为 1，文件保留；只被过期上传引用的内容连同文件一起删除
+    assert len(blobs) == 2
+    assert sorted(b.ref_count for b in blobs.values()) == [1, 1]
+    assert sorted(p.name for p in Path(settings.UPLOADS_DIR).iterdir()) == sorted(blobs)
@@ -0,0 +1,98 @@
+from __future__ import annotations
+
+import threading
+import time
+
+from app.services.translator.concurrency import (
+    OUTCOME_ERROR,
+    OUTCOME_OK,
+    OUTCOME_OVERLOAD,
+    AimdConcurrencyController,
+)
+
+
+def _ok(ctrl: AimdConcurrencyController, latency: float = 0.1) -> None:
+    ctrl.acquire()
+    ctrl.release(outcome=OUTCOME_OK, latency_seconds=latency)
+
+
+def test_aimd_slow_start_then_multiplicative_decrease() -> None:
+    """慢启动每次健康成功 +1；过载后按比例下调，并进入加性增阶段。"""
+
+    ctrl = AimdConcurrencyController(initial_limit=4, min_limit=2, max_limit=100, cooldown_seconds=0.0)
+    for _ in range(4):
+        _ok(ctrl)
+    assert ctrl.limit == 8
+
+    ctrl.acquire()
+    ctrl.release(outcome=OUTCOME_OVERLOAD, latency_seconds=0.1)
+    assert ctrl.limit == 4
+    assert ctrl.overloads == 1
+
+    # 加性增：约每 limit 次成功 +1
+    for _ in range(4):
+        _ok(ctrl)
+    assert ctrl.limit == 4
+    for _ in range(2):
+        _ok(ctrl)
+    assert ctrl.limit == 5
+
+
+def test_aimd_ignores_slow_and_unrelated_failures() -> None:
+    """慢请求不加并发；非过载类错误不调整；下调不低于 min，上调不超过 max。"""
+
+    ctrl = AimdConcurrencyController(
+        initial_limit=3,
+        min_limit=2,
+        max_limit=4,
+        latency_target_seconds=1.0,
+        cooldown_seconds=0.0,
+    )
+    _ok(ctrl, latency=5.0)
+    assert ctrl.limit == 3
+
+    ctrl.acquire()
+    ctrl.release(outcome=OUTCOME_ERROR, latency_seconds=0.1)
+    assert ctrl.limit == 3
+
+    for _ in range(10):
+        _ok(ctrl)
+    assert ctrl.limit == 4
+
+    for _ in range(5):
+        ctrl.acquire()
+        ctrl.release(outcome=OUTCOME_OVERLOAD, latency_seconds=0.1)
+    assert ctrl.limit == 2
+
+
+def test_aimd_cooldown_limits_consecutive_decreases() -> None:
+    """同一波失败（冷却窗口内）只下调一次。"""
+
+    ctrl = AimdConcurrencyController(initial_limit=16, min_limit=1, max_limit=16, cooldown_seconds=60.0)
+    for _ in range(5):
+        ctrl.acquire()
+        ctrl.release(outcome=OUTCOME_OVERLOAD, latency_seconds=0.1)
+    assert ctrl.limit == 8
+
+
+def test_aimd_acquire_blocks_at_limit() -> None:
+    """达到 limit 后 acquire 阻塞，直到有请求 release。"""
+
+    ctrl = AimdConcurrencyController(initial_limit=1, min_limit=1, max_limit=1)
+    ctrl.acquire()
+
+    acquired = threading.Event()
+
+    def _worker() -> None:
+        ctrl.acquire()
+        acquired.set()
+
+    t = threading.Thread(target=_worker)
+    t.start()
+    time.sleep(0.05)
+    assert not acquired.is_set()
+
+    ctrl.release(outcome=OUTCOME_OK, latency_seconds=0.1)
+    t.join(timeout=1.0)
+    assert acquired.is_set()
+    assert ctrl.inflight == 1
@@ -0,0 +1,140 @@
+from __future__ import annotations
+
+"""导出下载测试：预压缩副本协商、ETag 条件请求与 Range。"""
+
+import gzip
+import os
+from pathlib import Path
+
+import pytest
+from fastapi.testclient import TestClient
+from sqlalchemy import create_engine
+from sqlalchemy.orm import sessionmaker
+
+from app.core.config import settings
+from app.db import init_db as init_db_mod
+from app.db import session as session_mod
+from app.main import app
+from app.models.translation_job import TranslationJob
+from app.services.export_compression import negotiate_variant, precompress_export, variant_path
+
+
+@pytest.fixture()
+def isolated_runtime(monkeypatch: pytest.MonkeyPatch, tmp_path: Path) -> sessionmaker:
+    """隔离 DB 与文件存储目录，避免污染本地开发数据。"""
+
+    storage_dir = tmp_path / "storage"
+    monkeypatch.setattr(settings, "STORAGE_DIR", storage_dir)
+    monkeypatch.setattr(settings, "UPLOADS_DIR", storage_dir / "uploads")
+    monkeypatch.setattr(settings, "EXPORTS_DIR", storage_dir / "exports")
+    monkeypatch.setattr(settings, "EXPORT_PRECOMPRESS", "gzip")
+
+    db_url = f"sqlite:///{(tmp_path / 'test.db').as_posix()}"
+    engine = create_engine(db_url, connect_args={"check_same_thread": False}, future=True, echo=False)
+    SessionLocal = sessionmaker(bind=engine, autoflush=False, autocommit=False, expire_on_commit=False)
+
+    monkeypatch.setattr(session_mod, "engine", engine)
+    monkeypatch.setattr(session_mod, "SessionLocal", SessionLocal)
+    monkeypatch.setattr(init_db_mod, "engine", engine)
+
+    init_db_mod.init_db()
+    return SessionLocal
+
+
+def test_negotiate_variant_respects_q_values_and_staleness(tmp_path: Path, monkeypatch: pytest.MonkeyPatch) -> None:
+    monkeypatch.setattr(settings, "EXPORT_PRECOMPRESS", "gzip")
+    path = tmp_path / "out.csv"
+    path.write_text("a,b\n" * 100, encoding="utf-8")
+
+    assert negotiate_variant(path, "gzip") == (path, None)  # 尚未生成副本
+    assert precompress_export(path) == ["gzip"]
+    assert gzip.decompress(variant_path(path, "gzip").read_bytes()) == path.read_bytes()
+
+    assert negotiate_variant(path, "gzip, deflate, br") == (variant_path(path, "gzip"), "gzip")
+    assert negotiate_variant(path, "*") == (variant_path(path, "gzip"), "gzip")
+    assert negotiate_variant(path, "gzip;q=0, identity") == (path, None)
+    # identity / `*` 的 q 值同样参与比较
+    assert negotiate_variant(path, "gzip;q=0.5, identity") == (path, None)
+    assert negotiate_variant(path, "gzip;q=0.5, *;q=0.8") == (path, None)
+    assert negotiate_variant(path, "gzip;q=0.5, identity;q=0.2") == (variant_path(path, "gzip"), "gzip")
+    assert negotiate_variant(path, "gzip, identity") == (variant_path(path, "gzip"), "gzip")
+    assert negotiate_variant(path, "*;q=0.5, identity;q=0") == (variant_path(path, "gzip"), "gzip")
+    assert negotiate_variant(path, "br, deflate") == (path, None)
+    assert negotiate_variant(path, "") == (path, None)
+
+    # 原文件比副本新（重新导出过）：副本视为过期
+    st = variant_path(path, "gzip").stat()
+    os.utime(path, (st.st_atime, st.st_mtime + 10))
+    assert negotiate_variant(path, "gzip") == (path, None)
+
+    # xlsx 不压缩
+    xlsx = tmp_path / "out.xlsx"
+    xlsx.write_bytes(b"PK")
+    assert precompress_export(xlsx) == []
+
+
+def test_download_negotiates_encoding_and_supports_etag_and_range(isolated_runtime: sessionmaker) -> None:
+    content = ("id,text,text_zh\n" + "".join(f"{i},hello,你好\n" for i in range(200))).encode("utf-8")
+
+    client = TestClient(app)
+    try:
+        client.get("/")
+        client_id = client.cookies.get("dt_client_id")
+        assert client_id
+
+        exports = Path(settings.EXPORTS_DIR)
+        exports.mkdir(parents=True, exist_ok=True)
+        out = exports / "demo_translated.csv"
+        out.write_bytes(content)
+        precompress_export(out)
+
+        with isolated_runtime() as db:
+            job = TranslationJob(
+                client_id=client_id,
+                file_id="f",
+                status="succeeded",
+                mode="add_columns",
+                target_lang="zh-CN",
+                row_limit=200,
+                selected_fields=["text"],
+                progress_total=200,
+                progress_done=200,
+                progress_failed=0,
+                stats={},
+                result_path=out.as_posix(),
+            )
+            db.add(job)
+            db.commit()
+            url = f"/api/v1/jobs/{job.id}/download"
+
+        # 不接受压缩：原始文件
+        r = client.get(url, headers={"Accept-Encoding": "identity"})
+        assert r.status_code == 200
+        assert "content-encoding" not in r.headers
+        assert r.content == content
+        assert "Accept-Encoding" in r.headers["vary"]
+        plain_etag = r.headers["etag"]
+
+        # 接受 gzip：发送预压缩副本（TestClient 会自动解压）
+        r = client.get(url, headers={"Accept-Encoding": "gzip"})
+        assert r.status_code == 200
+        assert r.headers["content-encoding"] == "gzip"
+        assert int(r.headers["content-length"]) < len(content)
+        assert r.content == content
+        gzip_etag = r.headers["etag"]
+        assert gzip_etag != plain_etag
+
+        # 条件请求：ETag 命中返回 304，不再传输内容
+        r = client.get(url, headers={"Accept-Encoding": "gzip", "If-None-Match": gzip_etag})
+        assert r.status_code == 304
+        assert r.content == b""
+        r = client.get(url, headers={"Accept-Encoding": "identity", "If-None-Match": gzip_etag})
+        assert r.status_code == 200
+
+        # Range：只返回请求的片段
+        r = client.get(url, headers={"Accept-Encoding": "identity", "Range": "bytes=10-19"})
+        assert r.status_code == 206
+        assert r.content == content[10:20]
+        assert r.headers["content-range"] == f"bytes 10-19/{len(content)}"
+    finally:
+        client.close()
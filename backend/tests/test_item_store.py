@@ -0,0 +1,65 @@
+from __future__ import annotations
+
+from app.services.translator.ark_translator import TranslateItem
+from app.services.translator.item_store import ItemStore
+
+
+def test_item_store_append_and_read_back() -> None:
+    store = ItemStore(spill_bytes=0)
+    ids = [store.append(text, hint) for text, hint in [("你好", "列=a"), ("", "列=a"), ("world", "列=b")]]
+
+    assert ids == ["0", "1", "2"]
+    assert len(store) == 3
+    assert store[0] == TranslateItem(id="0", text="你好", hint="列=a")
+    assert store[-1] == TranslateItem(id="2", text="world", hint="列=b")
+    assert [it.text for it in store] == ["你好", "", "world"]
+    # 同一字段的 hint 只存一份
+    assert store.hint(0) is store.hint(1)
+
+
+def test_item_store_slice_is_view() -> None:
+    store = ItemStore(spill_bytes=0)
+    span = store.extend([f"t{i}" for i in range(10)], "path=x")
+    assert span == range(0, 10)
+
+    view = store[3:8]
+    assert len(view) == 5
+    assert [it.id for it in view] == ["3", "4", "5", "6", "7"]
+    assert [it.text for it in view[1:3]] == ["t4", "t5"]
+
+
+def test_item_store_spills_to_disk(tmp_path, monkeypatch) -> None:
+    from app.core.config import settings
+
+    monkeypatch.setattr(settings, "STORAGE_DIR", tmp_path)
+    store = ItemStore(spill_bytes=16)
+    store.extend(["短文本", "第二条比较长的文本"], "列=a")
+    assert store.spilled
+
+    # 转存之后继续追加、交替读取
+    store.append("tail", "列=b")
+    assert store[1].text == "第二条比较长的文本"
+    store.append("更多", "列=b")
+    assert [it.text for it in store] == ["短文本", "第二条比较长的文本", "tail", "更多"]
+    store.close()
+
+
+def test_prepared_translation_closes_spilled_store(tmp_path, monkeypatch) -> None:
+    from app.core.config import settings
+    from app.services.adapters.base import PreparedTranslation
+
+    monkeypatch.setattr(settings, "STORAGE_DIR", tmp_path)
+    store = ItemStore(spill_bytes=4)
+    store.extend(["需要转存的文本"] * 3, "列=a")
+    assert store.spilled
+    spill_file = store._file
+
+    with PreparedTranslation(items=store, apply=lambda _t: tmp_path) as prepared:
+        assert [it.text for it in prepared.items][0] == "需要转存的文本"
+    # 离开 with 即释放临时文件与 mmap，不等 GC
+    assert spill_file.closed
+    assert store._mmap is None and store._file is None
+
+    # 普通列表没有 close，同样可以作为上下文使用
+    with PreparedTranslation(items=[], apply=lambda _t: tmp_path):
+        pass
@@ -0,0 +1,369 @@
+from __future__ import annotations
+
+"""翻译任务断点续跑测试。
+
+说明：
+- 直接同步调用 Celery 任务函数，翻译器替换为可预测的假实现（不依赖 Redis/模型）；
+- DB 与存储目录隔离到临时目录，做法与匿名会话测试一致。
+"""
+
+import json
+from pathlib import Path
+
+import pytest
+from fastapi.testclient import TestClient
+from sqlalchemy import create_engine
+from sqlalchemy.orm import sessionmaker
+
+from app.core.config import settings
+from app.db import init_db as init_db_mod
+from app.db import session as session_mod
+from app.main import app
+from app.models.translation_job import TranslationJob
+from app.services.job_checkpoint import JobCheckpoint
+from app.tasks import translate as translate_mod
+
+
+@pytest.fixture()
+def isolated_runtime(monkeypatch: pytest.MonkeyPatch, tmp_path: Path) -> sessionmaker:
+    """隔离 DB 与文件存储目录，避免污染本地开发数据。"""
+
+    storage_dir = tmp_path / "storage"
+    monkeypatch.setattr(settings, "STORAGE_DIR", storage_dir)
+    monkeypatch.setattr(settings, "UPLOADS_DIR", storage_dir / "uploads")
+    monkeypatch.setattr(settings, "EXPORTS_DIR", storage_dir / "exports")
+    monkeypatch.setattr(settings, "CHECKPOINTS_DIR", storage_dir / "checkpoints")
+    monkeypatch.setattr(settings, "TRANSLATION_DRY_RUN", False)
+
+    db_url = f"sqlite:///{(tmp_path / 'test.db').as_posix()}"
+    engine = create_engine(db_url, connect_args={"check_same_thread": False}, future=True, echo=False)
+    SessionLocal = sessionmaker(bind=engine, autoflush=False, autocommit=False, expire_on_commit=False)
+
+    monkeypatch.setattr(session_mod, "engine", engine)
+    monkeypatch.setattr(session_mod, "SessionLocal", SessionLocal)
+    monkeypatch.setattr(init_db_mod, "engine", engine)
+    # 任务模块在导入时已绑定 SessionLocal，需同步替换
+    monkeypatch.setattr(translate_mod, "SessionLocal", SessionLocal)
+
+    init_db_mod.init_db()
+    return SessionLocal
+
+
+class _RecordingTranslator:
+    """记录被请求翻译的文本；`fail_on` 命中时抛错，模拟任务中途失败。"""
+
+    def __init__(self, fail_on: str = "") -> None:
+        self.fail_on = fail_on
+        self.seen: list[str] = []
+
+    def translate_items_stream(self, items, *, target_lang: str):  # noqa: ANN001,ANN201,ARG002
+        for it in items:
+            if it.text == self.fail_on:
+                raise RuntimeError("boom")
+            self.seen.append(it.text)
+            yield (it.id, f"<{it.text}>")
+
+
+def test_checkpoint_load_skips_truncated_line(tmp_path: Path) -> None:
+    cp = JobCheckpoint(tmp_path / "job.jsonl")
+    cp.add("t0", "你好")
+    cp.add("t1", "世界")
+    cp.close()
+
+    # 模拟崩溃时写了一半的末行
+    with (tmp_path / "job.jsonl").open("a", encoding="utf-8") as f:
+        f.write('["t2", "半')
+
+    assert cp.load() == {"t0": "你好", "t1": "世界"}
+
+    cp.delete()
+    assert not (tmp_path / "job.jsonl").exists()
+
+
+def test_checkpoint_appends_after_truncated_line(tmp_path: Path) -> None:
+    path = tmp_path / "job.jsonl"
+    with path.open("w", encoding="utf-8") as f:
+        f.write(json.dumps(["t0", "你好"], ensure_ascii=False) + "\n")
+        f.write('["t1", "半')
+
+    # 重跑时继续追加：半行不能把下一条记录“吞掉”
+    cp = JobCheckpoint(path)
+    assert cp.load() == {"t0": "你好"}
+    cp.add("t1", "世界")
+    cp.add("t2", "！")
+    cp.flush()
+    cp.add("t3", "再见")
+    cp.close()
+
+    assert JobCheckpoint(path).load() == {"t0": "你好", "t1": "世界", "t2": "！", "t3": "再见"}
+
+
+def test_failed_job_resumes_from_checkpoint(isolated_runtime: sessionmaker, monkeypatch: pytest.MonkeyPatch) -> None:
+    """失败后续跑：已完成的单元不再翻译，成功后删除断点文件。"""
+
+    import app.api.endpoints.jobs as jobs_ep
+
+    delayed: list[str] = []
+    monkeypatch.setattr(jobs_ep.translate_job_task, "delay", lambda job_id: delayed.append(job_id))
+    monkeypatch.setattr(settings, "TRANSLATION_BATCH_SIZE", 1)
+
+    records = [{"a": "one"}, {"a": "two"}, {"a": "three"}]
+    client = TestClient(app)
+    try:
+        r = client.post(
+            "/api/v1/files/upload",
+            files={"file": ("demo.json", json.dumps(records).encode("utf-8"), "application/json")},
+        )
+        assert r.status_code == 200
+        r = client.post(
+            "/api/v1/jobs",
+            json={
+                "file_id": r.json()["file_id"],
+                "selected_fields": ["a"],
+                "row_limit": 3,
+                "mode": "add_columns",
+                "target_lang": "zh-CN",
+            },
+        )
+        assert r.status_code == 200
+        job_id = r.json()["job_id"]
+
+        # 非失败任务不能续跑
+        assert client.post(f"/api/v1/jobs/{job_id}/resume").status_code == 400
+
+        # 第一次运行：翻译到 "three" 时失败，前两条已写入断点
+        first = _RecordingTranslator(fail_on="three")
+        monkeypatch.setattr(translate_mod, "build_default_translator", lambda: first)
+        assert translate_mod.translate_job_task(job_id)["status"] == "failed"
+        assert JobCheckpoint.for_job(job_id).load() == {"0": "<one>", "1": "<two>"}
+
+        r = client.post(f"/api/v1/jobs/{job_id}/resume")
+        assert r.status_code == 200
+        assert r.json()["status"] == "pending"
+        assert delayed[-1] == job_id
+
+        # 续跑：只翻译缺失的单元
+        second = _RecordingTranslator()
+        monkeypatch.setattr(translate_mod, "build_default_translator", lambda: second)
+        assert translate_mod.translate_job_task(job_id)["status"] == "succeeded"
+        assert second.seen == ["three"]
+        assert not JobCheckpoint.for_job(job_id).path.exists()
+    finally:
+        client.close()
+
+    with isolated_runtime() as db:
+        job = db.get(TranslationJob, job_id)
+        assert job is not None
+        assert job.progress_done == job.progress_total == 3
+        assert job.stats == {"resumed_items": 2}
+        out = json.loads(Path(settings.EXPORTS_DIR, Path(job.result_path).name).read_text(encoding="utf-8"))
+    assert [r["a_zh"] for r in out] == ["<one>", "<two>", "<three>"]
+
+
+def test_sharded_job_translates_all_shards_and_assembles(
+    isolated_runtime: sessionmaker, monkeypatch: pytest.MonkeyPatch
+) -> None:
+    """分片执行：各分片累加进度，汇总任务合并分片结果并导出。"""
+
+    from app.core.celery_app import celery_app
+
+    import app.api.endpoints.jobs as jobs_ep
+
+    monkeypatch.setattr(jobs_ep.translate_job_task, "delay", lambda *_args, **_kwargs: None)
+    monkeypatch.setattr(celery_app.conf, "task_always_eager", True)
+    monkeypatch.setattr(settings, "TRANSLATION_SHARD_SIZE", 2)
+    monkeypatch.setattr(settings, "TRANSLATION_BATCH_SIZE", 1)
+
+    translator = _RecordingTranslator()
+    monkeypatch.setattr(translate_mod, "build_default_translator", lambda: translator)
+
+    records = [{"a": f"v{i}"} for i in range(5)]
+    client = TestClient(app)
+    try:
+        r = client.post(
+            "/api/v1/files/upload",
+            files={"file": ("demo.json", json.dumps(records).encode("utf-8"), "application/json")},
+        )
+        r = client.post(
+            "/api/v1/jobs",
+            json={
+                "file_id": r.json()["file_id"],
+                "selected_fields": ["a"],
+                "row_limit": 5,
+                "mode": "add_columns",
+                "target_lang": "zh-CN",
+            },
+        )
+        job_id = r.json()["job_id"]
+    finally:
+        client.close()
+
+    assert translate_mod.translate_job_task(job_id)["status"] == "sharded"
+    assert sorted(translator.seen) == [f"v{i}" for i in range(5)]
+    for shard in range(3):
+        assert not JobCheckpoint.for_job(job_id, shard=shard).path.exists()
+
+    with isolated_runtime() as db:
+        job = db.get(TranslationJob, job_id)
+        assert job is not None
+        assert job.status == "succeeded"
+        assert job.progress_done == job.progress_total == 5
+        assert job.stats == {"shards": 3}
+        out = json.loads(Path(settings.EXPORTS_DIR, Path(job.result_path).name).read_text(encoding="utf-8"))
+    assert [r["a_zh"] for r in out] == [f"<v{i}>" for i in range(5)]
+
+
+def test_redelivered_entry_task_does_not_redispatch_shards(
+    isolated_runtime: sessionmaker, monkeypatch: pytest.MonkeyPatch
+) -> None:
+    """acks_late 重投递：分片已派发时入口任务直接跳过，不会再派发一遍 chord。"""
+
+    import app.api.endpoints.jobs as jobs_ep
+
+    monkeypatch.setattr(jobs_ep.translate_job_task, "delay", lambda *_args, **_kwargs: None)
+    monkeypatch.setattr(settings, "TRANSLATION_SHARD_SIZE", 2)
+
+    dispatched: list[str] = []
+    monkeypatch.setattr(
+        translate_mod, "chord", lambda *_args, **_kwargs: lambda *_a, **kw: dispatched.append(kw["task_id"])
+    )
+
+    records = [{"a": f"v{i}"} for i in range(5)]
+    client = TestClient(app)
+    try:
+        r = client.post(
+            "/api/v1/files/upload",
+            files={"file": ("demo.json", json.dumps(records).encode("utf-8"), "application/json")},
+        )
+        r = client.post(
+            "/api/v1/jobs",
+            json={
+                "file_id": r.json()["file_id"],
+                "selected_fields": ["a"],
+                "row_limit": 5,
+                "mode": "add_columns",
+                "target_lang": "zh-CN",
+            },
+        )
+        job_id = r.json()["job_id"]
+    finally:
+        client.close()
+
+    # chord 被替换成记录调用：第一次派发后任务保持 running
+    assert translate_mod.translate_job_task(job_id)["status"] == "sharded"
+    assert translate_mod.translate_job_task(job_id)["status"] == "sharded"
+    assert len(dispatched) == 1
+
+    with isolated_runtime() as db:
+        job = db.get(TranslationJob, job_id)
+        assert job is not None
+        assert job.status == "running"
+        assert job.shard_dispatch_id == dispatched[0]
+
+
+def _create_sharded_job(monkeypatch: pytest.MonkeyPatch, records: list[dict[str, str]]) -> str:
+    import app.api.endpoints.jobs as jobs_ep
+
+    monkeypatch.setattr(jobs_ep.translate_job_task, "delay", lambda *_args, **_kwargs: None)
+    client = TestClient(app)
+    try:
+        r = client.post(
+            "/api/v1/files/upload",
+            files={"file": ("demo.json", json.dumps(records).encode("utf-8"), "application/json")},
+        )
+        r = client.post(
+            "/api/v1/jobs",
+            json={
+                "file_id": r.json()["file_id"],
+                "selected_fields": ["a"],
+                "row_limit": len(records),
+                "mode": "add_columns",
+                "target_lang": "zh-CN",
+            },
+        )
+        return r.json()["job_id"]
+    finally:
+        client.close()
+
+
+def test_superseded_shards_stop_after_resume(isolated_runtime: sessionmaker, monkeypatch: pytest.MonkeyPatch) -> None:
+    """续跑换了新的派发标记：上一次派发中仍在运行的分片/汇总任务不再累加进度、不覆盖状态、不导出。"""
+
+    monkeypatch.setattr(settings, "TRANSLATION_SHARD_SIZE", 2)
+    dispatched: list[str] = []
+    monkeypatch.setattr(
+        translate_mod, "chord", lambda *_args, **_kwargs: lambda *_a, **kw: dispatched.append(kw["task_id"])
+    )
+    translator = _RecordingTranslator()
+    monkeypatch.setattr(translate_mod, "build_default_translator", lambda: translator)
+
+    job_id = _create_sharded_job(monkeypatch, [{"a": f"v{i}"} for i in range(5)])
+    assert translate_mod.translate_job_task(job_id)["status"] == "sharded"
+
+    # 模拟续跑：接口清空派发标记后入口任务重新派发
+    with isolated_runtime() as db:
+        job = db.get(TranslationJob, job_id)
+        assert job is not None
+        job.status = "pending"
+        job.shard_dispatch_id = ""
+        db.commit()
+    assert translate_mod.translate_job_task(job_id)["status"] == "sharded"
+    old_dispatch, new_dispatch = dispatched
+
+    # 旧派发的分片：发现标记已变化，直接退出
+    assert translate_mod.translate_shard_task(job_id, 0, 0, 2, 5, old_dispatch)["status"] == "failed"
+    assert translator.seen == []
+    assert translate_mod.assemble_job_task([], job_id, 3, old_dispatch)["status"] == "superseded"
+    translate_mod._fail(job_id, "旧分片的失败", dispatch_id=old_dispatch)
+
+    # 新派发的分片照常执行
+    assert translate_mod.translate_shard_task(job_id, 0, 0, 2, 5, new_dispatch)["status"] == "succeeded"
+    assert sorted(translator.seen) == ["v0", "v1"]
+
+    with isolated_runtime() as db:
+        job = db.get(TranslationJob, job_id)
+        assert job is not None
+        assert job.status == "running"
+        assert job.error_message == ""
+        assert job.progress_done == 2
+
+
+def test_redelivered_shard_task_does_not_double_count_progress(
+    isolated_runtime: sessionmaker, monkeypatch: pytest.MonkeyPatch
+) -> None:
+    """acks_late 重投递同一个分片：断点里已计入进度的条目不再重复累加。"""
+
+    monkeypatch.setattr(settings, "TRANSLATION_SHARD_SIZE", 2)
+    monkeypatch.setattr(settings, "TRANSLATION_BATCH_SIZE", 1)
+    dispatched: list[str] = []
+    monkeypatch.setattr(
+        translate_mod, "chord", lambda *_args, **_kwargs: lambda *_a, **kw: dispatched.append(kw["task_id"])
+    )
+
+    job_id = _create_sharded_job(monkeypatch, [{"a": f"v{i}"} for i in range(5)])
+    assert translate_mod.translate_job_task(job_id)["status"] == "sharded"
+    (dispatch_id,) = dispatched
+
+    def _progress() -> int:
+        with isolated_runtime() as db:
+            job = db.get(TranslationJob, job_id)
+            assert job is not None
+            return job.progress_done
+
+    # 第一次执行中途崩溃：v0 已落盘并计入进度
+    monkeypatch.setattr(translate_mod, "build_default_translator", lambda: _RecordingTranslator(fail_on="v1"))
+    assert translate_mod.translate_shard_task(job_id, 0, 0, 2, 5, dispatch_id)["status"] == "failed"
+    assert _progress() == 1
+
+    # 重投递：只补译并计入 v1；再投递一次（已全部完成）进度不变
+    with isolated_runtime() as db:
+        job = db.get(TranslationJob, job_id)
+        assert job is not None
+        job.status = "running"
+        db.commit()
+    translator = _RecordingTranslator()
+    monkeypatch.setattr(translate_mod, "build_default_translator", lambda: translator)
+    for _ in range(2):
+        assert translate_mod.translate_shard_task(job_id, 0, 0, 2, 5, dispatch_id)["status"] == "succeeded"
+        assert _progress() == 2
+    assert translator.seen == ["v1"]
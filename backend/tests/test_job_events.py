@@ -0,0 +1,163 @@
+from __future__ import annotations
+
+"""任务事件流（SSE）测试。
+
+说明：
+- Redis pub/sub 替换为进程内的假实现：预置 worker 会发布的消息，验证 SSE 的顺序与结束条件；
+- DB 与存储目录隔离到临时目录，做法与匿名会话测试一致。
+"""
+
+import json
+from pathlib import Path
+from typing import Any, Optional
+
+import pytest
+from fastapi.testclient import TestClient
+from sqlalchemy import create_engine
+from sqlalchemy.orm import sessionmaker
+
+import app.api.endpoints.jobs as jobs_ep
+from app.core.config import settings
+from app.db import init_db as init_db_mod
+from app.db import session as session_mod
+from app.main import app
+from app.models.translation_job import TranslationJob
+from app.services import job_progress
+
+
+@pytest.fixture()
+def isolated_runtime(monkeypatch: pytest.MonkeyPatch, tmp_path: Path) -> sessionmaker:
+    """隔离 DB 与文件存储目录，避免污染本地开发数据。"""
+
+    storage_dir = tmp_path / "storage"
+    monkeypatch.setattr(settings, "STORAGE_DIR", storage_dir)
+    monkeypatch.setattr(settings, "UPLOADS_DIR", storage_dir / "uploads")
+    monkeypatch.setattr(settings, "EXPORTS_DIR", storage_dir / "exports")
+
+    db_url = f"sqlite:///{(tmp_path / 'test.db').as_posix()}"
+    engine = create_engine(db_url, connect_args={"check_same_thread": False}, future=True, echo=False)
+    SessionLocal = sessionmaker(bind=engine, autoflush=False, autocommit=False, expire_on_commit=False)
+
+    monkeypatch.setattr(session_mod, "engine", engine)
+    monkeypatch.setattr(session_mod, "SessionLocal", SessionLocal)
+    monkeypatch.setattr(init_db_mod, "engine", engine)
+    # SSE 快照在请求依赖之外自行打开会话
+    monkeypatch.setattr(jobs_ep, "SessionLocal", SessionLocal)
+
+    # stub：避免测试依赖 Redis/Celery
+    monkeypatch.setattr(jobs_ep.translate_job_task, "delay", lambda *_args, **_kwargs: None)
+    monkeypatch.setattr(job_progress, "_get_client", lambda: None)
+
+    init_db_mod.init_db()
+    return SessionLocal
+
+
+class _FakePubSub:
+    def __init__(self, messages: list[dict[str, Any]]) -> None:
+        self.channels: list[str] = []
+        self._messages = [{"type": "message", "data": json.dumps(m)} for m in messages]
+
+    async def subscribe(self, channel: str) -> None:
+        self.channels.append(channel)
+
+    async def get_message(self, *, ignore_subscribe_messages: bool, timeout: float) -> Optional[dict[str, Any]]:  # noqa: ARG002
+        return self._messages.pop(0) if self._messages else None
+
+    async def aclose(self) -> None:
+        return None
+
+
+class _FakeAsyncRedis:
+    def __init__(self, pubsub: _FakePubSub) -> None:
+        self._pubsub = pubsub
+
+    def pubsub(self) -> _FakePubSub:
+        return self._pubsub
+
+    async def aclose(self) -> None:
+        return None
+
+
+def _parse_sse(body: str) -> list[tuple[str, dict[str, Any]]]:
+    out: list[tuple[str, dict[str, Any]]] = []
+    for block in body.split("\n\n"):
+        fields = dict(line.split(": ", 1) for line in block.splitlines() if ": " in line and not line.startswith(":"))
+        if "event" in fields:
+            out.append((fields["event"], json.loads(fields["data"])))
+    return out
+
+
+def _create_job(client: TestClient) -> str:
+    r = client.post(
+        "/api/v1/files/upload",
+        files={"file": ("demo.json", b'[{"a": "hello"}]', "application/json")},
+    )
+    assert r.status_code == 200
+    r = client.post(
+        "/api/v1/jobs",
+        json={
+            "file_id": r.json()["file_id"],
+            "selected_fields": ["a"],
+            "row_limit": 1,
+            "mode": "add_columns",
+            "target_lang": "zh-CN",
+        },
+    )
+    assert r.status_code == 200
+    return r.json()["job_id"]
+
+
+def test_job_events_stream_until_terminal_status(
+    isolated_runtime: sessionmaker, monkeypatch: pytest.MonkeyPatch
+) -> None:
+    client = TestClient(app)
+    try:
+        job_id = _create_job(client)
+        with isolated_runtime() as db:
+            job = db.get(TranslationJob, job_id)
+            job.status = "running"
+            job.progress_total = 10
+            db.commit()
+
+        pubsub = _FakePubSub(
+            [
+                {"event": "progress", "job_id": job_id, "progress_done": 4, "progress_failed": 0},
+                {"event": "status", "job_id": job_id, "status": "succeeded", "download_url": "/x"},
+                # 结束之后的消息不应再下发
+                {"event": "progress", "job_id": job_id, "progress_done": 99, "progress_failed": 0},
+            ]
+        )
+        monkeypatch.setattr(jobs_ep, "live_events_available", lambda: True)
+        monkeypatch.setattr(jobs_ep.aioredis.Redis, "from_url", lambda *_a, **_kw: _FakeAsyncRedis(pubsub))
+
+        # 换浏览器不能订阅
+        other = TestClient(app)
+        try:
+            assert other.get(f"/api/v1/jobs/{job_id}/events").status_code == 404
+        finally:
+            other.close()
+
+        r = client.get(f"/api/v1/jobs/{job_id}/events")
+        assert r.status_code == 200
+        assert r.headers["content-type"].startswith("text/event-stream")
+        assert pubsub.channels == [job_progress.job_channel(job_id)]
+
+        events = _parse_sse(r.text)
+        assert [e for e, _ in events] == ["status", "progress", "status"]
+        assert events[0][1]["status"] == "running"
+        assert events[0][1]["progress_total"] == 10
+        assert events[1][1]["progress_done"] == 4
+        assert events[2][1]["download_url"] == "/x"
+    finally:
+        client.close()
+
+
+def test_job_events_unavailable_without_redis(isolated_runtime: sessionmaker) -> None:
+    client = TestClient(app)
+    try:
+        job_id = _create_job(client)
+        # Redis 不可用：503，前端回退为轮询
+        assert client.get(f"/api/v1/jobs/{job_id}/events").status_code == 503
+        assert client.get("/api/v1/jobs/events").status_code == 503
+    finally:
+        client.close()
@@ -0,0 +1,116 @@
+from __future__ import annotations
+
+"""任务实时进度测试（Redis 替换为进程内的假实现）。"""
+
+import json
+from typing import Any
+
+import pytest
+
+from app.services import job_progress
+
+
+class _FakeRedis:
+    """只实现 job_progress 用到的 hash 命令。"""
+
+    def __init__(self) -> None:
+        self.hashes: dict[str, dict[str, int]] = {}
+        self.published: list[tuple[str, dict[str, Any]]] = []
+        self.calls = 0
+
+    def pipeline(self, transaction: bool = False) -> "_FakePipeline":  # noqa: ARG002
+        return _FakePipeline(self)
+
+    def hset(self, key: str, mapping: dict[str, int]) -> None:
+        self.calls += 1
+        self.hashes.setdefault(key, {}).update({k: int(v) for k, v in mapping.items()})
+
+    def expire(self, key: str, seconds: int) -> None:  # noqa: ARG002
+        self.calls += 1
+
+    def hincrby(self, key: str, field: str, amount: int) -> int:
+        self.calls += 1
+        h = self.hashes.setdefault(key, {})
+        h[field] = h.get(field, 0) + int(amount)
+        return h[field]
+
+    def hmget(self, key: str, *fields: str) -> list[Any]:
+        self.calls += 1
+        h = self.hashes.get(key)
+        return [None if h is None or f not in h else str(h[f]) for f in fields]
+
+    def delete(self, key: str) -> None:
+        self.calls += 1
+        self.hashes.pop(key, None)
+
+    def publish(self, channel: str, message: str) -> None:
+        self.calls += 1
+        self.published.append((channel, json.loads(message)))
+
+
+class _FakePipeline:
+    def __init__(self, client: _FakeRedis) -> None:
+        self._client = client
+        self._ops: list[Any] = []
+
+    def __getattr__(self, name: str) -> Any:
+        fn = getattr(self._client, name)
+
+        def _queue(*args: Any, **kwargs: Any) -> None:
+            self._ops.append(lambda: fn(*args, **kwargs))
+
+        return _queue
+
+    def execute(self) -> list[Any]:
+        return [op() for op in self._ops]
+
+
+@pytest.fixture()
+def fake_redis(monkeypatch: pytest.MonkeyPatch) -> _FakeRedis:
+    client = _FakeRedis()
+    monkeypatch.setattr(job_progress, "_get_client", lambda: client)
+    return client
+
+
+def test_counter_updates_redis_per_result_and_defers_db(fake_redis: _FakeRedis) -> None:
+    job_progress.reset_live_progress("j1", done=5)
+    counter = job_progress.ProgressCounter("j1", flush_seconds=3600)
+
+    for _ in range(3):
+        counter.add(1)
+    counter.add(0, failed=2)
+
+    # Redis 里是实时值；DB 增量攒着，直到到点或任务结束
+    assert job_progress.read_live_progress(["j1", "missing"]) == {"j1": (8, 2)}
+    assert not counter.due()
+    assert counter.take() == (3, 2)
+    assert counter.take() == (0, 0)
+
+    job_progress.clear_live_progress("j1")
+    assert job_progress.read_live_progress(["j1"]) == {}
+
+
+def test_counter_without_redis_only_accumulates(monkeypatch: pytest.MonkeyPatch) -> None:
+    monkeypatch.setattr(job_progress, "_get_client", lambda: None)
+    counter = job_progress.ProgressCounter("j2", flush_seconds=0)
+
+    counter.add(4)
+    assert counter.due()
+    assert counter.take() == (4, 0)
+    assert job_progress.read_live_progress(["j2"]) == {}
+
+
+def test_counter_publishes_throttled_progress_events(fake_redis: _FakeRedis) -> None:
+    counter = job_progress.ProgressCounter("j3", client_id="c1", flush_seconds=3600)
+
+    for _ in range(50):
+        counter.add(1)
+    # 第一条立即推送，其余在节流窗口内被合并
+    assert [m["progress_done"] for _, m in fake_redis.published] == [1, 1]
+
+    # 落库时补推最新值（任务频道 + 会话频道各一条）
+    counter.take()
+    assert fake_redis.published[-2:] == [
+        (job_progress.job_channel("j3"), {"event": "progress", "job_id": "j3", "progress_done": 50, "progress_failed": 0}),
+        (job_progress.client_channel("c1"), {"event": "progress", "job_id": "j3", "progress_done": 50, "progress_failed": 0}),
+    ]
@@ -1,6 +1,6 @@
 from __future__ import annotations
 
-from app.services.adapters.json_path import find_leaf_refs
+from app.services.adapters.json_path import compile_selector, find_leaf_refs
 
 
 def test_find_leaf_refs_simple_path() -> None:
@@ -30,3 +30,29 @@ def test_find_leaf_refs_list_wildcard_as_leaf() -> None:
     assert [r.value for r in refs] == ["a", "b", "c"]
     assert [r.key for r in refs] == [0, 1, 2]
 
+
+
+def test_compiled_selector_matches_find_leaf_refs() -> None:
+    """编译后的选择器：一次遍历的结果与逐路径 find_leaf_refs 完全一致（含嵌套通配、共享前缀）。"""
+
+    obj = {
+        "title": "t",
+        "a": [
+            {"b": [{"c": "x1"}, {"c": "x2", "d": "y"}], "e": "z1"},
+            {"b": "not-a-list", "e": "z2"},
+            "scalar",
+        ],
+        "tags": ["p", "q"],
+        "meta": {"desc": "m", "tags": ["r"]},
+    }
+    paths = ["a[].b[].c", "a[].b[].d", "a[].e", "tags[]", "meta.desc", "meta.tags[]", "title", "missing.x", "", "title"]
+
+    selector = compile_selector(paths)
+    found = selector.find_all(obj)
+
+    for path, refs in zip(paths, found):
+        expected = find_leaf_refs(obj, path)
+        assert [(id(r.parent), r.key, r.value) for r in refs] == [(id(r.parent), r.key, r.value) for r in expected]
+
+    assert [r.value for r in found[0]] == ["x1", "x2"]
+    assert [p for p, _ in selector.iter_leaf_refs(obj)].count("title") == 2
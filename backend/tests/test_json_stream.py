@@ -0,0 +1,138 @@
+from __future__ import annotations
+
+import io
+import json
+from pathlib import Path
+
+import pytest
+
+from app.services.adapters import json_stream
+from app.services.adapters.json_adapter import JsonAdapter
+from app.services.adapters.json_stream import (
+    JsonArrayHead,
+    JsonObjectHead,
+    read_json_array_head,
+    read_json_object_head,
+    write_json_array,
+)
+from app.services.adapters.preview import preview_and_candidates
+
+
+@pytest.fixture(autouse=True)
+def _tiny_chunks(monkeypatch: pytest.MonkeyPatch) -> None:
+    # 用极小的块大小覆盖“值/多字节字符被块边界截断”的情况
+    monkeypatch.setattr(json_stream, "_CHUNK_BYTES", 3)
+
+
+def test_read_json_array_head_parses_only_first_elements() -> None:
+    raw = '[ 123, "你好，世界", {"a": [1, 2, {"b": "]"}]}, 4.5e3 , null ]'.encode("utf-8")
+
+    head = read_json_array_head(io.BytesIO(raw), limit=3)
+
+    assert head is not None
+    assert head.elements == [123, "你好，世界", {"a": [1, 2, {"b": "]"}]}]
+    assert not head.complete
+    assert raw[head.tail_offset :] == b", 4.5e3 , null ]"
+
+
+@pytest.mark.parametrize(
+    "raw, expected",
+    [
+        (b"[1.5, 2]", [1.5, 2]),
+        (b"[1e3]", [1000.0]),
+        (b"[-12.25E-1,3]", [-1.225, 3]),
+        (b"[true, false, null, 10]", [True, False, None, 10]),
+        (b'[{"k": 1.5e2}, 0.5]', [{"k": 150.0}, 0.5]),
+    ],
+)
+def test_read_json_array_head_numbers_cut_at_chunk_boundary(raw: bytes, expected: list) -> None:
+    # 回归：数字在 "." / "e" 处被块边界截断时不能被提前当作完整值
+    head = read_json_array_head(io.BytesIO(raw), limit=10)
+
+    assert head is not None
+    assert head.elements == expected == json.loads(raw)
+    assert head.complete
+
+
+def test_read_json_array_head_syntax_error_fails_fast() -> None:
+    raw = b"[1, @" + b" " * 100_000 + b"]"
+    f = io.BytesIO(raw)
+
+    with pytest.raises(ValueError):
+        read_json_array_head(f, limit=10)
+    # 语法错误不需要把整个文件读进缓冲区
+    assert f.tell() < 1000
+
+
+def test_read_json_array_head_complete_and_bom() -> None:
+    raw = b"\xef\xbb\xbf[1, 22]\n"
+
+    head = read_json_array_head(io.BytesIO(raw), limit=10)
+
+    assert head == JsonArrayHead(elements=[1, 22], tail_offset=raw.index(b"]"), complete=True)
+
+
+def test_read_json_array_head_returns_none_for_object_root() -> None:
+    assert read_json_array_head(io.BytesIO(b' {"a": 1}'), limit=5) is None
+
+
+def test_read_json_object_head_parses_only_first_members() -> None:
+    raw = '\ufeff{ "标题": "你好", "n": [1, {"}": ","}] , "x": 1'.encode("utf-8")
+
+    # 只读前 2 个成员：之后的内容（这里是截断的对象）不会被解析
+    head = read_json_object_head(io.BytesIO(raw), limit=2)
+
+    assert head == JsonObjectHead(members={"标题": "你好", "n": [1, {"}": ","}]}, complete=False)
+    assert read_json_object_head(io.BytesIO(b'{"a": 1}'), limit=5) == JsonObjectHead(members={"a": 1}, complete=True)
+    assert read_json_object_head(io.BytesIO(b"[1]"), limit=5) is None
+
+
+def test_preview_json_object_root_stops_after_limit(tmp_path: Path) -> None:
+    path = tmp_path / "big.json"
+    # 前 3 个成员之后是损坏的内容：预览只读前 N 个成员，不应报错
+    path.write_text('{"a": "x", "b": {"c": 1}, "d": "y", "e": !!!', encoding="utf-8")
+
+    preview, candidates = preview_and_candidates(file_path=path, detected_format="json", limit=3)
+
+    assert preview.value == {"a": "x", "b": {"c": 1}, "d": "y"}
+    assert candidates == ["a", "b", "d"]
+
+
+def test_write_json_array_copies_tail_bytes(tmp_path: Path) -> None:
+    src = tmp_path / "in.json"
+    src.write_bytes(b'[{"t": "a"},\n {"t":"b" ,"keep":  1}]')
+
+    with src.open("rb") as f:
+        head = read_json_array_head(f, limit=1)
+    assert head is not None
+    head.elements[0]["t_zh"] = "甲"
+
+    out = tmp_path / "out.json"
+    write_json_array(out, src_path=src, head=head)
+
+    text = out.read_text(encoding="utf-8")
+    # 尾部按字节原样保留（包括原有的空白格式）
+    assert text.endswith(',\n {"t":"b" ,"keep":  1}]')
+    assert json.loads(text) == [{"t": "a", "t_zh": "甲"}, {"t": "b", "keep": 1}]
+
+
+def test_json_adapter_passes_through_records_beyond_row_limit(tmp_path: Path) -> None:
+    data = [{"text": f"row{i}", "n": i} for i in range(20)]
+    in_path = tmp_path / "input.json"
+    in_path.write_text(json.dumps(data, ensure_ascii=False), encoding="utf-8")
+
+    prepared = JsonAdapter().prepare(
+        file_path=in_path,
+        selected_fields=["text"],
+        row_limit=2,
+        mode="add_columns",
+        target_lang="zh-CN",
+        export_dir=tmp_path,
+        job_id="job",
+    )
+    assert [it.text for it in prepared.items] == ["row0", "row1"]
+
+    out = json.loads(prepared.apply({it.id: f"ZH_{it.text}" for it in prepared.items}).read_text(encoding="utf-8"))
+    assert len(out) == 20
+    assert out[1] == {"text": "row1", "n": 1, "text_zh": "ZH_row1"}
+    assert out[2] == {"text": "row2", "n": 2}
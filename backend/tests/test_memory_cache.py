@@ -0,0 +1,101 @@
+from __future__ import annotations
+
+from app.services.translator.ark_translator import RedisTranslationCache
+from app.services.translator.memory_cache import LruTranslationCache
+
+
+def test_lru_cache_evicts_least_recently_used_by_entries() -> None:
+    """超过条目上限时，淘汰最久未访问的条目。"""
+
+    cache = LruTranslationCache(max_entries=2, max_bytes=1024)
+    cache.set("a", "1")
+    cache.set("b", "2")
+    assert cache.get("a") == "1"  # a 变为最近访问
+    cache.set("c", "3")  # 应淘汰 b
+
+    assert cache.get("b") is None
+    assert cache.get("a") == "1"
+    assert cache.get("c") == "3"
+
+    stats = cache.stats()
+    assert stats["entries"] == 2
+    assert stats["evictions"] == 1
+    assert stats["hits"] == 3
+    assert stats["misses"] == 1
+
+
+def test_lru_cache_respects_byte_cap() -> None:
+    """超过字节上限时持续淘汰；单条超过总容量的值不缓存。"""
+
+    cache = LruTranslationCache(max_entries=100, max_bytes=10)
+    cache.set("k1", "aaa")  # 5 bytes
+    cache.set("k2", "bbb")  # 5 bytes
+    cache.set("k3", "ccc")  # 超出 -> 淘汰 k1
+    assert cache.get("k1") is None
+    assert cache.stats()["bytes"] <= 10
+
+    cache.set("big", "x" * 100)
+    assert cache.get("big") is None
+
+
+def test_redis_cache_serves_from_l1_when_redis_unavailable() -> None:
+    """Redis 不可用时，L1 仍然生效（写入后可直接命中，不产生网络往返）。"""
+
+    l1 = LruTranslationCache(max_entries=10, max_bytes=1024 * 1024)
+    cache = RedisTranslationCache("redis://127.0.0.1:1/0", l1=l1)
+
+    assert cache.get(model="m", target_lang="zh", text="hello") is None
+    cache.set(model="m", target_lang="zh", text="hello", translated_text="你好")
+    assert cache.get(model="m", target_lang="zh", text="hello") == "你好"
+    # 不同模型/语言不应串用
+    assert cache.get(model="m2", target_lang="zh", text="hello") is None
+
+
+class _FakePipeline:
+    def __init__(self, store: dict[str, str], log: list[str]) -> None:
+        self._store = store
+        self._log = log
+        self._ops: list[tuple[str, tuple]] = []
+
+    def mget(self, keys):  # noqa: ANN001
+        self._ops.append(("mget", (list(keys),)))
+
+    def set(self, key, value, ex=None):  # noqa: ANN001,ARG002
+        self._ops.append(("set", (key, value)))
+
+    def execute(self):  # noqa: ANN201
+        self._log.append(f"execute:{len(self._ops)}")
+        out = []
+        for op, args in self._ops:
+            if op == "mget":
+                out.append([self._store.get(k) for k in args[0]])
+            else:
+                self._store[args[0]] = args[1]
+                out.append(True)
+        return out
+
+
+class _FakeRedis:
+    def __init__(self) -> None:
+        self.store: dict[str, str] = {}
+        self.log: list[str] = []
+
+    def pipeline(self, transaction: bool = True):  # noqa: ANN201,ARG002
+        return _FakePipeline(self.store, self.log)
+
+
+def test_redis_cache_bulk_roundtrip_uses_pipelines(monkeypatch) -> None:
+    """批量读写：set_many 一个 pipeline 写完；get_many 按 MGET 分块放进同一个 pipeline。"""
+
+    fake = _FakeRedis()
+    cache = RedisTranslationCache("redis://unused", l1=None)
+    monkeypatch.setattr(cache, "_get_client", lambda: fake)
+    monkeypatch.setattr(RedisTranslationCache, "_MGET_CHUNK", 2)
+
+    cache.set_many(model="m", target_lang="zh", pairs=[("a", "甲"), ("b", "乙"), ("c", "丙")])
+    assert fake.log == ["execute:3"]
+
+    hits = cache.get_many(model="m", target_lang="zh", texts=["a", "b", "c", "d", "e"])
+    assert hits == {"a": "甲", "b": "乙", "c": "丙"}
+    # 5 个 key / 每块 2 个 -> 3 条 MGET，一次往返
+    assert fake.log == ["execute:3", "execute:3"]
@@ -0,0 +1,52 @@
+from __future__ import annotations
+
+"""上传解析进程池测试（准入与超时）。"""
+
+import asyncio
+import operator
+import time
+
+import pytest
+
+from app.core.config import settings
+from app.services import preview_pool
+
+
+@pytest.fixture()
+def pool_settings(monkeypatch: pytest.MonkeyPatch):  # noqa: ANN201
+    monkeypatch.setattr(settings, "PREVIEW_WORKERS", 1)
+    monkeypatch.setattr(settings, "PREVIEW_TIMEOUT_SECONDS", 30.0)
+    monkeypatch.setattr(settings, "PREVIEW_MAX_INFLIGHT_BYTES", 100)
+    yield
+    preview_pool.shutdown_preview_pool()
+
+
+def test_timeout_recycles_pool_and_next_task_runs(pool_settings: None, monkeypatch: pytest.MonkeyPatch) -> None:
+    monkeypatch.setattr(settings, "PREVIEW_TIMEOUT_SECONDS", 1.0)
+
+    async def _run() -> int:
+        with pytest.raises(TimeoutError):
+            await preview_pool.run_bounded(time.sleep, 30)
+        # 卡住的子进程已被回收，新的任务不会排在它后面
+        return await preview_pool.run_bounded(operator.add, 1, 2)
+
+    started = time.monotonic()
+    assert asyncio.run(_run()) == 3
+    assert time.monotonic() - started < 20
+
+
+def test_admission_is_size_aware(pool_settings: None) -> None:
+    async def _run() -> None:
+        # 池空闲时，单个超出预算的文件也放行
+        assert await preview_pool.run_bounded(operator.add, 2, 3, size_bytes=500) == 5
+
+        slow = asyncio.ensure_future(preview_pool.run_bounded(time.sleep, 1, size_bytes=60))
+        await asyncio.sleep(0)
+        # 正在解析 60 字节：再来 60 字节超出预算，立即拒绝；小文件仍可进入
+        with pytest.raises(preview_pool.PreviewPoolBusy):
+            await preview_pool.run_bounded(operator.add, 1, 1, size_bytes=60)
+        assert await preview_pool.run_bounded(operator.add, 1, 1, size_bytes=10) == 2
+        await slow
+
+    asyncio.run(_run())
+    assert preview_pool._inflight_tasks == 0 and preview_pool._inflight_bytes == 0
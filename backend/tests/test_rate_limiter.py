@@ -0,0 +1,77 @@
+from __future__ import annotations
+
+import pytest
+
+from app.services.translator import redis_limiter
+from app.services.translator.redis_limiter import RedisTokenBucketLimiter
+from app.services.translator.rpm_limiter import SmoothRpmLimiter
+
+
+def test_smooth_limiter_reserve_spaces_requests_evenly() -> None:
+    """平滑放行：连续预约的等待时间按 60/rpm 递增。"""
+
+    limiter = SmoothRpmLimiter(60)  # 1 次/秒
+    first = limiter.reserve()
+    second = limiter.reserve()
+    third = limiter.reserve()
+
+    assert first == 0.0
+    assert 0.9 < second <= 1.0
+    assert 1.9 < third <= 2.0
+
+
+def test_redis_limiter_falls_back_to_local_when_redis_unavailable() -> None:
+    """Redis 不可用时回退到进程内平滑限流，且不会抛异常。"""
+
+    limiter = RedisTokenBucketLimiter("redis://127.0.0.1:1/0", rpm=60, tpm=1000)
+    assert limiter.rpm == 60
+    assert limiter.tpm == 1000
+
+    first = limiter.reserve(tokens=10)
+    second = limiter.reserve(tokens=10)
+    assert first == 0.0
+    assert 0.9 < second <= 1.0
+
+
+@pytest.fixture()
+def shared_redis(monkeypatch: pytest.MonkeyPatch):  # noqa: ANN201
+    """多个限流器实例（模拟多个 worker 进程）连接同一个支持 EVAL 的 Redis。"""
+
+    fakeredis = pytest.importorskip("fakeredis")
+    pytest.importorskip("lupa")
+    server = fakeredis.FakeServer()
+
+    def _from_url(_url: str, **kwargs):  # noqa: ANN003,ANN202
+        return fakeredis.FakeRedis(server=server, **kwargs)
+
+    monkeypatch.setattr(redis_limiter.redis.Redis, "from_url", staticmethod(_from_url))
+    return fakeredis.FakeRedis(server=server, decode_responses=True)
+
+
+def test_redis_limiter_script_shares_rpm_across_processes(shared_redis) -> None:  # noqa: ANN001
+    """Lua 脚本：两个实例共享同一份 RPM 配额，等待时间按 60/rpm 依次递增。"""
+
+    a = RedisTokenBucketLimiter("redis://fake/0", rpm=60, key_prefix="t:rpm")
+    b = RedisTokenBucketLimiter("redis://fake/0", rpm=60, key_prefix="t:rpm")
+
+    waits = [a.reserve(), b.reserve(), a.reserve(), b.reserve()]
+
+    assert waits[0] == 0.0
+    for i, w in enumerate(waits[1:], start=1):
+        assert i - 0.1 < w <= i
+    # 状态在 Redis 中（而不是进程内回退），并带有过期时间
+    assert float(shared_redis.get("t:rpm:rpm")) > 0
+    assert shared_redis.pttl("t:rpm:rpm") > 0
+
+
+def test_redis_limiter_script_tpm_bucket_allows_burst_then_waits(shared_redis) -> None:  # noqa: ANN001
+    """TPM：1 分钟以内的突发直接放行，超出部分按 token 数折算等待时间。"""
+
+    limiter = RedisTokenBucketLimiter("redis://fake/0", rpm=100_000, tpm=600, key_prefix="t:tpm")
+
+    # 600 tokens/分钟：300 tokens 在突发额度内
+    assert limiter.reserve(tokens=300) == 0.0
+    # 再来 600 tokens：累计 900 tokens = 90 秒，减去 60 秒突发 → 约等待 30 秒
+    assert 29.5 < limiter.reserve(tokens=600) <= 30.0
+    # 不带 tokens 的请求只受 RPM 约束
+    assert limiter.reserve() < 1.0
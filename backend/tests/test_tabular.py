@@ -0,0 +1,41 @@
+from __future__ import annotations
+
+import pandas as pd
+
+from app.services.adapters.tabular import apply_column_translations, extract_column_items
+from app.services.translator.item_store import ItemStore
+
+
+def test_extract_column_items_skips_blank_cells_and_respects_limit() -> None:
+    df = pd.DataFrame({"a": ["x", None, "  ", "y", "z"], "b": [1, 2, None, 4, 5]})
+
+    items = ItemStore()
+    columns = extract_column_items(df, ["a", "b"], limit=4, store=items)
+
+    assert [(it.text, it.hint) for it in items] == [
+        ("x", "列=a"),
+        ("y", "列=a"),
+        ("1.0", "列=b"),
+        ("2.0", "列=b"),
+        ("4.0", "列=b"),
+    ]
+    assert [c.rows.tolist() for c in columns] == [[0, 3], [0, 1, 3]]
+    assert len({it.id for it in items}) == len(items)
+
+
+def test_apply_column_translations_modes() -> None:
+    df = pd.DataFrame({"a": ["x", "y", "z"], "n": [1, 2, 3]})
+    items = ItemStore()
+    columns = extract_column_items(df, ["a", "n"], limit=3, store=items)
+    by_text = {it.text: it.id for it in items}
+
+    # 缺失译文：add_columns 写空字符串；overwrite 保留原值
+    translations = {by_text["x"]: "甲", by_text["z"]: "丙", by_text["2"]: "二"}
+
+    added = apply_column_translations(df.copy(), columns, translations, mode="add_columns")
+    assert added["a_zh"].tolist() == ["甲", "", "丙"]
+    assert added["n_zh"].tolist() == ["", "二", ""]
+
+    overwritten = apply_column_translations(df.copy(), columns, translations, mode="overwrite")
+    assert overwritten["a"].tolist() == ["甲", "y", "丙"]
+    assert overwritten["n"].tolist() == [1, "二", 3]
@@ -1,8 +1,8 @@
 import { useEffect, useMemo, useState } from "react"
 import { useMutation, useQuery, useQueryClient } from "@tanstack/react-query"
 
-import { createJob, getJob, listJobs, uploadFile } from "@/lib/api"
-import type { UploadFileResponse } from "@/lib/types"
+import { createJob, getJob, listJobs, resumeJob, subscribeJobEvents, uploadFile } from "@/lib/api"
+import type { JobEvent, JobListItem, JobListResponse, JobStatusResponse, UploadFileResponse } from "@/lib/types"
 import { Badge } from "@/components/ui/badge"
 import { Button } from "@/components/ui/button"
 import { Card, CardContent, CardDescription, CardHeader, CardTitle } from "@/components/ui/card"
@@ -13,6 +13,21 @@ import { Select, SelectContent, SelectItem, SelectTrigger, SelectValue } from "@
 
 const LAST_JOB_ID_KEY = "dt_last_job_id"
 
+const isActiveStatus = (status?: string) => status === "pending" || status === "running"
+
+// 把 SSE 事件合并进已缓存的任务数据：progress 只带计数，status 带完整的状态字段
+function applyJobEvent<T extends JobStatusResponse | JobListItem>(job: T, e: JobEvent): T {
+  return {
+    ...job,
+    status: e.status ?? job.status,
+    progress_total: e.progress_total ?? job.progress_total,
+    progress_done: e.progress_done ?? job.progress_done,
+    progress_failed: e.progress_failed ?? job.progress_failed,
+    error_message: e.error_message ?? job.error_message,
+    download_url: e.download_url !== undefined ? e.download_url : job.download_url,
+  }
+}
+
 function App() {
   const queryClient = useQueryClient()
   const [uploaded, setUploaded] = useState<UploadFileResponse | null>(null)
@@ -37,19 +52,53 @@ function App() {
     }
   })
 
+  // SSE 连接状态：连上后停止轮询；后端不支持（503）或断线时回退为轮询
+  const [jobsStreamOpen, setJobsStreamOpen] = useState<boolean>(false)
+  const [liveJobId, setLiveJobId] = useState<string>("")
+
   const jobsQuery = useQuery({
     queryKey: ["jobs"],
     queryFn: async () => await listJobs({ limit: 20, offset: 0 }),
     refetchInterval: (q) => {
       const jobs = q.state.data?.jobs ?? []
-      const hasRunning = jobs.some((j) => j.status === "pending" || j.status === "running")
-      // 有进行中的任务时适当轮询列表，方便“关页后回来”看到最新状态
-      return hasRunning ? 2000 : false
+      const hasRunning = jobs.some((j) => isActiveStatus(j.status))
+      // 有进行中的任务时适当轮询列表，方便“关页后回来”看到最新状态（事件流已连接时不需要）
+      return hasRunning && !jobsStreamOpen ? 2000 : false
     },
   })
 
+  // 有进行中的任务时订阅会话级事件流，直接更新列表缓存
+  const jobsHasRunning = (jobsQuery.data?.jobs ?? []).some((j) => isActiveStatus(j.status))
+  useEffect(() => {
+    if (!jobsHasRunning) return
+    return subscribeJobEvents(null, {
+      onOpen: () => setJobsStreamOpen(true),
+      onError: () => setJobsStreamOpen(false),
+      onEvent: (e) => {
+        let known = false
+        queryClient.setQueryData<JobListResponse>(["jobs"], (old) => {
+          if (!old) return old
+          const jobs = old.jobs.map((j) => {
+            if (j.job_id !== e.job_id) return j
+            known = true
+            return applyJobEvent(j, e)
+          })
+          return { ...old, jobs }
+        })
+        // 新任务或状态变化：重新拉一次列表（文件名、时间等只在列表接口里）
+        if (!known || e.event === "status") queryClient.invalidateQueries({ queryKey: ["jobs"] })
+      },
+    })
+  }, [jobsHasRunning, queryClient])
+
+  // 大文件分片上传的进度（百分比）
+  const [uploadPct, setUploadPct] = useState<number | null>(null)
+
   const uploadMutation = useMutation({
-    mutationFn: async (file: File) => await uploadFile(file),
+    mutationFn: async (file: File) => {
+      setUploadPct(null)
+      return await uploadFile(file, setUploadPct)
+    },
     onSuccess: (data) => {
       setUploaded(data)
       setCustomFields([])
@@ -82,6 +131,15 @@ function App() {
     },
   })
 
+  // 失败任务续跑：已完成的部分由后端从断点恢复
+  const resumeJobMutation = useMutation({
+    mutationFn: async (id: string) => await resumeJob(id),
+    onSuccess: (data) => {
+      queryClient.invalidateQueries({ queryKey: ["job", data.job_id] })
+      queryClient.invalidateQueries({ queryKey: ["jobs"] })
+    },
+  })
+
   // 说明：避免在 useEffect 里同步 setState（会触发 cascading renders，且 lint 不允许）。
   // 这里使用“派生值”的方式：当 jobId 为空时，从 jobs 列表里挑选一个默认展示项。
   const effectiveJobId = useMemo(() => {
@@ -92,7 +150,7 @@ function App() {
     if (jobId && jobs.some((j) => j.job_id === jobId)) return jobId
 
     // 2) 否则优先展示“进行中”的任务，方便用户回来继续看进度
-    const running = jobs.find((j) => j.status === "pending" || j.status === "running")
+    const running = jobs.find((j) => isActiveStatus(j.status))
     return running?.job_id ?? jobs[0].job_id
   }, [jobId, jobsQuery.data?.jobs])
 
@@ -111,12 +169,34 @@ function App() {
     queryFn: async () => await getJob(effectiveJobId),
     enabled: Boolean(effectiveJobId),
     refetchInterval: (q) => {
-      const status = q.state.data?.status
-      if (status === "pending" || status === "running") return 1000
+      // 事件流已连接：进度由推送更新，不再轮询
+      if (isActiveStatus(q.state.data?.status) && liveJobId !== effectiveJobId) return 1000
       return false
     },
   })
 
+  // 当前任务进行中：订阅它的事件流（第一条事件就是最新状态），结束后关闭
+  const jobActive = isActiveStatus(jobQuery.data?.status)
+  useEffect(() => {
+    if (!effectiveJobId || !jobActive) return
+    const id = effectiveJobId
+    const close = subscribeJobEvents(id, {
+      onOpen: () => setLiveJobId(id),
+      onError: () => setLiveJobId(""),
+      onEvent: (e) => {
+        queryClient.setQueryData<JobStatusResponse>(["job", id], (old) => (old ? applyJobEvent(old, e) : old))
+        if (e.event === "status" && !isActiveStatus(e.status)) {
+          // 任务结束：服务端会关闭流，这里也主动关闭，避免 EventSource 自动重连
+          close()
+          setLiveJobId("")
+          queryClient.invalidateQueries({ queryKey: ["job", id] })
+          queryClient.invalidateQueries({ queryKey: ["jobs"] })
+        }
+      },
+    })
+    return close
+  }, [effectiveJobId, jobActive, queryClient])
+
   const progressPct = useMemo(() => {
     const total = jobQuery.data?.progress_total ?? 0
     const done = jobQuery.data?.progress_done ?? 0
@@ -221,13 +301,13 @@ function App() {
         <Card>
           <CardHeader>
             <CardTitle>1) 上传数据</CardTitle>
-            <CardDescription>支持 JSON / JSONL / CSV / XLSX</CardDescription>
+            <CardDescription>支持 JSON / JSONL / CSV / XLSX / Parquet</CardDescription>
           </CardHeader>
           <CardContent className="flex flex-col gap-4">
             <div className="flex items-center gap-3">
               <Input
                 type="file"
-                accept=".json,.jsonl,.csv,.xlsx"
+                accept=".json,.jsonl,.csv,.xlsx,.parquet"
                 onChange={(e) => {
                   const f = e.target.files?.[0]
                   if (f) uploadMutation.mutate(f)
@@ -235,7 +315,9 @@ function App() {
                   e.currentTarget.value = ""
                 }}
               />
-              {uploadMutation.isPending ? <Badge variant="secondary">上传中</Badge> : null}
+              {uploadMutation.isPending ? (
+                <Badge variant="secondary">上传中{uploadPct !== null ? ` ${uploadPct}%` : ""}</Badge>
+              ) : null}
               {uploaded ? <Badge variant="outline">格式: {uploaded.detected_format}</Badge> : null}
             </div>
 
@@ -429,6 +511,22 @@ function App() {
                 </div>
               ) : null}
 
+              {jobQuery.data?.status === "failed" ? (
+                <div className="flex items-center gap-3">
+                  <Button
+                    variant="outline"
+                    onClick={() => resumeJobMutation.mutate(effectiveJobId)}
+                    disabled={resumeJobMutation.isPending}
+                  >
+                    继续翻译
+                  </Button>
+                  <span className="text-xs text-muted-foreground">已完成的部分不会重复翻译</span>
+                  {resumeJobMutation.isError ? (
+                    <span className="text-sm text-destructive">{String(resumeJobMutation.error)}</span>
+                  ) : null}
+                </div>
+              ) : null}
+
               {jobQuery.data?.download_url ? (
                 <div className="flex items-center gap-3">
                   <Button asChild>
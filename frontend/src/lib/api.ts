@@ -1,4 +1,25 @@
-import type { CreateJobRequest, CreateJobResponse, JobListResponse, JobStatusResponse, UploadFileResponse } from "@/lib/types"
+import type {
+  CreateJobRequest,
+  CreateJobResponse,
+  JobEvent,
+  JobListResponse,
+  JobStatusResponse,
+  UploadFileResponse,
+  UploadSessionResponse,
+} from "@/lib/types"
+
+// 携带 HTTP 状态码的请求错误（调用方据此区分可重试的情况，例如 503）
+export class ApiError extends Error {
+  status: number
+  retryAfterSeconds: number | null
+
+  constructor(message: string, status: number, retryAfterSeconds: number | null) {
+    super(message)
+    this.name = "ApiError"
+    this.status = status
+    this.retryAfterSeconds = retryAfterSeconds
+  }
+}
 
 async function apiFetch<T>(path: string, init?: RequestInit): Promise<T> {
   const resp = await fetch(path, init)
@@ -24,12 +45,26 @@ async function apiFetch<T>(path: string, init?: RequestInit): Promise<T> {
       }
     }
     message = message.trim()
-    throw new Error(message || `请求失败: ${resp.status}`)
+    const retryAfter = Number(resp.headers.get("Retry-After"))
+    throw new ApiError(
+      message || `请求失败: ${resp.status}`,
+      resp.status,
+      Number.isFinite(retryAfter) && retryAfter > 0 ? retryAfter : null,
+    )
   }
   return (await resp.json()) as T
 }
 
-export async function uploadFile(file: File): Promise<UploadFileResponse> {
+// 超过该大小的文件走分片续传（与后端默认分片大小一致）
+const CHUNKED_UPLOAD_THRESHOLD = 8 * 1024 * 1024
+const CHUNK_MAX_RETRIES = 3
+// complete 时后端解析繁忙（503）：会话与已上传的分片都保留，按 Retry-After 等待后重试
+const COMPLETE_MAX_RETRIES = 5
+const UPLOAD_SESSION_KEY_PREFIX = "dt_upload:"
+
+export async function uploadFile(file: File, onProgress?: (pct: number) => void): Promise<UploadFileResponse> {
+  if (file.size > CHUNKED_UPLOAD_THRESHOLD) return await uploadFileChunked(file, onProgress)
+
   const fd = new FormData()
   fd.append("file", file)
   return await apiFetch<UploadFileResponse>("/api/v1/files/upload", {
@@ -38,6 +73,82 @@ export async function uploadFile(file: File): Promise<UploadFileResponse> {
   })
 }
 
+// 分片续传：init → PUT 分片（带 offset）→ complete
+// - upload_id 记在 localStorage（按文件名/大小/修改时间区分），刷新页面后重新选择同一文件可从断点继续
+// - 单个分片失败会重试；偏移冲突（409）时以服务端进度为准
+async function uploadFileChunked(file: File, onProgress?: (pct: number) => void): Promise<UploadFileResponse> {
+  const storageKey = `${UPLOAD_SESSION_KEY_PREFIX}${file.name}:${file.size}:${file.lastModified}`
+
+  let session: UploadSessionResponse | null = null
+  const savedId = (() => {
+    try {
+      return localStorage.getItem(storageKey)
+    } catch {
+      return null
+    }
+  })()
+  if (savedId) {
+    try {
+      session = await apiFetch<UploadSessionResponse>(`/api/v1/files/uploads/${savedId}`, { method: "GET" })
+    } catch {
+      session = null
+    }
+  }
+  if (!session) {
+    session = await apiFetch<UploadSessionResponse>("/api/v1/files/uploads", {
+      method: "POST",
+      headers: { "Content-Type": "application/json" },
+      body: JSON.stringify({ filename: file.name, size_bytes: file.size, content_type: file.type }),
+    })
+    try {
+      localStorage.setItem(storageKey, session.upload_id)
+    } catch {
+      // ignore
+    }
+  }
+
+  const uploadId = session.upload_id
+  const chunkSize = Math.max(1, session.chunk_size)
+  let offset = session.received_bytes
+  let failures = 0
+  while (offset < file.size) {
+    onProgress?.(Math.floor((offset / file.size) * 100))
+    try {
+      const next = await apiFetch<UploadSessionResponse>(`/api/v1/files/uploads/${uploadId}?offset=${offset}`, {
+        method: "PUT",
+        headers: { "Content-Type": "application/octet-stream" },
+        body: file.slice(offset, offset + chunkSize),
+      })
+      offset = next.received_bytes
+      failures = 0
+    } catch (err) {
+      failures += 1
+      if (failures > CHUNK_MAX_RETRIES) throw err
+      // 以服务端已接收的字节数为准再续传
+      const status = await apiFetch<UploadSessionResponse>(`/api/v1/files/uploads/${uploadId}`, { method: "GET" })
+      offset = status.received_bytes
+    }
+  }
+  onProgress?.(100)
+
+  let result: UploadFileResponse
+  for (let attempt = 0; ; attempt += 1) {
+    try {
+      result = await apiFetch<UploadFileResponse>(`/api/v1/files/uploads/${uploadId}/complete`, { method: "POST" })
+      break
+    } catch (err) {
+      if (!(err instanceof ApiError) || err.status !== 503 || attempt >= COMPLETE_MAX_RETRIES) throw err
+      await new Promise((resolve) => setTimeout(resolve, (err.retryAfterSeconds ?? 5) * 1000))
+    }
+  }
+  try {
+    localStorage.removeItem(storageKey)
+  } catch {
+    // ignore
+  }
+  return result
+}
+
 export async function createJob(req: CreateJobRequest): Promise<CreateJobResponse> {
   return await apiFetch<CreateJobResponse>("/api/v1/jobs", {
     method: "POST",
@@ -52,6 +163,12 @@ export async function getJob(jobId: string): Promise<JobStatusResponse> {
   })
 }
 
+export async function resumeJob(jobId: string): Promise<CreateJobResponse> {
+  return await apiFetch<CreateJobResponse>(`/api/v1/jobs/${jobId}/resume`, {
+    method: "POST",
+  })
+}
+
 export async function listJobs(params?: { limit?: number; offset?: number }): Promise<JobListResponse> {
   const limit = params?.limit
   const offset = params?.offset
@@ -62,3 +179,29 @@ export async function listJobs(params?: { limit?: number; offset?: number }): Pr
   return await apiFetch<JobListResponse>(`/api/v1/jobs${suffix}`, { method: "GET" })
 }
 
+
+// 订阅任务事件流（SSE）：返回关闭函数
+// - jobId 为空时订阅当前会话所有任务的事件
+// - 后端 Redis 不可用（503）或连接断开时触发 onError，调用方应回退为轮询
+export function subscribeJobEvents(
+  jobId: string | null,
+  handlers: { onEvent: (e: JobEvent) => void; onOpen?: () => void; onError?: () => void },
+): () => void {
+  if (typeof EventSource === "undefined") {
+    handlers.onError?.()
+    return () => {}
+  }
+  const es = new EventSource(jobId ? `/api/v1/jobs/${jobId}/events` : "/api/v1/jobs/events")
+  const handle = (e: Event) => {
+    try {
+      handlers.onEvent(JSON.parse((e as MessageEvent<string>).data) as JobEvent)
+    } catch {
+      // ignore
+    }
+  }
+  es.addEventListener("status", handle)
+  es.addEventListener("progress", handle)
+  es.onopen = () => handlers.onOpen?.()
+  es.onerror = () => handlers.onError?.()
+  return () => es.close()
+}
@@ -18,6 +18,13 @@ export type UploadFileResponse = {
   preview: Preview
 }
 
+export type UploadSessionResponse = {
+  upload_id: string
+  size_bytes: number
+  received_bytes: number
+  chunk_size: number
+}
+
 export type CreateJobRequest = {
   file_id: string
   selected_fields: string[]
@@ -42,6 +49,7 @@ export type JobStatusResponse = {
   progress_total: number
   progress_done: number
   progress_failed: number
+  stats?: Record<string, unknown>
   error_message: string
   download_url?: string | null
 }
@@ -58,6 +66,7 @@ export type JobListItem = {
   progress_total: number
   progress_done: number
   progress_failed: number
+  stats?: Record<string, unknown>
   error_message: string
   download_url?: string | null
   created_at: string
@@ -70,3 +79,15 @@ export type JobListResponse = {
   offset: number
 }
 
+
+// 任务事件（SSE）：status 为状态变化（含完整进度与下载地址），progress 只含进度计数
+export type JobEvent = {
+  event: "status" | "progress"
+  job_id: string
+  status?: string
+  progress_total?: number
+  progress_done?: number
+  progress_failed?: number
+  error_message?: string
+  download_url?: string | null
+}